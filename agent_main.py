@@ -6,6 +6,7 @@ retry logic, and comprehensive logging for reliable 100/100 content generation.
 
 import json
 import asyncio
+import hashlib
 import time
 import logging
 from typing import List, Dict, Any, Optional
@@ -23,6 +24,10 @@ from agent import (
     RedditAgentWorkflow, LinkedInAgentWorkflow, XAgentWorkflow, GmailAgentWorkflow,
     summarizer_agent
 )
+from resilience import (
+    AUTH, RATE_LIMITED, UNAVAILABLE, UNKNOWN,
+    ResilienceLayer, RetryPolicy, classify_error, shared_resilience
+)
 
 # Configure production logging
 def setup_logging():
@@ -59,10 +64,120 @@ def setup_logging():
 
 logger = setup_logging()
 
+# Platforms generated at the same time by generate_all_content_production
+DEFAULT_MAX_CONCURRENCY = int(os.getenv('CONTENT_MAX_CONCURRENCY', '4'))
+
+# Bump whenever the summarizer prompt in generate_summary changes so cached summaries are regenerated
+SUMMARY_PROMPT_VERSION = "1"
+
+# Session fields that feed the summary; any change to them invalidates the cached summary
+SUMMARY_SESSION_FIELDS = [
+    'startup_idea', 'current_phase', 'market_phase_complete', 'conversation_history',
+    'key_market_insights', 'key_product_insights', 'key_finance_insights',
+]
+
+class SummaryCache:
+    """Disk cache of session summaries, evicting least recently used entries beyond a size budget"""
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 20 * 1024 * 1024, enabled: Optional[bool] = None):
+        """
+        Initialize the summary cache
+        
+        Args:
+            cache_dir: Directory for cached summaries (defaults to CONTENT_SUMMARY_CACHE_DIR or summary_cache)
+            max_bytes: Total size budget; least recently used summaries are evicted beyond it
+            enabled: Turn the cache on or off (defaults to CONTENT_SUMMARY_CACHE, on)
+        """
+        if enabled is None:
+            enabled = os.getenv('CONTENT_SUMMARY_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+        self.enabled = enabled
+        self.cache_dir = Path(cache_dir or os.getenv('CONTENT_SUMMARY_CACHE_DIR', 'summary_cache'))
+        self.max_bytes = max_bytes
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def key(session_data: Dict[str, Any]) -> str:
+        """Hash of the summary-relevant session fields and the summarizer prompt version"""
+        relevant = {field: session_data.get(field) for field in SUMMARY_SESSION_FIELDS}
+        payload = json.dumps(
+            {"prompt_version": SUMMARY_PROMPT_VERSION, "session": relevant},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Summary]:
+        """Return the cached summary for a key, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            summary = Summary.model_validate_json(path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            # Corrupt or outdated entry: drop it and regenerate
+            logger.warning(f"Discarding unreadable cached summary {path}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        
+        # Touch for LRU eviction
+        os.utime(path)
+        self.hits += 1
+        logger.info(f"Using cached summary {key[:12]}")
+        return summary
+    
+    def put(self, key: str, summary: Summary) -> None:
+        """Store a summary atomically and evict old entries if over budget"""
+        if not self.enabled:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            temp_file = path.with_suffix('.tmp')
+            temp_file.write_text(summary.model_dump_json(), encoding='utf-8')
+            temp_file.replace(path)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Failed to cache summary: {e}")
+    
+    def _evict(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+            logger.info(f"Evicted cached summary {path.name}")
+
 class ProductionContentOrchestrator:
     """Production-grade content orchestrator with bulletproof reliability"""
     
-    def __init__(self, max_retries: int = 5, base_retry_delay: float = 2.0, max_retry_delay: float = 60.0):
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_retry_delay: float = 2.0,
+        max_retry_delay: float = 60.0,
+        summary_cache: Optional[SummaryCache] = None,
+        refresh_summary: Optional[bool] = None,
+        resilience: Optional[ResilienceLayer] = None,
+    ):
         """
         Initialize production orchestrator with comprehensive error handling
         
@@ -70,6 +185,11 @@ class ProductionContentOrchestrator:
             max_retries: Maximum number of retry attempts
             base_retry_delay: Base delay between retries (seconds)
             max_retry_delay: Maximum delay between retries (seconds)
+            summary_cache: Disk cache of session summaries (defaults to a SummaryCache in summary_cache/)
+            refresh_summary: Bypass cached summaries and regenerate them, the fresh result is still
+                cached (defaults to CONTENT_REFRESH_SUMMARY, off)
+            resilience: Retry, circuit breaker and concurrency layer (defaults to the process-wide
+                shared_resilience, so every in-flight generation backs off together)
         """
         self.summarizer = summarizer_agent
         self.reddit_workflow = RedditAgentWorkflow()
@@ -81,6 +201,8 @@ class ProductionContentOrchestrator:
         self.max_retries = max_retries
         self.base_retry_delay = base_retry_delay
         self.max_retry_delay = max_retry_delay
+        self.retry_policy = RetryPolicy(max_retries, base_retry_delay, max_retry_delay)
+        self.resilience = resilience or shared_resilience
         
         # Output directory setup
         self.output_dir = Path("generated_content")
@@ -90,68 +212,20 @@ class ProductionContentOrchestrator:
         self.backup_dir = Path("backups")
         self.backup_dir.mkdir(exist_ok=True)
         
+        # One summary per session file for the lifetime of this orchestrator, shared by every platform
+        self._summaries: Dict[Path, asyncio.Task] = {}
+        
+        # Summaries reused across runs while the session is unchanged
+        self.summary_cache = summary_cache or SummaryCache()
+        if refresh_summary is None:
+            refresh_summary = os.getenv('CONTENT_REFRESH_SUMMARY', '0').lower() in ('1', 'true', 'yes', 'on')
+        self.refresh_summary = refresh_summary
+        
         logger.info(f"ProductionContentOrchestrator initialized")
         logger.info(f"Max retries: {max_retries}, Base delay: {base_retry_delay}s")
         logger.info(f"Output directory: {self.output_dir}")
         logger.info(f"Backup directory: {self.backup_dir}")
     
-    def _is_retryable_error(self, error: Exception) -> bool:
-        """Determine if an error is retryable"""
-        error_msg = str(error).lower()
-        
-        retryable_patterns = [
-            '503', '502', '500',  # Server errors
-            'unavailable', 'overloaded', 'temporarily unavailable',
-            '429', 'quota', 'rate limit', 'resource_exhausted',
-            'timeout', 'connection', 'network',
-            'internal error', 'service error'
-        ]
-        
-        is_retryable = any(pattern in error_msg for pattern in retryable_patterns)
-        logger.debug(f"Error '{error_msg}' is {'retryable' if is_retryable else 'not retryable'}")
-        return is_retryable
-    
-    async def _retry_with_exponential_backoff(self, func, *args, **kwargs):
-        """Execute function with exponential backoff and jitter"""
-        last_exception = None
-        
-        for attempt in range(self.max_retries + 1):  # +1 for initial attempt
-            try:
-                logger.debug(f"Attempt {attempt + 1}/{self.max_retries + 1} for {func.__name__}")
-                result = await func(*args, **kwargs)
-                
-                if attempt > 0:
-                    logger.info(f"Success on attempt {attempt + 1} for {func.__name__}")
-                
-                return result
-                
-            except Exception as e:
-                last_exception = e
-                logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}")
-                
-                # Don't retry if this is the last attempt or error is not retryable
-                if attempt >= self.max_retries or not self._is_retryable_error(e):
-                    logger.error(f"Not retrying {func.__name__}. Attempt: {attempt + 1}, Retryable: {self._is_retryable_error(e)}")
-                    break
-                
-                # Calculate delay with exponential backoff and jitter
-                delay = min(
-                    self.base_retry_delay * (2 ** attempt),
-                    self.max_retry_delay
-                )
-                # Add jitter to prevent thundering herd
-                jitter = delay * 0.1 * (0.5 - asyncio.get_event_loop().time() % 1)
-                total_delay = delay + jitter
-                
-                logger.info(f"Retrying {func.__name__} in {total_delay:.2f} seconds...")
-                print(f"⏳ Retrying in {total_delay:.1f} seconds (attempt {attempt + 2}/{self.max_retries + 1})...")
-                
-                await asyncio.sleep(total_delay)
-        
-        # All attempts failed
-        logger.error(f"All {self.max_retries + 1} attempts failed for {func.__name__}. Final error: {last_exception}")
-        raise last_exception
-    
     def load_session_file(self, file_path: str) -> Dict[str, Any]:
         """Load session file with comprehensive validation"""
         file_path = Path(file_path)
@@ -234,7 +308,7 @@ class ProductionContentOrchestrator:
             raise ValueError(error_msg)
     
     async def generate_summary(self, session_data: Dict[str, Any]) -> Summary:
-        """Generate summary with enhanced error handling"""
+        """Generate summary with enhanced error handling (bump SUMMARY_PROMPT_VERSION when the prompt changes)"""
         logger.info("🔄 Generating strategic business analysis...")
         print("🔄 Generating strategic business analysis...")
         
@@ -259,8 +333,8 @@ class ProductionContentOrchestrator:
             Generate summary that ensures 100/100 authentic content across all platforms.
             """
             
-            summary = await self._retry_with_exponential_backoff(
-                self.summarizer.run, prompt
+            summary = await self.resilience.call(
+                self.summarizer.run, prompt, policy=self.retry_policy
             )
             
             logger.info("✅ Strategic analysis completed successfully")
@@ -273,14 +347,55 @@ class ProductionContentOrchestrator:
             print(f"❌ Summary generation failed: {e}")
             
             # Provide context-specific help
-            error_msg = str(e).lower()
-            if 'quota' in error_msg or '429' in error_msg:
+            kind = classify_error(e).kind
+            if kind == RATE_LIMITED:
                 print("💡 API quota exceeded. Check your billing or try again later.")
-            elif 'authentication' in error_msg or '401' in error_msg:
+            elif kind == AUTH:
                 print("💡 Authentication failed. Check your GEMINI_API_KEY environment variable.")
             
             raise
     
+    async def get_summary(self, file_path: str) -> Summary:
+        """
+        Load and summarize a session file once, sharing the result across workflows
+        
+        Concurrent callers for the same file await the same summarization; a failed
+        attempt is forgotten so the next call can try again.
+        """
+        key = Path(file_path).resolve()
+        task = self._summaries.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_and_summarize(file_path))
+            self._summaries[key] = task
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._summaries.get(key) is task:
+                del self._summaries[key]
+            raise
+    
+    async def _load_and_summarize(self, file_path: str) -> Summary:
+        session_data = self.load_session_file(file_path)
+        
+        cache_key = self.summary_cache.key(session_data)
+        if not self.refresh_summary:
+            cached = self.summary_cache.get(cache_key)
+            if cached is not None:
+                print("♻️ Reusing cached strategic analysis (session unchanged)")
+                return cached
+        
+        summary = await self.generate_summary(session_data)
+        self.summary_cache.put(cache_key, summary)
+        return summary
+    
+    def _backup_prefix(self, output_file: Path) -> str:
+        """Backup name for an output file, keeping its directory so batch sessions do not collide"""
+        try:
+            relative = output_file.resolve().relative_to(self.output_dir.resolve())
+        except ValueError:
+            relative = Path(output_file.parent.name) / output_file.name
+        return "__".join(relative.with_suffix('').parts)
+    
     def save_content_safely(self, content, platform: str, output_file: Optional[str] = None) -> str:
         """Save content with atomic writes and backups"""
         if output_file is None:
@@ -308,7 +423,7 @@ class ProductionContentOrchestrator:
             # Create backup if file exists
             if output_file.exists():
                 timestamp = int(time.time())
-                backup_file = self.backup_dir / f"{platform}_content_{timestamp}.json"
+                backup_file = self.backup_dir / f"{self._backup_prefix(output_file)}_{timestamp}.json"
                 
                 try:
                     import shutil
@@ -346,8 +461,23 @@ class ProductionContentOrchestrator:
             
             raise
     
-    async def generate_platform_content(self, platform: str, file_path: str, output_file: Optional[str] = None):
-        """Generate content for specific platform with full error handling"""
+    async def generate_platform_content(
+        self,
+        platform: str,
+        file_path: str,
+        output_file: Optional[str] = None,
+        summary: Optional[Summary] = None,
+    ):
+        """
+        Generate content for specific platform with full error handling
+        
+        Args:
+            platform: One of reddit, linkedin, x, gmail
+            file_path: Session file the content is based on
+            output_file: Where to save the content (defaults to generated_content/<platform>_content.json)
+            summary: Precomputed session summary; when omitted the session is loaded and
+                summarized once per orchestrator and reused
+        """
         platform_emoji = {
             "reddit": "🔴",
             "linkedin": "💼", 
@@ -361,11 +491,9 @@ class ProductionContentOrchestrator:
         print(f"{emoji} Generating {platform.title()} content...")
         
         try:
-            # Load session data
-            session_data = self.load_session_file(file_path)
-            
-            # Generate summary
-            summary = await self.generate_summary(session_data)
+            # Load and summarize the session (shared across platforms)
+            if summary is None:
+                summary = await self.get_summary(file_path)
             
             # Generate platform-specific content
             workflow_map = {
@@ -380,7 +508,7 @@ class ProductionContentOrchestrator:
                 raise ValueError(f"Unsupported platform: {platform}")
             
             logger.info(f"Processing {platform} content through workflow")
-            content = await self._retry_with_exponential_backoff(workflow.process, summary)
+            content = await self.resilience.call(workflow.process, summary, policy=self.retry_policy)
             
             # Save content
             saved_file = self.save_content_safely(content, platform, output_file)
@@ -401,12 +529,12 @@ class ProductionContentOrchestrator:
             print(f"❌ {platform.title()} content generation failed: {e}")
             
             # Provide helpful error context
-            error_msg = str(e).lower()
-            if 'quota' in error_msg or '429' in error_msg:
+            kind = classify_error(e).kind
+            if kind == RATE_LIMITED:
                 print("💡 API quota exceeded. Try again later or upgrade your plan.")
-            elif 'unavailable' in error_msg or '503' in error_msg:
-                print("💡 Service temporarily unavailable. The system will retry automatically.")
-            elif 'authentication' in error_msg or '401' in error_msg:
+            elif kind == UNAVAILABLE:
+                print("💡 Service temporarily unavailable. Retries exhausted, try again shortly.")
+            elif kind == AUTH:
                 print("💡 Check your GEMINI_API_KEY environment variable.")
             else:
                 print("💡 Check the logs for detailed error information.")
@@ -414,54 +542,92 @@ class ProductionContentOrchestrator:
             raise
 
 # Production-grade wrapper functions
-async def generate_reddit_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None):
+async def generate_reddit_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None, summary: Optional[Summary] = None):
     """Generate Reddit content with production-grade reliability"""
     orchestrator = ProductionContentOrchestrator()
-    return await orchestrator.generate_platform_content("reddit", file_path, output_file)
+    return await orchestrator.generate_platform_content("reddit", file_path, output_file, summary)
 
-async def generate_linkedin_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None):
+async def generate_linkedin_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None, summary: Optional[Summary] = None):
     """Generate LinkedIn content with production-grade reliability"""
     orchestrator = ProductionContentOrchestrator()
-    return await orchestrator.generate_platform_content("linkedin", file_path, output_file)
+    return await orchestrator.generate_platform_content("linkedin", file_path, output_file, summary)
 
-async def generate_x_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None):
+async def generate_x_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None, summary: Optional[Summary] = None):
     """Generate X content with production-grade reliability"""
     orchestrator = ProductionContentOrchestrator()
-    return await orchestrator.generate_platform_content("x", file_path, output_file)
+    return await orchestrator.generate_platform_content("x", file_path, output_file, summary)
 
-async def generate_gmail_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None):
+async def generate_gmail_production(file_path: str = "enhanced_cofounder_session.json", output_file: Optional[str] = None, summary: Optional[Summary] = None):
     """Generate Gmail content with production-grade reliability"""
     orchestrator = ProductionContentOrchestrator()
-    return await orchestrator.generate_platform_content("gmail", file_path, output_file)
+    return await orchestrator.generate_platform_content("gmail", file_path, output_file, summary)
 
-async def generate_all_content_production(file_path: str = "enhanced_cofounder_session.json"):
-    """Generate all platform content with production-grade reliability"""
-    orchestrator = ProductionContentOrchestrator()
+async def generate_all_content_production(
+    file_path: str = "enhanced_cofounder_session.json",
+    concurrent: bool = True,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    summary: Optional[Summary] = None,
+    orchestrator: Optional[ProductionContentOrchestrator] = None,
+):
+    """
+    Generate all platform content with production-grade reliability
+    
+    Args:
+        file_path: Session file to generate content from
+        concurrent: Run the platform workflows at the same time instead of one after another
+        max_concurrency: Maximum number of platforms generated at once in concurrent mode
+        summary: Precomputed session summary; when omitted the session is summarized once for all platforms
+        orchestrator: Orchestrator to reuse (and whose summaries to share) instead of a new one
+    """
+    orchestrator = orchestrator or ProductionContentOrchestrator()
     
     platforms = ["reddit", "linkedin", "x", "gmail"]
-    results = {}
-    failed_platforms = []
     
-    logger.info("Starting production content generation for all platforms")
-    print("🚀 Starting production content generation for all platforms...")
+    # Sequential mode is the same pipeline with a single slot
+    slots = max(1, max_concurrency) if concurrent else 1
+    semaphore = asyncio.Semaphore(slots)
+    
+    async def run_platform(platform: str):
+        """Generate one platform, turning its failure into an error entry"""
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                content, saved_file = await orchestrator.generate_platform_content(platform, file_path, summary=summary)
+            except Exception as e:
+                logger.error(f"❌ {platform.title()} generation failed: {e}")
+                return platform, {"error": str(e)}
+            logger.info(f"✅ {platform.title()} completed successfully in {time.perf_counter() - started:.1f}s")
+            return platform, {"content": content, "file": saved_file}
+    
+    mode = f"concurrently (up to {slots} at once)" if concurrent else "sequentially"
+    logger.info(f"Starting production content generation for all platforms {mode}")
+    print(f"🚀 Starting production content generation for all platforms {mode}...")
     
-    for platform in platforms:
+    started = time.perf_counter()
+    
+    # Load and summarize the session once; every platform works from the same summary
+    summary_error = None
+    if summary is None:
         try:
-            content, saved_file = await orchestrator.generate_platform_content(platform, file_path)
-            results[platform] = {"content": content, "file": saved_file}
-            logger.info(f"✅ {platform.title()} completed successfully")
-            
+            summary = await orchestrator.get_summary(file_path)
         except Exception as e:
-            logger.error(f"❌ {platform.title()} generation failed: {e}")
-            failed_platforms.append(platform)
-            results[platform] = {"error": str(e)}
+            logger.error(f"❌ Session summary failed, skipping all platforms: {e}")
+            summary_error = str(e)
+    
+    if summary_error is None:
+        results = dict(await asyncio.gather(*(run_platform(platform) for platform in platforms)))
+    else:
+        results = {platform: {"error": summary_error} for platform in platforms}
+    elapsed = time.perf_counter() - started
+    failed_platforms = [platform for platform in platforms if "error" in results[platform]]
     
     # Summary report
     successful_count = len(platforms) - len(failed_platforms)
-    logger.info(f"Production generation completed: {successful_count}/{len(platforms)} platforms successful")
+    logger.info(f"Production generation completed: {successful_count}/{len(platforms)} platforms successful in {elapsed:.1f}s")
     
     print(f"\n📊 Production Generation Summary:")
     print(f"✅ Successful: {successful_count}/{len(platforms)} platforms")
+    print(f"⏱️ Total time: {elapsed:.1f}s")
     
     if failed_platforms:
         print(f"❌ Failed: {', '.join(failed_platforms)}")
@@ -471,6 +637,185 @@ async def generate_all_content_production(file_path: str = "enhanced_cofounder_s
     
     return results
 
+# Batch processing over a directory of session files
+BATCH_PLATFORMS = ["reddit", "linkedin", "x", "gmail"]
+
+class BatchManifest:
+    """JSON record of finished (session, platform) jobs, rewritten atomically after every job"""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self.jobs = json.loads(self.path.read_text(encoding='utf-8')).get("jobs", {})
+                logger.info(f"Loaded batch manifest with {len(self.jobs)} jobs: {self.path}")
+            except (ValueError, UnicodeDecodeError) as e:
+                logger.warning(f"Ignoring unreadable batch manifest {self.path}: {e}")
+    
+    @staticmethod
+    def job_key(session_file: Path, platform: str) -> str:
+        return f"{session_file.name}:{platform}"
+    
+    @staticmethod
+    def fingerprint(session_file: Path) -> str:
+        """Cheap change marker so an edited session file is regenerated"""
+        stat = session_file.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def is_done(self, session_file: Path, platform: str) -> bool:
+        entry = self.jobs.get(self.job_key(session_file, platform))
+        return bool(
+            entry
+            and entry.get("status") == "done"
+            and entry.get("fingerprint") == self.fingerprint(session_file)
+            and Path(entry.get("file", "")).exists()
+        )
+    
+    def record(self, session_file: Path, platform: str, **entry: Any) -> None:
+        key = self.job_key(session_file, platform)
+        attempts = self.jobs.get(key, {}).get("attempts", 0) + 1
+        self.jobs[key] = {
+            "session": str(session_file),
+            "platform": platform,
+            "fingerprint": self.fingerprint(session_file),
+            "attempts": attempts,
+            "updated": datetime.now().isoformat(),
+            **entry,
+        }
+        self.save()
+    
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.path.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            json.dump({"jobs": self.jobs}, file, indent=2, ensure_ascii=False)
+        temp_file.replace(self.path)
+
+async def generate_content_batch(
+    session_dir: str,
+    output_dir: str = "generated_content/batch",
+    platforms: Optional[List[str]] = None,
+    workers: int = DEFAULT_MAX_CONCURRENCY,
+    manifest_file: Optional[str] = None,
+    orchestrator: Optional[ProductionContentOrchestrator] = None,
+) -> Dict[str, Any]:
+    """
+    Generate content for every session file in a directory
+    
+    Each (session, platform) pair is a job run by a bounded pool of async workers. Every
+    session is summarized once and shared by its platforms. Finished jobs are written to
+    a manifest, so re-running the same batch resumes where an interrupted run stopped.
+    
+    Args:
+        session_dir: Directory of session JSON files
+        output_dir: Content is written to <output_dir>/<session name>/<platform>_content.json
+        platforms: Platforms to generate (defaults to all four)
+        workers: Number of jobs run at the same time; the shared AIMD limiter is raised to
+            allow at least this many concurrent calls (it still halves on overload)
+        manifest_file: Progress manifest (defaults to <output_dir>/batch_manifest.json)
+        orchestrator: Orchestrator to reuse instead of a new one
+    """
+    session_dir = Path(session_dir)
+    output_dir = Path(output_dir)
+    platforms = platforms or BATCH_PLATFORMS
+    orchestrator = orchestrator or ProductionContentOrchestrator()
+    manifest = BatchManifest(Path(manifest_file) if manifest_file else output_dir / "batch_manifest.json")
+    
+    unknown = [platform for platform in platforms if platform not in BATCH_PLATFORMS]
+    if unknown:
+        raise ValueError(f"Unsupported platforms: {unknown}")
+    
+    session_files = sorted(path for path in session_dir.glob("*.json") if path.resolve() != manifest.path.resolve())
+    if not session_files:
+        raise FileNotFoundError(f"No session files found in {session_dir}")
+    
+    # Otherwise the limiter's initial value, not --workers, would cap concurrent calls
+    orchestrator.resilience.limiter.reserve(workers)
+    
+    all_jobs = [(session_file, platform) for session_file in session_files for platform in platforms]
+    pending = [job for job in all_jobs if not manifest.is_done(*job)]
+    skipped = len(all_jobs) - len(pending)
+    
+    logger.info(f"Batch: {len(session_files)} sessions, {len(all_jobs)} jobs, {skipped} already done, {workers} workers")
+    print(f"🚀 Batch: {len(session_files)} sessions x {len(platforms)} platforms = {len(all_jobs)} jobs")
+    if skipped:
+        print(f"⏭️ Skipping {skipped} jobs already completed (see {manifest.path})")
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in pending:
+        queue.put_nowait(job)
+    
+    succeeded = 0
+    failures_by_class: Dict[str, int] = {}
+    
+    async def worker():
+        nonlocal succeeded
+        while True:
+            try:
+                session_file, platform = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            output_file = output_dir / session_file.stem / f"{platform}_content.json"
+            job_started = time.perf_counter()
+            try:
+                _, saved_file = await orchestrator.generate_platform_content(platform, str(session_file), str(output_file))
+            except Exception as e:
+                # Structured kind for API failures, exception type for everything else
+                kind = classify_error(e).kind
+                error_class = type(e).__name__ if kind == UNKNOWN else kind
+                failures_by_class[error_class] = failures_by_class.get(error_class, 0) + 1
+                manifest.record(
+                    session_file, platform,
+                    status="failed", error=str(e), error_class=error_class, exception=type(e).__name__,
+                    seconds=round(time.perf_counter() - job_started, 2),
+                )
+                logger.error(f"❌ Batch job {session_file.name}/{platform} failed: {e}")
+                status = f"failed ({error_class})"
+            else:
+                succeeded += 1
+                manifest.record(
+                    session_file, platform,
+                    status="done", file=saved_file,
+                    seconds=round(time.perf_counter() - job_started, 2),
+                )
+                status = "done"
+            finished = succeeded + sum(failures_by_class.values())
+            print(f"📦 [{finished}/{len(pending)}] {session_file.name} / {platform} {status}")
+    
+    started = time.perf_counter()
+    if pending:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(pending))))))
+    elapsed = time.perf_counter() - started
+    
+    failed = sum(failures_by_class.values())
+    processed = succeeded + failed
+    jobs_per_minute = processed / elapsed * 60 if elapsed > 0 else 0.0
+    
+    report = {
+        "sessions": len(session_files),
+        "jobs": len(all_jobs),
+        "skipped": skipped,
+        "succeeded": succeeded,
+        "failed": failed,
+        "failures_by_class": failures_by_class,
+        "seconds": round(elapsed, 1),
+        "jobs_per_minute": round(jobs_per_minute, 1),
+        "resilience": orchestrator.resilience.stats(),
+        "manifest": str(manifest.path),
+    }
+    logger.info(f"Batch completed: {report}")
+    
+    print(f"\n📊 Batch Throughput Summary:")
+    print(f"✅ Succeeded: {succeeded}/{processed} jobs run ({skipped} skipped as already done)")
+    print(f"⏱️ {elapsed:.1f}s total, {jobs_per_minute:.1f} jobs/minute with {workers} workers")
+    if failures_by_class:
+        print(f"❌ Failures by class: " + ", ".join(f"{name}: {count}" for name, count in sorted(failures_by_class.items())))
+        print(f"💡 Re-run the same command to retry failed jobs (progress in {manifest.path})")
+    print(f"🛡️ Resilience: {report['resilience']}")
+    
+    return report
+
 # Main function for production use
 async def main_production():
     """Production-grade main function with comprehensive error handling"""
@@ -528,11 +873,32 @@ async def main_production():
         logger.error(f"Unexpected error in main: {e}")
         return None
 
+def parse_args(argv: Optional[List[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Production content generation from co-founder sessions")
+    parser.add_argument("--batch", metavar="SESSION_DIR", help="generate content for every session file in a directory")
+    parser.add_argument("--output", default="generated_content/batch", help="batch output directory")
+    parser.add_argument("--platforms", nargs="+", choices=BATCH_PLATFORMS, help="platforms to generate in batch mode")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_CONCURRENCY, help="jobs run at the same time in batch mode")
+    parser.add_argument("--manifest", help="batch progress manifest (defaults to <output>/batch_manifest.json)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
     import warnings
     warnings.filterwarnings("ignore", category=UserWarning, module="pydantic_ai")
     
+    args = parse_args()
     try:
+        if args.batch:
+            try:
+                report = asyncio.run(generate_content_batch(
+                    args.batch, args.output, args.platforms, args.workers, args.manifest
+                ))
+            except (FileNotFoundError, ValueError) as e:
+                print(f"\n❌ Batch not started: {e}")
+                raise SystemExit(2)
+            raise SystemExit(1 if report["failed"] else 0)
+        
         results = asyncio.run(main_production())
         
         if results:
@@ -8,11 +8,35 @@ from __future__ import annotations as _annotations
 
 import asyncio
 import sys
+import time
+import uuid
 from enum import Enum
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any
-from research_agent import WebResearchAgent
+from typing import List, Dict, Any, Optional
+from research_agent import WebResearchAgent, get_research_agent
+from streaming import AgentTurn, run_agent_turn
+from history import record_turn
+from router import LocalRouter
+from console import ainput, buffered_output, drain_background, say
+from prefetch import OpenerPrefetcher
+from sqlite_persistence import SqliteStatePersistence
+from rate_limit import rate_limit_stats
+from model_tiers import MODEL_TIERS, select_tier, tier_stats
+from semantic_cache import CachedAnswer, SemanticCache
+from metrics import record_agent_run, stats_report
+from insights import InsightExtractor
+from research_tools import (
+    FINANCE_RESEARCH_TOOLS,
+    MARKET_RESEARCH_TOOLS,
+    PRODUCT_RESEARCH_TOOLS,
+    ResearchCall,
+    begin_research_turn,
+    end_research_turn,
+    register_research_tools,
+    summarize_research_calls,
+    tool_latency_stats,
+)
 
 try:
     import logfire
@@ -28,10 +52,9 @@ from pydantic_graph import (
     Graph,
     GraphRunContext,
 )
-from pydantic_graph.persistence.file import FileStatePersistence
 
 from pydantic_ai import Agent
-from pydantic_ai.messages import ModelMessage
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, UserPromptPart
 import os
 from dotenv import load_dotenv
 
@@ -52,9 +75,10 @@ class EnhancedCofounderState:
     Enhanced state tracking with research capabilities and conversation history
     """
     # Core conversation data
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
     startup_idea: str | None = None
     current_phase: ConversationPhase = ConversationPhase.INITIAL
-    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    conversation_history: List[Dict[str, Any]] = field(default_factory=list)
     
     # Research insights cache for context continuity
     research_insights: Dict[str, str] = field(default_factory=dict)
@@ -77,9 +101,13 @@ class EnhancedCofounderState:
 
 # ================= ENHANCED AGENT DEFINITIONS =================
 
+# Default (full tier) model shared by every agent so all Gemini calls draw from one rate limit;
+# expert follow-ups may be moved to the lite tier per turn (see model_tiers.py)
+gemini_flash = MODEL_TIERS["full"].model
+
 # Market Analyst Agent with Research Capabilities
 market_analyst = Agent(
-    'google-gla:gemini-2.0-flash-001',
+    gemini_flash,
     deps_type=WebResearchAgent,
     system_prompt="""You are a Market Analyst AI and co-founder expert. Your role is to provide insights on market trends, competition, and user needs for business ideas.
 
@@ -106,7 +134,7 @@ Focus areas: market sizing, competitive landscape, customer validation, market t
 
 # Product Strategist Agent with Research Capabilities
 product_strategist = Agent(
-    'google-gla:gemini-2.0-flash-001',
+    gemini_flash,
     deps_type=WebResearchAgent,
     system_prompt="""You are a Product Strategist AI and co-founder expert. Your role is to suggest product features, improvements, and strategies to make products stand out.
 
@@ -133,7 +161,7 @@ Focus areas: user experience, feature prioritization, product differentiation, M
 
 # Financial Planner Agent with Research Capabilities
 financial_planner = Agent(
-    'google-gla:gemini-2.0-flash-001',
+    gemini_flash,
     deps_type=WebResearchAgent,
     system_prompt="""You are a Financial Planner AI and co-founder expert. Your role is to analyze financial viability, including costs, revenue projections, and profitability.
 
@@ -158,6 +186,11 @@ Research tool usage:
 Focus areas: cost structure, revenue models, funding requirements, financial projections, unit economics, cash flow management."""
 )
 
+# Research tools run concurrently when the model requests several in one step
+register_research_tools(market_analyst, MARKET_RESEARCH_TOOLS)
+register_research_tools(product_strategist, PRODUCT_RESEARCH_TOOLS)
+register_research_tools(financial_planner, FINANCE_RESEARCH_TOOLS)
+
 # Agent Selection Logic for Coordinator
 class AgentSelection(BaseModel):
     """Structured output for coordinator's agent selection decision"""
@@ -166,7 +199,7 @@ class AgentSelection(BaseModel):
 
 # Coordinator Agent
 coordinator = Agent(
-    'google-gla:gemini-2.0-flash-001',
+    gemini_flash,
     result_type=AgentSelection,
     system_prompt="""You are a Coordinator AI managing a conversation between a user and three expert co-founder agents: Market Analyst, Product Strategist, and Financial Planner.
 
@@ -181,6 +214,192 @@ Always select exactly one agent. Consider the specific content of the user's mes
 Provide brief reasoning for your choice."""
 )
 
+# Local fast-path router consulted before the coordinator LLM
+coordinator_router = LocalRouter()
+
+# Speculative openers for the next phase, generated while the user is still typing
+opener_prefetcher = OpenerPrefetcher()
+semantic_cache = SemanticCache()
+# Fills key_*_insights from finished turns without holding up the next prompt
+insight_extractor = InsightExtractor()
+
+# Process-wide stats in the end-of-session summary; server mode turns this off so a
+# hosted founder only sees numbers about their own session
+PROCESS_STATS_IN_SUMMARY = True
+
+# Expert registry: agent, display label and the state field holding its message history
+EXPERTS = {
+    "market_analyst": (market_analyst, "📊 Market Analyst", "market_messages"),
+    "product_strategist": (product_strategist, "🛠️ Product Strategist", "product_messages"),
+    "financial_planner": (financial_planner, "💰 Financial Planner", "finance_messages"),
+}
+
+async def run_expert_turn(
+    state: EnhancedCofounderState,
+    speaker: str,
+    prompt: str,
+    research_agent: WebResearchAgent,
+    phase: str,
+    user_message: Optional[str] = None,
+) -> AgentTurn:
+    """
+    Run one expert turn (streamed when enabled) and record it in the session state.
+    `user_message` is the raw user text the turn answers; it drives model tier selection
+    and the semantic response cache.
+    """
+    agent, label, history_field = EXPERTS[speaker]
+    message_history = getattr(state, history_field)
+    
+    # A history is needed so a replayed answer does not displace the agent's system prompt
+    lookup = None
+    if user_message and message_history:
+        start = time.perf_counter()
+        lookup = await semantic_cache.lookup(speaker, phase, state.startup_idea, user_message)
+        if lookup.hit:
+            return replay_cached_turn(state, speaker, prompt, lookup.hit, phase, time.perf_counter() - start)
+    
+    choice = select_tier(user_message, len(message_history), speaker, research_agent)
+    
+    research_turn = begin_research_turn()
+    try:
+        turn = await run_agent_turn(
+            agent,
+            prompt,
+            label=label,
+            name=speaker,
+            deps=research_agent,
+            message_history=message_history,
+            model=choice.tier.model
+        )
+    finally:
+        research_calls = end_research_turn(research_turn)
+    tier_stats.record(choice.tier, turn)
+    if choice.tier.name != "full":
+        say(f"🪶 {choice.tier.name} model ({choice.reason})\n")
+    if research_summary := summarize_research_calls(research_calls):
+        say(f"{research_summary}\n")
+    if lookup is not None:
+        semantic_cache.store(
+            speaker, phase, state.startup_idea, user_message, turn.output, lookup.vector,
+            {"model_tier": choice.tier.name}
+        )
+    record_expert_turn(state, speaker, turn, phase, research_calls=research_calls)
+    return turn
+
+def replay_cached_turn(
+    state: EnhancedCofounderState,
+    speaker: str,
+    prompt: str,
+    cached: CachedAnswer,
+    phase: str,
+    elapsed: float,
+) -> AgentTurn:
+    """Answer from the semantic cache, recording it in history as if the expert had replied"""
+    _, label, _ = EXPERTS[speaker]
+    turn = AgentTurn(
+        output=cached.answer,
+        new_messages=[
+            ModelRequest(parts=[UserPromptPart(content=prompt)]),
+            ModelResponse(parts=[TextPart(content=cached.answer)]),
+        ],
+        total=elapsed,
+    )
+    provenance = {**cached.provenance, "source": "semantic_cache", "similarity": round(cached.similarity, 3)}
+    first_asked = time.strftime('%Y-%m-%d %H:%M', time.localtime(provenance.get("created", 0)))
+    say(f"{label}: {turn.output}")
+    say(f"♻️ cached answer to a similar question ({cached.similarity:.2f} similar, first answered {first_asked}) | {elapsed:.2f}s\n")
+    record_expert_turn(state, speaker, turn, phase, provenance)
+    return turn
+
+def record_expert_turn(
+    state: EnhancedCofounderState,
+    speaker: str,
+    turn: AgentTurn,
+    phase: str,
+    provenance: Optional[Dict[str, Any]] = None,
+    research_calls: Optional[List[ResearchCall]] = None,
+) -> None:
+    """Store a finished expert turn in the agent history and the conversation log, then queue insight extraction"""
+    _, _, history_field = EXPERTS[speaker]
+    record_turn(getattr(state, history_field), turn.new_messages, history_field)
+    entry = {
+        "speaker": speaker,
+        "message": turn.output,
+        "phase": phase
+    }
+    if provenance:
+        entry["provenance"] = provenance
+    state.conversation_history.append(entry)
+    insight_extractor.schedule(state, speaker, turn.output, research_calls or ())
+
+async def run_opener_turn(
+    state: EnhancedCofounderState,
+    speaker: str,
+    prompt: str,
+    research_agent: WebResearchAgent,
+    phase: str,
+) -> AgentTurn:
+    """Use the prefetched opener when it matches the current context, otherwise run it live"""
+    turn = await opener_prefetcher.take(state.session_id, speaker, prompt)
+    if turn is None:
+        return await run_expert_turn(state, speaker, prompt, research_agent, phase)
+    
+    _, label, _ = EXPERTS[speaker]
+    say(f"{label}: {turn.output}")
+    say(f"⚡ prefetched in the background (generated in {turn.total:.2f}s)\n")
+    record_expert_turn(state, speaker, turn, phase)
+    return turn
+
+async def run_all_experts(
+    state: EnhancedCofounderState,
+    question: str,
+    conversational_context: str,
+    research_agent: WebResearchAgent,
+) -> List[AgentTurn]:
+    """
+    Ask every expert the same question at once. Each answer is printed whole as soon
+    as it completes and recorded in that expert's history, so the wall time is the
+    slowest expert's rather than the sum of all three.
+    """
+    async def ask(speaker: str) -> AgentTurn:
+        with buffered_output():
+            return await run_expert_turn(state, speaker, conversational_context, research_agent, "open", question)
+
+    start = time.perf_counter()
+    turns = await asyncio.gather(*(ask(speaker) for speaker in EXPERTS), return_exceptions=True)
+    wall = time.perf_counter() - start
+
+    answered = [turn for turn in turns if isinstance(turn, AgentTurn)]
+    for speaker, turn in zip(EXPERTS, turns):
+        if isinstance(turn, BaseException):
+            say(f"❌ {EXPERTS[speaker][1]} could not answer: {turn}")
+    sequential = sum(turn.total for turn in answered)
+    say(f"⏱️ {len(answered)} experts answered in {wall:.2f}s (one after another: ~{sequential:.2f}s)\n")
+    return answered
+
+def count_user_turns(state: EnhancedCofounderState, phase: str) -> int:
+    """Founder messages sent during a phase"""
+    return sum(1 for msg in state.conversation_history if msg["speaker"] == "user" and msg.get("phase") == phase)
+
+def build_product_opener(state: EnhancedCofounderState) -> str:
+    """Opening prompt for the product strategist, built from the market discussion"""
+    market_context = ""
+    if state.conversation_history:
+        market_msgs = [msg for msg in state.conversation_history if msg["phase"] == "market"][-3:]
+        if market_msgs:
+            market_context = f"Market context: {market_msgs[-1]['message']}"
+    
+    return f"Startup idea: {state.startup_idea}. {market_context} Now let's focus on product strategy in 2-3 sentences."
+
+def build_finance_opener(state: EnhancedCofounderState) -> str:
+    """Opening prompt for the financial planner, built from the latest discussion"""
+    recent_context = ""
+    if state.conversation_history:
+        recent_msgs = state.conversation_history[-5:]
+        recent_context = f"Previous discussion: {recent_msgs[-1]['message']}"
+    
+    return f"Startup idea: {state.startup_idea}. {recent_context} Now let's analyze the financial aspects in 2-3 sentences."
+
 # ================= GRAPH NODES =================
 
 @dataclass 
@@ -189,13 +408,13 @@ class InitialInput(BaseNode[EnhancedCofounderState]):
     Starting node - captures the initial startup idea and begins market analysis
     """
     async def run(self, ctx: GraphRunContext[EnhancedCofounderState]) -> MarketAnalysisPhase:
-        print("🚀 Welcome to your Enhanced AI Co-founder Team!")
-        print("💡 Tell me about your startup idea, and I'll connect you with our expert team.")
-        print("📊 We'll start with market analysis, then move to product strategy and financial planning.")
-        print("🔍 Enhanced with real-time research capabilities when you need specific data!\n")
+        say("🚀 Welcome to your Enhanced AI Co-founder Team!")
+        say("💡 Tell me about your startup idea, and I'll connect you with our expert team.")
+        say("📊 We'll start with market analysis, then move to product strategy and financial planning.")
+        say("🔍 Enhanced with real-time research capabilities when you need specific data!\n")
         
         # Get startup idea from user
-        idea = input("What's your startup idea? ")
+        idea = await ainput("What's your startup idea? ")
         ctx.state.startup_idea = idea
         ctx.state.current_phase = ConversationPhase.MARKET_ANALYSIS
         
@@ -206,7 +425,7 @@ class InitialInput(BaseNode[EnhancedCofounderState]):
             "phase": "initial"
         })
         
-        print(f"\n🎯 Great! Let me connect you with our Market Analyst to explore the market opportunity...\n")
+        say(f"\n🎯 Great! Let me connect you with our Market Analyst to explore the market opportunity...\n")
         return MarketAnalysisPhase()
 
 @dataclass
@@ -215,36 +434,30 @@ class MarketAnalysisPhase(BaseNode[EnhancedCofounderState]):
     Enhanced market analysis conversation phase with selective research capabilities
     """
     async def run(self, ctx: GraphRunContext[EnhancedCofounderState]) -> ProductStrategyPhase | MarketAnalysisPhase | CoordinatorPhase:
-        print("📊 MARKET ANALYST is now leading the conversation")
-        print("💬 Type 'next' when you're ready to move to product strategy\n")
+        say("📊 MARKET ANALYST is now leading the conversation")
+        say("💬 Type 'next' when you're ready to move to product strategy\n")
         
-        research_agent = WebResearchAgent()
+        research_agent = get_research_agent()
         
         # Get market analyst's initial response - no automatic research
         if not ctx.state.market_messages:
             initial_context = f"The user wants to start this business: {ctx.state.startup_idea}. Provide initial market insights in 2-3 sentences. Be direct and supportive."
-            result = await market_analyst.run(
-                initial_context,
-                deps=research_agent,
-                message_history=ctx.state.market_messages
-            )
-            ctx.state.market_messages += result.all_messages()
-            ctx.state.conversation_history.append({
-                "speaker": "market_analyst", 
-                "message": result.output, 
-                "phase": "market"
-            })
-            
-            print(f"📊 Market Analyst: {result.output}\n")
+            await run_expert_turn(ctx.state, "market_analyst", initial_context, research_agent, "market")
         
         # Continue conversation loop
         while True:
-            user_input = input("You: ").strip()
+            # Speculatively prepare the product strategist's opener while the user types
+            opener_prefetcher.schedule(
+                ctx.state.session_id, "product_strategist", product_strategist, build_product_opener(ctx.state),
+                research_agent, phase_turns=count_user_turns(ctx.state, "market")
+            )
+            
+            user_input = (await ainput("You: ")).strip()
             
             if user_input.lower() in ['next', 'move on', 'continue']:
                 ctx.state.market_phase_complete = True
                 ctx.state.current_phase = ConversationPhase.PRODUCT_STRATEGY
-                print("\n🔄 Moving to Product Strategy phase...\n")
+                say("\n🔄 Moving to Product Strategy phase...\n")
                 return ProductStrategyPhase()
             
             # Regular conversation with Market Analyst
@@ -263,19 +476,7 @@ class MarketAnalysisPhase(BaseNode[EnhancedCofounderState]):
                 context_summary = " | ".join([f"{msg['speaker']}: {msg['message']}" for msg in recent_context])
                 conversational_context += f"\n\nRecent context: {context_summary}"
             
-            result = await market_analyst.run(
-                conversational_context,
-                deps=research_agent,
-                message_history=ctx.state.market_messages
-            )
-            ctx.state.market_messages += result.all_messages()
-            ctx.state.conversation_history.append({
-                "speaker": "market_analyst", 
-                "message": result.output,
-                "phase": "market"
-            })
-            
-            print(f"📊 Market Analyst: {result.output}\n")
+            await run_expert_turn(ctx.state, "market_analyst", conversational_context, research_agent, "market", user_input)
 
 @dataclass
 class ProductStrategyPhase(BaseNode[EnhancedCofounderState]):
@@ -283,44 +484,31 @@ class ProductStrategyPhase(BaseNode[EnhancedCofounderState]):
     Enhanced product strategy conversation phase with selective research capabilities
     """
     async def run(self, ctx: GraphRunContext[EnhancedCofounderState]) -> FinancialPlanningPhase | ProductStrategyPhase:
-        print("🛠️ PRODUCT STRATEGIST is now leading the conversation")
-        print("💬 Type 'next' when you're ready to move to financial planning\n")
+        say("🛠️ PRODUCT STRATEGIST is now leading the conversation")
+        say("💬 Type 'next' when you're ready to move to financial planning\n")
         
-        research_agent = WebResearchAgent()
+        research_agent = get_research_agent()
         
         # Get product strategist's initial response based on previous context
         if not ctx.state.product_messages:
             # Build context from market phase - keep it concise
-            market_context = ""
-            if ctx.state.conversation_history:
-                market_msgs = [msg for msg in ctx.state.conversation_history if msg["phase"] == "market"][-3:]
-                if market_msgs:
-                    market_context = f"Market context: {market_msgs[-1]['message']}"
-            
-            context_summary = f"Startup idea: {ctx.state.startup_idea}. {market_context} Now let's focus on product strategy in 2-3 sentences."
-            
-            result = await product_strategist.run(
-                context_summary,
-                deps=research_agent,
-                message_history=ctx.state.product_messages
-            )
-            ctx.state.product_messages += result.all_messages()
-            ctx.state.conversation_history.append({
-                "speaker": "product_strategist",
-                "message": result.output,
-                "phase": "product"
-            })
-            
-            print(f"🛠️ Product Strategist: {result.output}\n")
+            context_summary = build_product_opener(ctx.state)
+            await run_opener_turn(ctx.state, "product_strategist", context_summary, research_agent, "product")
         
         # Continue conversation loop
         while True:
-            user_input = input("You: ").strip()
+            # Speculatively prepare the financial planner's opener while the user types
+            opener_prefetcher.schedule(
+                ctx.state.session_id, "financial_planner", financial_planner, build_finance_opener(ctx.state),
+                research_agent, phase_turns=count_user_turns(ctx.state, "product")
+            )
+            
+            user_input = (await ainput("You: ")).strip()
             
             if user_input.lower() in ['next', 'move on', 'continue']:
                 ctx.state.product_phase_complete = True
                 ctx.state.current_phase = ConversationPhase.FINANCIAL_PLANNING
-                print("\n🔄 Moving to Financial Planning phase...\n")
+                say("\n🔄 Moving to Financial Planning phase...\n")
                 return FinancialPlanningPhase()
             
             ctx.state.conversation_history.append({
@@ -338,19 +526,7 @@ class ProductStrategyPhase(BaseNode[EnhancedCofounderState]):
                 context_summary = " | ".join([f"{msg['speaker']}: {msg['message']}" for msg in recent_context])
                 conversational_context += f"\n\nRecent context: {context_summary}"
             
-            result = await product_strategist.run(
-                conversational_context,
-                deps=research_agent,
-                message_history=ctx.state.product_messages
-            )
-            ctx.state.product_messages += result.all_messages()
-            ctx.state.conversation_history.append({
-                "speaker": "product_strategist",
-                "message": result.output,
-                "phase": "product"
-            })
-            
-            print(f"🛠️ Product Strategist: {result.output}\n")
+            await run_expert_turn(ctx.state, "product_strategist", conversational_context, research_agent, "product", user_input)
 
 @dataclass
 class FinancialPlanningPhase(BaseNode[EnhancedCofounderState]):
@@ -358,43 +534,25 @@ class FinancialPlanningPhase(BaseNode[EnhancedCofounderState]):
     Enhanced financial planning conversation phase with selective research capabilities
     """
     async def run(self, ctx: GraphRunContext[EnhancedCofounderState]) -> CoordinatorPhase:
-        print("💰 FINANCIAL PLANNER is now leading the conversation")
-        print("💬 Type 'next' when you're ready to open discussion to all experts\n")
+        say("💰 FINANCIAL PLANNER is now leading the conversation")
+        say("💬 Type 'next' when you're ready to open discussion to all experts\n")
         
-        research_agent = WebResearchAgent()
+        research_agent = get_research_agent()
         
         # Get financial planner's initial response based on previous context
         if not ctx.state.finance_messages:
             # Build comprehensive context from all previous phases - keep it concise
-            recent_context = ""
-            if ctx.state.conversation_history:
-                recent_msgs = ctx.state.conversation_history[-5:]
-                recent_context = f"Previous discussion: {recent_msgs[-1]['message']}"
-            
-            context_summary = f"Startup idea: {ctx.state.startup_idea}. {recent_context} Now let's analyze the financial aspects in 2-3 sentences."
-            
-            result = await financial_planner.run(
-                context_summary,
-                deps=research_agent,
-                message_history=ctx.state.finance_messages
-            )
-            ctx.state.finance_messages += result.all_messages()
-            ctx.state.conversation_history.append({
-                "speaker": "financial_planner",
-                "message": result.output,
-                "phase": "finance"
-            })
-            
-            print(f"💰 Financial Planner: {result.output}\n")
+            context_summary = build_finance_opener(ctx.state)
+            await run_opener_turn(ctx.state, "financial_planner", context_summary, research_agent, "finance")
         
         # Continue conversation loop
         while True:
-            user_input = input("You: ").strip()
+            user_input = (await ainput("You: ")).strip()
             
             if user_input.lower() in ['next', 'move on', 'continue']:
                 ctx.state.finance_phase_complete = True
                 ctx.state.current_phase = ConversationPhase.OPEN_DISCUSSION
-                print("\n🔄 Opening discussion to all experts! The coordinator will now select the best expert for each question...\n")
+                say("\n🔄 Opening discussion to all experts! The coordinator will now select the best expert for each question...\n")
                 return CoordinatorPhase()
             
             ctx.state.conversation_history.append({
@@ -412,19 +570,7 @@ class FinancialPlanningPhase(BaseNode[EnhancedCofounderState]):
                 context_summary = " | ".join([f"{msg['speaker']}: {msg['message']}" for msg in recent_context])
                 conversational_context += f"\n\nRecent context: {context_summary}"
             
-            result = await financial_planner.run(
-                conversational_context,
-                deps=research_agent,
-                message_history=ctx.state.finance_messages
-            )
-            ctx.state.finance_messages += result.all_messages()
-            ctx.state.conversation_history.append({
-                "speaker": "financial_planner",
-                "message": result.output,
-                "phase": "finance"
-            })
-            
-            print(f"💰 Financial Planner: {result.output}\n")
+            await run_expert_turn(ctx.state, "financial_planner", conversational_context, research_agent, "finance", user_input)
 
 @dataclass 
 class CoordinatorPhase(BaseNode[EnhancedCofounderState, None, str]):
@@ -432,17 +578,19 @@ class CoordinatorPhase(BaseNode[EnhancedCofounderState, None, str]):
     Enhanced open discussion phase with coordinator and selective research capabilities
     """
     async def run(self, ctx: GraphRunContext[EnhancedCofounderState]) -> End[str] | CoordinatorPhase:
-        print("🤝 COORDINATOR is now managing the conversation")
-        print("💬 All experts are available! Ask anything and I'll connect you with the right specialist.")
-        print("💬 Type 'exit' to end the session\n")
+        say("🤝 COORDINATOR is now managing the conversation")
+        say("💬 All experts are available! Ask anything and I'll connect you with the right specialist.")
+        say("💬 Start with 'all:' to hear from every expert at once")
+        say("💬 Type 'exit' to end the session\n")
         
-        research_agent = WebResearchAgent()
+        research_agent = get_research_agent()
         
         # Main conversation loop
         while True:
-            user_input = input("You: ").strip()
+            user_input = (await ainput("You: ")).strip()
             
             if user_input.lower() in ['exit', 'quit', 'end', 'done']:
+                await insight_extractor.wait(ctx.state.session_id)
                 summary = self._generate_session_summary(ctx.state)
                 return End(summary)
             
@@ -452,17 +600,46 @@ class CoordinatorPhase(BaseNode[EnhancedCofounderState, None, str]):
                 recent_msgs = ctx.state.conversation_history[-3:]
                 recent_context = " ".join([f"{msg['speaker']}: {msg['message']}" for msg in recent_msgs])
             
+            # "all: <question>" fans the question out to every expert in parallel
+            if user_input.lower().startswith('all:'):
+                question = user_input[4:].strip()
+                if not question:
+                    say("💬 Add a question after 'all:'\n")
+                    continue
+                ctx.state.conversation_history.append({
+                    "speaker": "user",
+                    "message": question,
+                    "phase": "open"
+                })
+                conversational_context = f"User question: {question}"
+                if recent_context:
+                    conversational_context += f"\n\nRecent context: {recent_context}"
+                say("🎯 Coordinator: Asking all experts at once\n")
+                await run_all_experts(ctx.state, question, conversational_context, research_agent)
+                continue
+            
             coordinator_context = f"Recent conversation: {recent_context}. User's new message: {user_input}"
             
-            selection_result = await coordinator.run(
-                coordinator_context,
-                message_history=ctx.state.coordinator_messages
-            )
-            ctx.state.coordinator_messages += selection_result.all_messages()
+            # Confident cases are routed locally; only ambiguous messages reach the LLM
+            decision = await coordinator_router.route(user_input)
+            if decision:
+                selected_agent = decision.selected_agent
+                reasoning = f"{decision.reasoning} (local {decision.source} route)"
+            else:
+                routing_start = time.perf_counter()
+                selection_result = await coordinator.run(
+                    coordinator_context,
+                    message_history=ctx.state.coordinator_messages
+                )
+                routing_time = time.perf_counter() - routing_start
+                coordinator_router.record_llm_fallback(routing_time)
+                record_agent_run("coordinator", routing_time, selection_result.new_messages(), selection_result.usage())
+                record_turn(ctx.state.coordinator_messages, selection_result.new_messages(), "coordinator_messages")
+                selected_agent = selection_result.data.selected_agent
+                reasoning = selection_result.data.reasoning
             
             # Route to selected agent
-            selected_agent = selection_result.data.selected_agent
-            print(f"🎯 Coordinator: Connecting you with {selected_agent.replace('_', ' ').title()} - {selection_result.data.reasoning}\n")
+            say(f"🎯 Coordinator: Connecting you with {selected_agent.replace('_', ' ').title()} - {reasoning}\n")
             
             ctx.state.conversation_history.append({
                 "speaker": "user",
@@ -476,36 +653,17 @@ class CoordinatorPhase(BaseNode[EnhancedCofounderState, None, str]):
                 conversational_context += f"\n\nRecent context: {recent_context}"
             
             # Execute selected agent's response with research capabilities but conversational style
-            if selected_agent == "market_analyst":
-                result = await market_analyst.run(conversational_context, deps=research_agent, message_history=ctx.state.market_messages)
-                ctx.state.market_messages += result.all_messages()
-                print(f"📊 Market Analyst: {result.output}\n")
-                speaker = "market_analyst"
-                
-            elif selected_agent == "product_strategist":
-                result = await product_strategist.run(conversational_context, deps=research_agent, message_history=ctx.state.product_messages)
-                ctx.state.product_messages += result.all_messages()
-                print(f"🛠️ Product Strategist: {result.output}\n")
-                speaker = "product_strategist"
-                
-            elif selected_agent == "financial_planner":
-                result = await financial_planner.run(conversational_context, deps=research_agent, message_history=ctx.state.finance_messages)
-                ctx.state.finance_messages += result.all_messages()
-                print(f"💰 Financial Planner: {result.output}\n")
-                speaker = "financial_planner"
-                
-            else:
-                print("❌ Error: Unknown agent selected")
+            if selected_agent not in EXPERTS:
+                say("❌ Error: Unknown agent selected")
                 continue
             
-            ctx.state.conversation_history.append({
-                "speaker": speaker,
-                "message": result.output,
-                "phase": "open"
-            })
+            await run_expert_turn(ctx.state, selected_agent, conversational_context, research_agent, "open", user_input)
 
     def _generate_session_summary(self, state: EnhancedCofounderState) -> str:
         """Generate a summary of the entire co-founder session"""
+        expert_turns = [msg for msg in state.conversation_history if msg["speaker"] in EXPERTS]
+        cached_turns = sum(1 for msg in expert_turns if msg.get("provenance", {}).get("source") == "semantic_cache")
+        process_stats = self._process_stats() if PROCESS_STATS_IN_SUMMARY else ""
         summary = f"""
 🎉 Enhanced Co-founder Session Complete!
 
@@ -517,10 +675,24 @@ class CoordinatorPhase(BaseNode[EnhancedCofounderState, None, str]):
 - Financial Planning: {'✅' if state.finance_phase_complete else '⏳'}
 
 💬 Total Conversation Messages: {len(state.conversation_history)}
-
+🧠 Expert answers: {len(expert_turns)} ({cached_turns} reused from the answer cache)
+💡 Key insights: {len(state.key_market_insights)} market, {len(state.key_product_insights)} product, {len(state.key_finance_insights)} finance
+{process_stats}
 🔍 Your AI co-founder team provided research-backed insights with real-time data when needed!
         """
         return summary.strip()
+    
+    def _process_stats(self) -> str:
+        """Process-wide effectiveness numbers (shared by every session in this process)"""
+        return f"""
+{coordinator_router.report()}
+⚡ Prefetched phase openers used: {opener_prefetcher.used} (discarded as stale: {opener_prefetcher.invalidated})
+🔧 Research tool latency: {tool_latency_stats.report() or 'no research calls'}
+🪶 Model tiers: {tier_stats.report() or 'no expert turns'}
+♻️ Semantic answer cache: {semantic_cache.stats()}
+🧩 Insight extraction: {insight_extractor.stats()}
+🚦 Gemini rate limiting: {rate_limit_stats() or 'no model calls'}
+"""
 
 # ================= GRAPH DEFINITION =================
 
@@ -546,15 +718,29 @@ async def run_continuous():
     state = EnhancedCofounderState()
     node = InitialInput()
     end = await enhanced_cofounder_graph.run(node, state=state)
+    await drain_background()
     print('\n' + '='*50)
     print('SESSION SUMMARY:')
     print(end.output)
 
+def node_for_state(state: EnhancedCofounderState) -> BaseNode:
+    """Pick the node that resumes a saved session at its current phase"""
+    if state.current_phase == ConversationPhase.MARKET_ANALYSIS:
+        return MarketAnalysisPhase()
+    elif state.current_phase == ConversationPhase.PRODUCT_STRATEGY:
+        return ProductStrategyPhase()
+    elif state.current_phase == ConversationPhase.FINANCIAL_PLANNING:
+        return FinancialPlanningPhase()
+    elif state.current_phase == ConversationPhase.OPEN_DISCUSSION:
+        return CoordinatorPhase()
+    return InitialInput()
+
 async def run_cli(startup_idea: str | None):
     """
     Run with persistence - can resume sessions and handle specific inputs
     """
-    persistence = FileStatePersistence(Path('enhanced_cofounder_session.json'))
+    session_id = os.getenv('COFOUNDER_SESSION_ID', 'cli')
+    persistence = SqliteStatePersistence(Path('enhanced_cofounder_sessions.db'), session_id)
     persistence.set_graph_types(enhanced_cofounder_graph)
     
     # Check for existing session
@@ -563,19 +749,10 @@ async def run_cli(startup_idea: str | None):
         print(f"📁 Resuming session for: {state.startup_idea}")
         
         # Determine current phase and create appropriate node
-        if state.current_phase == ConversationPhase.MARKET_ANALYSIS:
-            node = MarketAnalysisPhase()
-        elif state.current_phase == ConversationPhase.PRODUCT_STRATEGY:
-            node = ProductStrategyPhase()
-        elif state.current_phase == ConversationPhase.FINANCIAL_PLANNING:
-            node = FinancialPlanningPhase()
-        elif state.current_phase == ConversationPhase.OPEN_DISCUSSION:
-            node = CoordinatorPhase()
-        else:
-            node = InitialInput()
+        node = node_for_state(state)
     else:
         # New session
-        state = EnhancedCofounderState()
+        state = EnhancedCofounderState(session_id=session_id)
         if startup_idea:
             state.startup_idea = startup_idea
             state.current_phase = ConversationPhase.MARKET_ANALYSIS
@@ -588,6 +765,7 @@ async def run_cli(startup_idea: str | None):
         while True:
             node = await run.next()
             if isinstance(node, End):
+                await drain_background()
                 print('\n' + '='*50)
                 print('SESSION SUMMARY:')
                 print(node.data)
@@ -595,6 +773,9 @@ async def run_cli(startup_idea: str | None):
                 # Show session history
                 history = await persistence.load_all()
                 print(f'\n📊 Session History: {len(history)} steps completed')
+                
+                # Keep the JSON session file that agent_main.py reads up to date
+                await persistence.export_json(Path('enhanced_cofounder_session.json'))
                 print('✅ Enhanced co-founder session finished!')
                 break
 
@@ -613,13 +794,19 @@ async def main():
 if __name__ == '__main__':
     try:
         sub_command = sys.argv[1]
-        assert sub_command in ('continuous', 'cli', 'mermaid')
+        assert sub_command in ('continuous', 'cli', 'mermaid', 'stats')
     except (IndexError, AssertionError):
         print(
             'Usage:\n'
             '  python app.py mermaid                           # Show graph structure\n'
             '  python app.py continuous                        # Run full session\n'
-            '  python app.py cli ["startup idea"]              # Run with persistence\n',
+            '  python app.py cli ["startup idea"]              # Run with persistence\n'
+            '  python app.py stats                             # Latency/token percentiles from recorded metrics\n'
+            '  python server.py [port]                         # Host many sessions over HTTP/WebSocket\n'
+            '  python benchmark.py [--sessions N]              # Offline benchmark with simulated models\n'
+            '  python batch_runner.py ideas.jsonl              # Replay scripted sessions for many ideas\n'
+            '\n'
+            'Replies stream token by token; set COFOUNDER_STREAM=0 to print full replies only.\n',
             file=sys.stderr,
         )
         sys.exit(1)
@@ -627,6 +814,8 @@ if __name__ == '__main__':
     if sub_command == 'mermaid':
         print("🔄 Enhanced AI Co-founder Workflow Graph:")
         print(enhanced_cofounder_graph.mermaid_code(start_node=InitialInput))
+    elif sub_command == 'stats':
+        print(stats_report())
     elif sub_command == 'continuous':
         asyncio.run(run_continuous())
     else:  # cli
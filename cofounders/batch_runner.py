@@ -0,0 +1,293 @@
+"""
+Headless batch runner for the co-founder graph.
+Replays scripted founder turns for many startup ideas concurrently and writes each
+finished session state as JSON that agent_main.py can load. Progress is kept in
+SQLite, so an interrupted batch resumes without redoing finished sessions.
+
+Input is JSONL, one session per line:
+    {"id": "meal-planner", "idea": "AI meal planner for busy parents",
+     "turns": ["How big is the market?", "next", "What should the MVP include?", "next", "next", "exit"]}
+Ids name the output files, so they may only use letters, digits, "_", "." and "-";
+other ids (and missing ones) are replaced by a short hash.
+
+    python batch_runner.py ideas.jsonl --out batch_out --concurrency 8
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pydantic
+from pydantic_graph import End
+
+from app import (
+    ConversationPhase,
+    EnhancedCofounderState,
+    MarketAnalysisPhase,
+    enhanced_cofounder_graph,
+    insight_extractor,
+    opener_prefetcher,
+)
+from console import drain_background, use_session_io
+from sqlite_persistence import SqliteStatePersistence
+
+# Inputs sent once a script runs out, so partial scripts still reach the end of the graph
+MAX_AUTO_INPUTS = 8
+# Ids become file names and persistence keys; anything else is replaced by a hash
+SAFE_SESSION_ID = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,99}")
+
+PROGRESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_sessions (
+    session_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    seconds REAL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_cursors (
+    session_id TEXT NOT NULL,
+    snapshot_id TEXT NOT NULL,
+    cursor INTEGER NOT NULL,
+    PRIMARY KEY (session_id, snapshot_id)
+);
+"""
+
+
+@dataclass
+class BatchJob:
+    """One scripted session from the input file"""
+    session_id: str
+    idea: str
+    turns: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_line(cls, line: str) -> "BatchJob":
+        record = json.loads(line)
+        idea = record["idea"].strip()
+        session_id = str(record.get("id") or hashlib.sha1(idea.encode()).hexdigest()[:12])
+        if not SAFE_SESSION_ID.fullmatch(session_id):
+            safe_id = hashlib.sha1(session_id.encode()).hexdigest()[:12]
+            print(f"Warning: id {session_id!r} is not a safe file name, using {safe_id}")
+            session_id = safe_id
+        return cls(session_id, idea, [str(turn) for turn in record.get("turns", [])])
+
+
+class ScriptedSessionIO:
+    """SessionIO that replays a script from a cursor and keeps the transcript"""
+
+    def __init__(self, turns: List[str], state: EnhancedCofounderState, cursor: int = 0):
+        self.turns = turns
+        self.state = state
+        self.cursor = cursor
+        self.auto_inputs = 0
+        self.transcript: List[str] = []
+
+    async def input(self, prompt: str = "") -> str:
+        if self.cursor < len(self.turns):
+            line = self.turns[self.cursor]
+            self.cursor += 1
+        elif self.auto_inputs < MAX_AUTO_INPUTS:
+            # Script exhausted: move through the remaining phases and finish
+            self.auto_inputs += 1
+            line = "exit" if self.state.current_phase == ConversationPhase.OPEN_DISCUSSION else "next"
+        else:
+            raise EOFError("script exhausted before the session ended")
+        self.transcript.append(f"{prompt}{line}\n")
+        return line
+
+    def write(self, text: str) -> None:
+        self.transcript.append(text)
+
+
+class BatchProgress:
+    """Per-session status and script cursors, keyed by the snapshot they belong to"""
+
+    def __init__(self, db_path: Path):
+        self._conn = sqlite3.connect(str(db_path), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(PROGRESS_SCHEMA)
+
+    def status(self, session_id: str) -> Optional[str]:
+        row = self._conn.execute("SELECT status FROM batch_sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def mark(self, session_id: str, status: str, error: Optional[str] = None, seconds: Optional[float] = None) -> None:
+        self._conn.execute(
+            """INSERT INTO batch_sessions (session_id, status, attempts, error, seconds, updated)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(session_id) DO UPDATE SET
+                   status = excluded.status, error = excluded.error, seconds = excluded.seconds,
+                   updated = excluded.updated,
+                   attempts = batch_sessions.attempts + (excluded.status = 'running')""",
+            (session_id, status, int(status == 'running'), error, seconds, time.time()),
+        )
+
+    def save_cursor(self, session_id: str, snapshot_id: str, cursor: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO batch_cursors (session_id, snapshot_id, cursor) VALUES (?, ?, ?)",
+            (session_id, snapshot_id, cursor),
+        )
+
+    def cursor_for(self, session_id: str, snapshot_id: str) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT cursor FROM batch_cursors WHERE session_id = ? AND snapshot_id = ?", (session_id, snapshot_id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def forget_cursors(self, session_id: str) -> None:
+        self._conn.execute("DELETE FROM batch_cursors WHERE session_id = ?", (session_id,))
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM batch_sessions GROUP BY status").fetchall())
+
+
+class BatchRunner:
+    """Runs BatchJobs through the graph under a bounded semaphore"""
+
+    def __init__(self, out_dir: Path, concurrency: int = 4):
+        self.out_dir = Path(out_dir)
+        self.sessions_dir = self.out_dir / "sessions"
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.out_dir / "batch_sessions.db"
+        self.progress = BatchProgress(self.out_dir / "batch_progress.db")
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self._state_adapter = pydantic.TypeAdapter(EnhancedCofounderState)
+
+    def session_file(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.json"
+
+    def is_done(self, job: BatchJob) -> bool:
+        return self.progress.status(job.session_id) == "done" and self.session_file(job.session_id).exists()
+
+    async def _start(self, job: BatchJob, persistence: SqliteStatePersistence):
+        """Resume from the interrupted snapshot when its script cursor is known, otherwise start over"""
+        await persistence.requeue_interrupted()
+        if snapshot := await persistence.load_next():
+            cursor = self.progress.cursor_for(job.session_id, snapshot.id)
+            if cursor is not None:
+                snapshot.node.set_snapshot_id(snapshot.id)
+                return snapshot.node, snapshot.state, cursor
+        # No snapshot, or one written after the last recorded cursor: replay from the beginning
+        await persistence.clear()
+        self.progress.forget_cursors(job.session_id)
+        state = EnhancedCofounderState(
+            session_id=job.session_id,
+            startup_idea=job.idea,
+            current_phase=ConversationPhase.MARKET_ANALYSIS,
+        )
+        state.conversation_history.append({"speaker": "user", "message": job.idea, "phase": "initial"})
+        return MarketAnalysisPhase(), state, 0
+
+    async def run_job(self, job: BatchJob) -> bool:
+        """Run (or resume) one session; True when it reached the end of the graph"""
+        async with self.semaphore:
+            started = time.perf_counter()
+            try:
+                self.progress.mark(job.session_id, "running")
+                persistence = SqliteStatePersistence(self.db_path, job.session_id)
+                persistence.set_graph_types(enhanced_cofounder_graph)
+                node, state, cursor = await self._start(job, persistence)
+
+                io = ScriptedSessionIO(job.turns, state, cursor)
+                use_session_io(io)
+                async with enhanced_cofounder_graph.iter(node, state=state, persistence=persistence) as run:
+                    while True:
+                        node = await run.next()
+                        if isinstance(node, End):
+                            break
+                        # The next node's snapshot is stored; remember where the script stood
+                        self.progress.save_cursor(job.session_id, node.get_snapshot_id(), io.cursor)
+
+                # Let insight extraction for the last turns land before the state is written
+                await insight_extractor.wait(job.session_id)
+
+                # Final state as a plain object, which agent_main.py's load_session_file accepts
+                session_file = self.session_file(job.session_id)
+                tmp_file = session_file.with_suffix(".json.tmp")
+                tmp_file.write_bytes(self._state_adapter.dump_json(state, indent=2))
+                os.replace(tmp_file, session_file)
+                session_file.with_suffix(".txt").write_text("".join(io.transcript), encoding="utf-8")
+
+                elapsed = time.perf_counter() - started
+                self.progress.mark(job.session_id, "done", seconds=elapsed)
+            except Exception as e:
+                self.progress.mark(job.session_id, "failed", f"{type(e).__name__}: {e}", time.perf_counter() - started)
+                print(f"❌ {job.session_id}: {e}")
+                return False
+            finally:
+                opener_prefetcher.discard_session(job.session_id)
+                insight_extractor.discard_session(job.session_id)
+
+            print(f"✅ {job.session_id}: {job.idea[:60]} ({elapsed:.1f}s)")
+            return True
+
+    async def run(self, jobs: List[BatchJob]) -> Dict[str, Any]:
+        pending = [job for job in jobs if not self.is_done(job)]
+        skipped = len(jobs) - len(pending)
+        if skipped:
+            print(f"⏭️ Skipping {skipped} finished session(s)")
+        print(f"🚀 Running {len(pending)} session(s)...")
+
+        started = time.perf_counter()
+        # One job's unexpected error (e.g. the progress db itself failing) must not abort the others
+        results = await asyncio.gather(*(self.run_job(job) for job in pending), return_exceptions=True)
+        for job, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                print(f"❌ {job.session_id}: {type(result).__name__}: {result}")
+        await drain_background()
+        succeeded = sum(1 for result in results if result is True)
+        return {
+            "ran": len(pending),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "skipped": skipped,
+            "seconds": round(time.perf_counter() - started, 1),
+            "status": self.progress.counts(),
+            "output": str(self.sessions_dir),
+        }
+
+
+def load_jobs(path: Path) -> List[BatchJob]:
+    jobs: List[BatchJob] = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = BatchJob.from_line(line)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Warning: skipping line {number}: {e}")
+                continue
+            if job.session_id in seen:
+                print(f"Warning: skipping line {number}: duplicate id {job.session_id}")
+                continue
+            seen.add(job.session_id)
+            jobs.append(job)
+    return jobs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay scripted co-founder sessions for many startup ideas")
+    parser.add_argument("ideas", type=Path, help="JSONL file of {id, idea, turns} records")
+    parser.add_argument("--out", type=Path, default=Path("batch_out"), help="output directory")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessions run at the same time")
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args.ideas)
+    report = asyncio.run(BatchRunner(args.out, args.concurrency).run(jobs))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,334 @@
+"""
+Offline benchmark for enhanced_cofounder_graph.
+Swaps every agent's model for a deterministic FunctionModel with configurable latency,
+drives scripted sessions through all phases (including CoordinatorPhase) and reports
+throughput, per-node overhead, persistence cost and memory growth per turn.
+
+    python benchmark.py --sessions 20 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCalls, FunctionModel
+from pydantic_graph import End
+
+import streaming
+from app import (
+    EnhancedCofounderState,
+    InitialInput,
+    coordinator,
+    coordinator_router,
+    enhanced_cofounder_graph,
+    financial_planner,
+    insight_extractor,
+    market_analyst,
+    product_strategist,
+    semantic_cache,
+)
+from console import drain_background, use_session_io
+from metrics import metrics
+from rate_limit import BACKGROUND, current_priority
+from sqlite_persistence import SqliteStatePersistence
+
+# One scripted founder: idea, two questions per phase, then open discussion.
+# "What do you think overall?" matches no routing keyword, so it exercises the LLM coordinator.
+DEFAULT_SCRIPT = [
+    "AI meal planner for busy parents",
+    "How big is the market for meal planning apps?",
+    "Who are the main competitors?",
+    "next",
+    "What features should the MVP have?",
+    "How should onboarding work?",
+    "next",
+    "What should we charge per month?",
+    "How much funding do we need to raise?",
+    "next",
+    "Who is our target customer segment?",
+    "What do you think overall?",
+    "What should go on the product roadmap?",
+    "exit",
+]
+
+
+@dataclass
+class SessionStats:
+    """Timings collected for one benchmarked session"""
+    turns: int = 0
+    input_wait: float = 0.0
+    model_calls: int = 0
+    model_time: float = 0.0             # Simulated latency on the critical path
+    background_model_time: float = 0.0  # Simulated latency of prefetched openers
+    persistence_time: float = 0.0
+    persistence_ops: int = 0
+    node_time: Dict[str, float] = field(default_factory=dict)
+    node_overhead: Dict[str, float] = field(default_factory=dict)
+    node_turns: Dict[str, int] = field(default_factory=dict)
+    output_chars: int = 0
+
+
+_current: ContextVar[Optional[SessionStats]] = ContextVar('benchmark_session', default=None)
+
+
+class ScriptedIO:
+    """SessionIO that answers prompts from a script and discards output"""
+
+    def __init__(self, script: List[str], stats: SessionStats, think_time: float, memory_samples: List[int]):
+        self.lines = list(script)
+        self.stats = stats
+        self.think_time = think_time
+        self.memory_samples = memory_samples
+
+    async def input(self, prompt: str = "") -> str:
+        if tracemalloc.is_tracing():
+            self.memory_samples.append(tracemalloc.get_traced_memory()[0])
+        start = time.perf_counter()
+        await asyncio.sleep(self.think_time)
+        self.stats.input_wait += time.perf_counter() - start
+        self.stats.turns += 1
+        if not self.lines:
+            raise EOFError("script exhausted")
+        return self.lines.pop(0)
+
+    def write(self, text: str) -> None:
+        self.stats.output_chars += len(text)
+
+
+class SimulatedModels:
+    """Deterministic FunctionModels standing in for Gemini, one per agent"""
+
+    def __init__(self, latency: float, reply_words: int):
+        self.latency = latency
+        self.reply_words = reply_words
+
+    async def _wait(self, seconds: float) -> None:
+        start = time.perf_counter()
+        await asyncio.sleep(seconds)
+        stats = _current.get()
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            if current_priority() >= BACKGROUND:
+                stats.background_model_time += elapsed
+            else:
+                stats.model_time += elapsed
+
+    def _count_call(self) -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.model_calls += 1
+
+    def _words(self, name: str) -> List[str]:
+        return [f"{name}-insight-{i}" for i in range(self.reply_words)]
+
+    def expert(self, name: str) -> FunctionModel:
+        async def reply(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+            self._count_call()
+            await self._wait(self.latency)
+            return ModelResponse(parts=[TextPart(" ".join(self._words(name)))])
+
+        async def stream(messages: List[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+            self._count_call()
+            words = self._words(name)
+            # Half the latency before the first token, the rest spread over the reply
+            await self._wait(self.latency / 2)
+            yield words[0]
+            for word in words[1:]:
+                await self._wait(self.latency / 2 / max(1, len(words) - 1))
+                yield " " + word
+
+        return FunctionModel(reply, stream_function=stream, model_name=f"simulated-{name}")
+
+    def coordinator(self) -> FunctionModel:
+        async def select(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+            self._count_call()
+            await self._wait(self.latency)
+            args = {"selected_agent": "product_strategist", "reasoning": "simulated routing"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        async def stream(messages: List[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+            self._count_call()
+            await self._wait(self.latency)
+            yield {0: {"name": info.output_tools[0].name,
+                       "json_args": '{"selected_agent": "product_strategist", "reasoning": "simulated routing"}'}}
+
+        return FunctionModel(select, stream_function=stream, model_name="simulated-coordinator")
+
+    def insight_extractor(self) -> FunctionModel:
+        async def extract(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+            self._count_call()
+            await self._wait(self.latency / 2)
+            args = {"response": ["simulated key insight"]}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        return FunctionModel(extract, model_name="simulated-insights")
+
+
+class TimedPersistence(SqliteStatePersistence):
+    """SqliteStatePersistence that charges its own bookkeeping time to the session"""
+
+    def __init__(self, *args, stats: SessionStats, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+
+    def _charge(self, start: float) -> None:
+        self.stats.persistence_time += time.perf_counter() - start
+        self.stats.persistence_ops += 1
+
+    async def snapshot_node(self, state, next_node) -> None:
+        start = time.perf_counter()
+        await super().snapshot_node(state, next_node)
+        self._charge(start)
+
+    async def snapshot_node_if_new(self, snapshot_id, state, next_node) -> None:
+        start = time.perf_counter()
+        await super().snapshot_node_if_new(snapshot_id, state, next_node)
+        self._charge(start)
+
+    async def snapshot_end(self, state, end) -> None:
+        start = time.perf_counter()
+        await super().snapshot_end(state, end)
+        self._charge(start)
+
+    @asynccontextmanager
+    async def record_run(self, snapshot_id: str) -> AsyncIterator[None]:
+        recorder = super().record_run(snapshot_id)
+        start = time.perf_counter()
+        await recorder.__aenter__()
+        self._charge(start)
+        try:
+            yield
+        except BaseException as e:
+            start = time.perf_counter()
+            await recorder.__aexit__(type(e), e, e.__traceback__)
+            self._charge(start)
+            raise
+        start = time.perf_counter()
+        await recorder.__aexit__(None, None, None)
+        self._charge(start)
+
+
+async def run_session(index: int, db_path: Path, script: List[str], think_time: float, memory_samples: List[int]) -> SessionStats:
+    """Drive one scripted session through the graph and attribute time to each node"""
+    stats = SessionStats()
+    _current.set(stats)
+    use_session_io(ScriptedIO(script, stats, think_time, memory_samples))
+
+    session_id = f"bench-{index}"
+    persistence = TimedPersistence(db_path, session_id, stats=stats)
+    persistence.set_graph_types(enhanced_cofounder_graph)
+    state = EnhancedCofounderState(session_id=session_id)
+
+    async with enhanced_cofounder_graph.iter(InitialInput(), state=state, persistence=persistence) as run:
+        node = run.next_node
+        while not isinstance(node, End):
+            name = type(node).__name__
+            before = (time.perf_counter(), stats.model_time, stats.input_wait, stats.persistence_time, stats.turns)
+            node = await run.next()
+            wall = time.perf_counter() - before[0]
+            overhead = wall - (stats.model_time - before[1]) - (stats.input_wait - before[2]) - (stats.persistence_time - before[3])
+            stats.node_time[name] = stats.node_time.get(name, 0.0) + wall
+            stats.node_overhead[name] = stats.node_overhead.get(name, 0.0) + overhead
+            stats.node_turns[name] = stats.node_turns.get(name, 0) + (stats.turns - before[4])
+    return stats
+
+
+def _report(results: List[SessionStats], wall: float, memory_samples: List[int], args) -> str:
+    turns = sum(stats.turns for stats in results)
+    calls = sum(stats.model_calls for stats in results)
+    lines = [
+        f"🏁 {len(results)} session(s), {turns} user turns, {calls} simulated model calls in {wall:.2f}s",
+        f"   model latency {args.latency * 1000:.0f}ms, think time {args.think_time * 1000:.0f}ms, "
+        f"streaming {'on' if streaming.STREAMING_ENABLED else 'off'}",
+        f"⚡ Throughput: {turns / wall:.1f} turns/s, {len(results) / wall * 60:.1f} sessions/min",
+        "",
+        "🧩 Per-node overhead (node wall time minus simulated model time, input wait and persistence):",
+    ]
+    names = sorted({name for stats in results for name in stats.node_time})
+    for name in names:
+        node_turns = sum(stats.node_turns.get(name, 0) for stats in results) or 1
+        total = sum(stats.node_time.get(name, 0.0) for stats in results)
+        overhead = sum(stats.node_overhead.get(name, 0.0) for stats in results)
+        lines.append(f"   {name:<24} wall {total:7.2f}s  overhead {overhead * 1000 / node_turns:7.2f}ms/turn")
+
+    persistence_time = sum(stats.persistence_time for stats in results)
+    persistence_ops = sum(stats.persistence_ops for stats in results) or 1
+    background = sum(stats.background_model_time for stats in results)
+    lines += [
+        "",
+        f"💾 Persistence: {persistence_time:.2f}s total, {persistence_time * 1000 / persistence_ops:.2f}ms/op, "
+        f"{persistence_time * 1000 / max(1, turns):.2f}ms/turn",
+        f"🔮 Prefetch: {background:.2f}s of simulated model time ran in the background",
+    ]
+    if len(memory_samples) > 1:
+        growth = (memory_samples[-1] - memory_samples[0]) / max(1, len(memory_samples) - 1)
+        lines.append(
+            f"🧠 Memory: {memory_samples[0] / 1e6:.1f}MB -> {memory_samples[-1] / 1e6:.1f}MB traced, "
+            f"{growth / 1024:.1f}KB/turn (tracemalloc; adds overhead to timings)"
+        )
+    return "\n".join(lines)
+
+
+async def benchmark(args) -> str:
+    streaming.STREAMING_ENABLED = args.stream
+    # Keep the run offline and deterministic
+    semantic_cache.enabled = False
+    coordinator_router.use_embeddings = False
+    metrics.enabled = args.metrics
+
+    models = SimulatedModels(args.latency, args.reply_words)
+    memory_samples: List[int] = []
+    if args.trace_memory:
+        gc.collect()
+        tracemalloc.start()
+
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as overrides:
+        for name, agent in (("market", market_analyst), ("product", product_strategist), ("finance", financial_planner)):
+            overrides.enter_context(agent.override(model=models.expert(name)))
+        overrides.enter_context(coordinator.override(model=models.coordinator()))
+        overrides.enter_context(insight_extractor.agent.override(model=models.insight_extractor()))
+
+        db_path = Path(args.db) if args.db else Path(tmp) / "bench_sessions.db"
+        semaphore = asyncio.Semaphore(args.concurrency or args.sessions)
+
+        async def bounded(index: int) -> SessionStats:
+            async with semaphore:
+                return await run_session(index, db_path, DEFAULT_SCRIPT, args.think_time, memory_samples)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(bounded(i) for i in range(args.sessions)))
+        wall = time.perf_counter() - start
+        await drain_background()
+
+    if args.trace_memory:
+        tracemalloc.stop()
+    return _report(results, wall, memory_samples, args)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the co-founder graph with simulated models")
+    parser.add_argument("--sessions", type=int, default=10, help="scripted sessions to run")
+    parser.add_argument("--concurrency", type=int, default=0, help="max sessions in flight (default: all)")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per model call")
+    parser.add_argument("--think-time", type=float, default=0.0, help="simulated seconds the user takes per input")
+    parser.add_argument("--reply-words", type=int, default=60, help="words per simulated expert reply")
+    parser.add_argument("--stream", action="store_true", help="stream replies as in the interactive CLI")
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false", help="skip tracemalloc")
+    parser.add_argument("--metrics", action="store_true", help="also record calls in the local metrics db")
+    parser.add_argument("--db", help="keep session snapshots in this SQLite file instead of a temp file")
+    args = parser.parse_args(argv)
+    print(asyncio.run(benchmark(args)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
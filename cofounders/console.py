@@ -0,0 +1,154 @@
+"""
+Non-blocking console I/O for the co-founder graph.
+Lets graph nodes await user input while background tasks keep running on the event loop,
+and lets each hosted session route its input and output to its own channel.
+"""
+
+import asyncio
+import contextvars
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Coroutine, Iterator, List, Optional, Protocol, Set
+
+
+class AsyncConsole:
+    """
+    Line reader that feeds stdin into an asyncio queue from a single daemon thread.
+
+    A reader thread is used instead of connect_read_pipe because switching a
+    terminal's stdin to non-blocking mode also affects stdout on the same tty.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _start(self) -> None:
+        """Start the reader thread bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._read_lines, name="console-reader", daemon=True)
+            self._thread.start()
+
+    def _read_lines(self) -> None:
+        """Blocking stdin loop; runs on the reader thread"""
+        while True:
+            line = sys.stdin.readline()
+            loop, queue = self._loop, self._queue
+            if loop is None or loop.is_closed():
+                return
+            loop.call_soon_threadsafe(queue.put_nowait, line if line else None)
+            if not line:
+                return
+
+    async def input(self, prompt: str = "") -> str:
+        """Async drop-in for the builtin input(); raises EOFError when stdin closes"""
+        self._start()
+        if prompt:
+            print(prompt, end='', flush=True)
+        line = await self._queue.get()
+        if line is None:
+            raise EOFError("stdin closed")
+        return line.rstrip('\n')
+
+
+class SessionIO(Protocol):
+    """Input/output channel for one hosted session (see server.py)"""
+
+    async def input(self, prompt: str = "") -> str: ...
+
+    def write(self, text: str) -> None: ...
+
+
+console = AsyncConsole()
+
+# Channel of the session running in the current task; None means the terminal
+_session_io: ContextVar[Optional[SessionIO]] = ContextVar('cofounder_session_io', default=None)
+
+def use_session_io(io: SessionIO) -> None:
+    """Bind graph input/output in the current task (and tasks it spawns) to `io`"""
+    _session_io.set(io)
+
+async def ainput(prompt: str = "") -> str:
+    """Read one line from the current session channel without blocking the event loop"""
+    io = _session_io.get()
+    if io is not None:
+        return await io.input(prompt)
+    return await console.input(prompt)
+
+def say(*values, sep: str = ' ', end: str = '\n', flush: bool = False) -> None:
+    """print() replacement that writes to the current session channel"""
+    io = _session_io.get()
+    if io is None:
+        print(*values, sep=sep, end=end, flush=flush)
+    else:
+        io.write(sep.join(str(value) for value in values) + end)
+
+
+class BufferedOutput:
+    """SessionIO that holds output so a concurrent turn can be printed in one piece"""
+
+    def __init__(self, outer: Optional[SessionIO] = None):
+        self.parts: List[str] = []
+        # Channel the buffer is flushed to; background work spawned inside the block writes there
+        self.outer = outer
+
+    async def input(self, prompt: str = "") -> str:
+        raise RuntimeError("buffered output cannot read input")
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+@contextmanager
+def buffered_output() -> Iterator[BufferedOutput]:
+    """Collect everything said in the block, then say it at once on the enclosing channel"""
+    buffer = BufferedOutput(_session_io.get())
+    token = _session_io.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _session_io.reset(token)
+        if buffer.parts:
+            say(buffer.getvalue(), end='', flush=True)
+
+
+# Strong references to running background tasks so they are not garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+def spawn_background(coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+    """Run a coroutine alongside the conversation; failures are reported, never raised into a turn"""
+    # A buffer is flushed when its block ends, so later output must go to the channel behind it
+    io = _session_io.get()
+    while isinstance(io, BufferedOutput):
+        io = io.outer
+    context = contextvars.copy_context()
+    context.run(_session_io.set, io)
+    task = asyncio.create_task(coro, name=name, context=context)
+    _background_tasks.add(task)
+
+    def _done(finished: asyncio.Task) -> None:
+        _background_tasks.discard(finished)
+        if not finished.cancelled() and finished.exception():
+            say(f"\nWarning: background task {finished.get_name()} failed: {finished.exception()}")
+
+    task.add_done_callback(_done, context=context)
+    return task
+
+async def drain_background(timeout: float = 5.0) -> None:
+    """Wait briefly for outstanding background work, cancelling whatever is left"""
+    if not _background_tasks:
+        return
+    pending = list(_background_tasks)
+    _, still_running = await asyncio.wait(pending, timeout=timeout)
+    for task in still_running:
+        task.cancel()
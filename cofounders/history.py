@@ -0,0 +1,178 @@
+"""
+Bounded message-history compaction for the co-founder agents.
+Keeps each agent's history deduplicated and within a token budget by folding
+older turns into a rolling summary carried in the leading system message.
+"""
+
+import hashlib
+import os
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+
+SUMMARY_PREFIX = "Summary of earlier conversation:"
+
+# Approximate token budget per agent history (override all with COFOUNDER_HISTORY_TOKENS)
+DEFAULT_TOKEN_BUDGETS: Dict[str, int] = {
+    "market_messages": 4000,
+    "product_messages": 4000,
+    "finance_messages": 4000,
+    "coordinator_messages": 1500,
+}
+
+# Share of the budget reserved for the rolling summary of folded turns
+SUMMARY_BUDGET_SHARE = 0.25
+
+# Characters kept from each folded message when adding it to the summary
+SNIPPET_CHARS = 240
+
+
+def token_budget_for(history_field: str) -> int:
+    """Return the token budget for an agent history field"""
+    override = os.getenv('COFOUNDER_HISTORY_TOKENS')
+    if override:
+        return int(override)
+    return DEFAULT_TOKEN_BUDGETS.get(history_field, 4000)
+
+
+def estimate_tokens(messages: List[ModelMessage]) -> int:
+    """Cheap token estimate (~4 characters per token) for a list of messages"""
+    chars = 0
+    for message in messages:
+        for part in message.parts:
+            content = getattr(part, 'content', None)
+            if content is None:
+                content = getattr(part, 'args', '')
+            chars += len(str(content))
+    return chars // 4
+
+
+def _fingerprint(message: ModelMessage) -> str:
+    """Stable identity for a message, used to drop exact duplicates"""
+    return hashlib.sha1(ModelMessagesTypeAdapter.dump_json([message])).hexdigest()
+
+
+def dedupe_messages(messages: List[ModelMessage]) -> List[ModelMessage]:
+    """Remove repeated messages while keeping the first occurrence order"""
+    seen = set()
+    unique = []
+    for message in messages:
+        key = _fingerprint(message)
+        if key not in seen:
+            seen.add(key)
+            unique.append(message)
+    return unique
+
+
+def _split_turns(messages: List[ModelMessage]) -> Tuple[List[SystemPromptPart], str, List[List[ModelMessage]]]:
+    """
+    Split a history into (system prompt parts, existing summary, turns).
+    A turn starts at every request carrying a user prompt, so tool calls and
+    their returns always stay together with the turn that produced them.
+    """
+    system_parts: List[SystemPromptPart] = []
+    summary = ""
+    turns: List[List[ModelMessage]] = []
+
+    for message in messages:
+        if isinstance(message, ModelRequest):
+            other_parts = []
+            for part in message.parts:
+                if isinstance(part, SystemPromptPart):
+                    if part.content.startswith(SUMMARY_PREFIX):
+                        summary = part.content[len(SUMMARY_PREFIX):].strip()
+                    elif not turns:
+                        system_parts.append(part)
+                else:
+                    other_parts.append(part)
+            if not other_parts:
+                continue
+            message = replace(message, parts=other_parts)
+            if any(isinstance(part, UserPromptPart) for part in other_parts) or not turns:
+                turns.append([])
+        elif not turns:
+            turns.append([])
+        turns[-1].append(message)
+
+    return system_parts, summary, turns
+
+
+def _summarize_turn(turn: List[ModelMessage]) -> List[str]:
+    """Fold a turn into short summary lines without an extra LLM call"""
+    lines = []
+    for message in turn:
+        for part in message.parts:
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                speaker = "user"
+            elif isinstance(message, ModelResponse) and isinstance(part, TextPart):
+                speaker = "assistant"
+            else:
+                continue
+            text = " ".join(part.content.split())
+            if len(text) > SNIPPET_CHARS:
+                text = text[:SNIPPET_CHARS].rstrip() + "..."
+            if text:
+                lines.append(f"- {speaker}: {text}")
+    return lines
+
+
+def compact_history(messages: List[ModelMessage], token_budget: int) -> List[ModelMessage]:
+    """
+    Return a deduplicated history that fits `token_budget`.
+    The most recent turns are kept verbatim; older turns are folded into a
+    rolling summary that lives next to the system prompt in the first request.
+    """
+    messages = dedupe_messages(messages)
+    if estimate_tokens(messages) <= token_budget:
+        return messages
+
+    system_parts, summary, turns = _split_turns(messages)
+    if len(turns) <= 1:
+        return messages
+
+    summary_budget = int(token_budget * SUMMARY_BUDGET_SHARE)
+    turn_budget = token_budget - summary_budget - estimate_tokens([ModelRequest(parts=system_parts)])
+
+    # Keep the newest turns that fit, always at least the latest one
+    kept: List[List[ModelMessage]] = []
+    used = 0
+    for turn in reversed(turns):
+        cost = estimate_tokens(turn)
+        if kept and used + cost > turn_budget:
+            break
+        kept.insert(0, turn)
+        used += cost
+
+    summary_lines = summary.splitlines() if summary else []
+    for turn in turns[:len(turns) - len(kept)]:
+        summary_lines.extend(_summarize_turn(turn))
+
+    # Drop the oldest summary lines once the summary itself exceeds its share
+    while summary_lines and len("\n".join(summary_lines)) // 4 > summary_budget:
+        summary_lines.pop(0)
+
+    head_parts = list(system_parts)
+    if summary_lines:
+        head_parts.append(SystemPromptPart(content=f"{SUMMARY_PREFIX}\n" + "\n".join(summary_lines)))
+
+    first = kept[0][0]
+    if isinstance(first, ModelRequest):
+        kept[0][0] = replace(first, parts=head_parts + list(first.parts))
+    elif head_parts:
+        kept[0].insert(0, ModelRequest(parts=head_parts))
+
+    return [message for turn in kept for message in turn]
+
+
+def record_turn(history: List[ModelMessage], new_messages: List[ModelMessage], history_field: str) -> None:
+    """Append a turn's new messages to an agent history and compact it in place"""
+    history[:] = compact_history(history + list(new_messages), token_budget_for(history_field))
@@ -0,0 +1,202 @@
+"""
+Background extraction of key insights from expert turns.
+After each turn the answer (and any research it used) is mined for insight sentences
+off the critical path: a cheap local scorer runs first and a lite-tier LLM is only
+consulted when it finds nothing in a substantial answer. New insights are merged into
+the session's key_*_insights lists with near-duplicate suppression.
+"""
+
+import asyncio
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from pydantic_ai import Agent
+
+from console import spawn_background
+from model_tiers import MODEL_TIERS
+from rate_limit import BACKGROUND, set_priority
+from metrics import record_agent_run
+
+INSIGHTS_ENABLED = os.getenv('COFOUNDER_INSIGHTS', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# State field filled for each expert
+INSIGHT_FIELDS = {
+    "market_analyst": "key_market_insights",
+    "product_strategist": "key_product_insights",
+    "financial_planner": "key_finance_insights",
+}
+
+# Per-field cap; the oldest insights are dropped beyond it
+MAX_INSIGHTS = 25
+# Answers shorter than this are not worth an LLM call when the local pass finds nothing
+LLM_FALLBACK_MIN_CHARS = 200
+LOCAL_MIN_SCORE = 2
+LOCAL_PER_TURN = 2
+DUPLICATE_SIMILARITY = 0.8
+# Characters of each research result kept in research_insights
+RESEARCH_DIGEST_CHARS = 600
+# Research digests kept per session; the least recently refreshed are dropped beyond it
+MAX_RESEARCH_INSIGHTS = 20
+
+SIGNAL_WORDS = {
+    "market", "customers", "segment", "competitor", "competitors", "growth", "demand", "trend",
+    "mvp", "feature", "features", "retention", "differentiation", "onboarding", "users",
+    "pricing", "revenue", "margin", "margins", "cac", "ltv", "churn", "funding", "runway",
+    "break-even", "profitability", "subscription", "should", "recommend", "focus", "key",
+}
+NUMERIC = re.compile(r"\d|\$|%|€|£")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+CITATION = re.compile(r"\[\d+\]\([^)]*\)")
+WORD = re.compile(r"[a-z0-9$%'-]+")
+
+INSIGHT_PROMPT = """Extract at most 3 key insights from this {role} answer about a startup idea.
+Each insight is one short, self-contained sentence with any concrete numbers kept.
+Return an empty list if the answer contains no real insight.
+
+Answer:
+{answer}"""
+
+
+def _words(text: str) -> Set[str]:
+    return set(WORD.findall(text.lower()))
+
+def _normalize(text: str) -> str:
+    return " ".join(WORD.findall(text.lower()))
+
+def is_duplicate(candidate: str, existing: Sequence[str]) -> bool:
+    """Same sentence after normalization, or word overlap (Jaccard) above DUPLICATE_SIMILARITY"""
+    normalized = _normalize(candidate)
+    words = _words(candidate)
+    for insight in existing:
+        if _normalize(insight) == normalized:
+            return True
+        other = _words(insight)
+        if words and other and len(words & other) / len(words | other) >= DUPLICATE_SIMILARITY:
+            return True
+    return False
+
+def local_insights(answer: str, limit: int = LOCAL_PER_TURN) -> List[str]:
+    """Cheap heuristic pass: keep the sentences with the most numbers and domain signal words"""
+    scored = []
+    for position, sentence in enumerate(SENTENCE_SPLIT.split(CITATION.sub("", answer))):
+        sentence = sentence.strip().strip("-*• ").strip()
+        words = sentence.split()
+        if sentence.endswith("?") or not 6 <= len(words) <= 45:
+            continue
+        score = 2 * min(len(NUMERIC.findall(sentence)), 2)
+        score += len(_words(sentence) & SIGNAL_WORDS)
+        if score >= LOCAL_MIN_SCORE:
+            scored.append((score, -position, sentence))
+    scored.sort(reverse=True)
+    # Keep the chosen sentences in the order the expert said them
+    return [sentence for _, _, sentence in sorted(scored[:limit], key=lambda item: -item[1])]
+
+
+class InsightExtractor:
+    """Schedules extraction after each turn and merges the results into session state"""
+
+    def __init__(self, enabled: bool = INSIGHTS_ENABLED):
+        self.enabled = enabled
+        self._agent: Optional[Agent] = None
+        self._pending: Dict[str, Set[asyncio.Task]] = {}
+
+        self.turns = 0
+        self.local_hits = 0
+        self.llm_calls = 0
+        self.added = 0
+        self.duplicates = 0
+
+    @property
+    def agent(self) -> Agent:
+        """Lite-tier extractor agent, built on first use"""
+        if self._agent is None:
+            self._agent = Agent(MODEL_TIERS["lite"].model, output_type=List[str])
+        return self._agent
+
+    async def _llm_insights(self, speaker: str, answer: str) -> List[str]:
+        set_priority(BACKGROUND)
+        self.llm_calls += 1
+        start = time.perf_counter()
+        role = speaker.replace("_", " ")
+        try:
+            result = await self.agent.run(INSIGHT_PROMPT.format(role=role, answer=answer))
+        except Exception:
+            record_agent_run("insight_extractor", time.perf_counter() - start, ok=False)
+            raise
+        record_agent_run("insight_extractor", time.perf_counter() - start, result.new_messages(), result.usage())
+        return [insight.strip() for insight in result.output if insight.strip()]
+
+    def merge(self, insights: List[str], new: List[str]) -> int:
+        """Append the new insights that are not near-duplicates; returns how many were added"""
+        added = 0
+        for insight in new:
+            if is_duplicate(insight, insights):
+                self.duplicates += 1
+                continue
+            insights.append(insight)
+            added += 1
+        del insights[:-MAX_INSIGHTS]
+        self.added += added
+        return added
+
+    async def _extract(self, state: Any, speaker: str, answer: str, research_calls: Sequence[Any]) -> None:
+        research = state.research_insights
+        for call in research_calls:
+            if call.ok and call.result:
+                key = f"{call.tool}: {call.subject}"
+                # Re-insert so a refreshed digest counts as the newest
+                research.pop(key, None)
+                research[key] = call.result[:RESEARCH_DIGEST_CHARS]
+        for key in list(research)[:-MAX_RESEARCH_INSIGHTS]:
+            del research[key]
+
+        field_name = INSIGHT_FIELDS.get(speaker)
+        if field_name is None:
+            return
+        found = local_insights(answer)
+        if found:
+            self.local_hits += 1
+        elif len(answer) >= LLM_FALLBACK_MIN_CHARS:
+            found = await self._llm_insights(speaker, answer)
+        self.merge(getattr(state, field_name), found)
+
+    def schedule(self, state: Any, speaker: str, answer: str, research_calls: Sequence[Any] = ()) -> None:
+        """Extract insights from a finished turn in the background"""
+        if not self.enabled or not answer:
+            return
+        self.turns += 1
+        pending = self._pending.setdefault(state.session_id, set())
+        task = spawn_background(
+            self._extract(state, speaker, answer, list(research_calls)),
+            name=f"insights:{state.session_id}:{speaker}",
+        )
+        pending.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            pending.discard(finished)
+            if not pending and self._pending.get(state.session_id) is pending:
+                del self._pending[state.session_id]
+
+        task.add_done_callback(_done)
+
+    async def wait(self, session_id: str, timeout: float = 10.0) -> None:
+        """Let a session's outstanding extractions finish (e.g. before saving or summarizing it)"""
+        pending = self._pending.pop(session_id, set())
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    def discard_session(self, session_id: str) -> None:
+        """Cancel the outstanding extractions of a finished or evicted session"""
+        for task in self._pending.pop(session_id, set()):
+            task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "turns": self.turns,
+            "local": self.local_hits,
+            "llm_fallbacks": self.llm_calls,
+            "added": self.added,
+            "duplicates": self.duplicates,
+        }
@@ -0,0 +1,201 @@
+"""
+Local metrics for the co-founder graph.
+Every agent run, research call and graph node execution is appended to a small
+SQLite file; `python app.py stats` prints latency and token percentiles from it.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, RetryPromptPart
+from pydantic_ai.usage import Usage
+
+# Metrics are on by default; set COFOUNDER_METRICS=0 to stop recording
+METRICS_ENABLED = os.getenv('COFOUNDER_METRICS', '1').lower() not in ('0', 'false', 'no', 'off')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    model TEXT,
+    wall REAL NOT NULL,
+    ttft REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    retries INTEGER NOT NULL DEFAULT 0,
+    ok INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS calls_kind_name ON calls (kind, name);
+"""
+
+
+class MetricsRecorder:
+    """Append-only call log; recording never raises into the caller"""
+
+    def __init__(self, db_path: Optional[Path] = None, enabled: bool = METRICS_ENABLED):
+        """
+        Args:
+            db_path: SQLite file for metrics (defaults to COFOUNDER_METRICS_PATH or cofounder_metrics.db)
+            enabled: Record calls; when False every record() is a no-op
+        """
+        self.db_path = Path(db_path or os.getenv('COFOUNDER_METRICS_PATH', 'cofounder_metrics.db'))
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        wall: float,
+        *,
+        model: Optional[str] = None,
+        ttft: Optional[float] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        retries: int = 0,
+        ok: bool = True,
+    ) -> None:
+        """Append one call; kind is 'agent', 'research' or 'node'"""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "INSERT INTO calls (ts, kind, name, model, wall, ttft, input_tokens, output_tokens, retries, ok) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (time.time(), kind, name, model, wall, ttft, input_tokens, output_tokens, retries, int(ok)),
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: metrics disabled after write failure: {e}")
+            self.enabled = False
+
+    def rows(self) -> List[Tuple]:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT kind, name, model, wall, ttft, input_tokens, output_tokens, retries, ok FROM calls"
+            ).fetchall()
+
+
+metrics = MetricsRecorder()
+
+
+def record_agent_run(
+    name: str,
+    wall: float,
+    new_messages: Sequence[ModelMessage] = (),
+    usage: Optional[Usage] = None,
+    ttft: Optional[float] = None,
+    model: Optional[str] = None,
+    ok: bool = True,
+) -> None:
+    """Record one pydantic_ai agent run; model and retries are read from the run's messages"""
+    retries = 0
+    for message in new_messages:
+        if isinstance(message, ModelResponse) and message.model_name:
+            model = message.model_name
+        else:
+            retries += sum(1 for part in message.parts if isinstance(part, RetryPromptPart))
+    metrics.record(
+        "agent", name, wall,
+        model=model,
+        ttft=ttft,
+        input_tokens=usage.request_tokens if usage else None,
+        output_tokens=usage.response_tokens if usage else None,
+        retries=retries,
+        ok=ok,
+    )
+
+
+# ================= REPORTING =================
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def _fmt(value: Optional[float], unit: str = "s") -> str:
+    if value is None:
+        return "-"
+    return f"{value:.2f}{unit}" if unit == "s" else f"{int(value)}"
+
+def _histogram(values: List[float], width: int = 24) -> str:
+    """Tiny log-scale bar chart of wall times"""
+    edges = [0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, math.inf]
+    counts = [0] * len(edges)
+    for value in values:
+        counts[next(i for i, edge in enumerate(edges) if value <= edge)] += 1
+    peak = max(counts) or 1
+    lines = []
+    lower = 0.0
+    for edge, count in zip(edges, counts):
+        if count:
+            label = f"{lower:g}-{edge:g}s" if edge != math.inf else f">{lower:g}s"
+            lines.append(f"      {label:>10} {'█' * max(1, round(count / peak * width))} {count}")
+        lower = edge
+    return "\n".join(lines)
+
+def stats_report(recorder: Optional[MetricsRecorder] = None, histograms: bool = True) -> str:
+    """p50/p95/p99 of wall time, TTFT and tokens per (kind, name, model)"""
+    recorder = recorder or metrics
+    if not recorder.db_path.exists():
+        return f"No metrics recorded yet ({recorder.db_path})"
+
+    groups: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for kind, name, model, wall, ttft, input_tokens, output_tokens, retries, ok in recorder.rows():
+        group = groups.setdefault((kind, name, model or "-"), {
+            "wall": [], "ttft": [], "input": [], "output": [], "retries": 0, "errors": 0,
+        })
+        group["wall"].append(wall)
+        if ttft is not None:
+            group["ttft"].append(ttft)
+        if input_tokens is not None:
+            group["input"].append(input_tokens)
+        if output_tokens is not None:
+            group["output"].append(output_tokens)
+        group["retries"] += retries
+        group["errors"] += 0 if ok else 1
+
+    if not groups:
+        return "No metrics recorded yet"
+
+    lines = [f"📈 Metrics from {recorder.db_path}"]
+    current_kind = None
+    for (kind, name, model), group in sorted(groups.items()):
+        if kind != current_kind:
+            current_kind = kind
+            lines.append(f"\n== {kind} ==")
+        wall = group["wall"]
+        lines.append(
+            f"  {name} [{model}] n={len(wall)} retries={group['retries']} errors={group['errors']}"
+        )
+        for label, values, unit in (
+            ("wall", wall, "s"),
+            ("ttft", group["ttft"], "s"),
+            ("tokens in", group["input"], "tok"),
+            ("tokens out", group["output"], "tok"),
+        ):
+            if values:
+                p50, p95, p99 = (percentile(values, q) for q in (50, 95, 99))
+                lines.append(f"    {label:<10} p50 {_fmt(p50, unit):>8}  p95 {_fmt(p95, unit):>8}  p99 {_fmt(p99, unit):>8}")
+        if histograms:
+            lines.append(_histogram(wall))
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""
+Per-turn model tiering for the expert agents.
+Short conversational follow-ups go to a cheaper, lower-latency model; research-heavy,
+numeric and long turns keep the full model. Latency and cost are tracked per tier.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from rate_limit import RateLimitedModel
+from streaming import AgentTurn
+
+# Tiering is on by default; set COFOUNDER_TIERING=0 to always use the full model
+TIERING_ENABLED = os.getenv('COFOUNDER_TIERING', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Follow-ups longer than this are treated as substantive questions
+SHORT_MESSAGE_CHARS = 160
+# Long histories (close to compaction) need the full model to keep track of context
+DEEP_HISTORY_MESSAGES = 24
+
+NUMERIC_KEYWORDS = [
+    'projection', 'forecast', 'revenue', 'burn', 'runway', 'valuation', 'cac', 'ltv',
+    'margin', 'unit economics', 'break-even', 'breakeven', 'cash flow', 'budget', 'cost',
+    'price', 'pricing', 'how much', 'how many', 'roi',
+]
+NUMERIC_PATTERN = re.compile(r'[$€£%]|\d')
+
+
+@dataclass
+class ModelTier:
+    """A model choice with its list prices (USD per million tokens)"""
+    name: str
+    model_name: str
+    input_cost: float
+    output_cost: float
+    _model: Optional[RateLimitedModel] = None
+
+    @property
+    def model(self) -> RateLimitedModel:
+        """Rate-limited pydantic_ai model for this tier, built on first use"""
+        if self._model is None:
+            self._model = RateLimitedModel(self.model_name)
+        return self._model
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_cost + output_tokens * self.output_cost) / 1_000_000
+
+
+MODEL_TIERS: Dict[str, ModelTier] = {
+    "lite": ModelTier("lite", os.getenv('COFOUNDER_LITE_MODEL', 'google-gla:gemini-2.0-flash-lite-001'), 0.075, 0.30),
+    "full": ModelTier("full", 'google-gla:gemini-2.0-flash-001', 0.10, 0.40),
+}
+
+
+@dataclass
+class TierChoice:
+    tier: ModelTier
+    reason: str
+
+
+def select_tier(user_message: Optional[str], history_depth: int, speaker: str, research_agent: Any = None) -> TierChoice:
+    """Pick the model tier for one expert turn"""
+    full = MODEL_TIERS["full"]
+    if not TIERING_ENABLED:
+        return TierChoice(full, "tiering disabled")
+    if not user_message:
+        return TierChoice(full, "phase opener")
+    if history_depth == 0:
+        return TierChoice(full, "first turn")
+    if history_depth > DEEP_HISTORY_MESSAGES:
+        return TierChoice(full, "deep history")
+
+    message = user_message.lower()
+    if research_agent is not None and research_agent.should_include_citations(user_message):
+        return TierChoice(full, "research question")
+    if any(keyword in message for keyword in NUMERIC_KEYWORDS):
+        return TierChoice(full, "numeric question")
+    if speaker == "financial_planner" and NUMERIC_PATTERN.search(user_message):
+        return TierChoice(full, "numeric question")
+    if len(user_message) > SHORT_MESSAGE_CHARS:
+        return TierChoice(full, "long question")
+    return TierChoice(MODEL_TIERS["lite"], "short follow-up")
+
+
+class TierStats:
+    """Latency, token and cost totals per tier"""
+
+    def __init__(self):
+        self.totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, tier: ModelTier, turn: AgentTurn) -> None:
+        totals = self.totals.setdefault(tier.name, {
+            "turns": 0, "seconds": 0.0, "ttft_seconds": 0.0, "ttft_turns": 0,
+            "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+        })
+        input_tokens = (turn.usage.request_tokens or 0) if turn.usage else 0
+        output_tokens = (turn.usage.response_tokens or 0) if turn.usage else 0
+        totals["turns"] += 1
+        totals["seconds"] += turn.total
+        if turn.ttft is not None:
+            totals["ttft_seconds"] += turn.ttft
+            totals["ttft_turns"] += 1
+        totals["input_tokens"] += input_tokens
+        totals["output_tokens"] += output_tokens
+        totals["cost_usd"] += tier.cost(input_tokens, output_tokens)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "turns": totals["turns"],
+                "avg_seconds": round(totals["seconds"] / totals["turns"], 3),
+                "avg_ttft_seconds": round(totals["ttft_seconds"] / totals["ttft_turns"], 3) if totals["ttft_turns"] else None,
+                "input_tokens": totals["input_tokens"],
+                "output_tokens": totals["output_tokens"],
+                "cost_usd": round(totals["cost_usd"], 6),
+            }
+            for name, totals in self.totals.items()
+        }
+
+
+tier_stats = TierStats()
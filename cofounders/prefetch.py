@@ -0,0 +1,132 @@
+"""
+Speculative prefetch of the next phase's opening response.
+Generates the next expert's opener in the background while the user is still
+talking to the current expert, so typing 'next' can show it immediately.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic_ai import Agent
+
+from console import spawn_background
+from rate_limit import BACKGROUND, set_priority
+from streaming import AgentTurn
+from metrics import record_agent_run
+
+PREFETCH_ENABLED = os.getenv('COFOUNDER_PREFETCH', '1').lower() not in ('0', 'false', 'no', 'off')
+# Founder turns the current phase needs before the next opener is worth drafting
+PREFETCH_MIN_TURNS = int(os.getenv('COFOUNDER_PREFETCH_MIN_TURNS', 2))
+# Idle seconds before a draft is generated; a new turn within this window replaces it for free
+PREFETCH_DEBOUNCE = float(os.getenv('COFOUNDER_PREFETCH_DEBOUNCE', 5))
+
+
+@dataclass
+class _Draft:
+    """An opener being generated (or already generated) for a specific prompt"""
+    prompt: str
+    started: float
+    task: Optional[asyncio.Task] = None
+    generating: bool = False
+
+
+class OpenerPrefetcher:
+    """Keeps at most one speculative opener per session and expert, keyed by the exact prompt it answers"""
+
+    def __init__(self, enabled: bool = PREFETCH_ENABLED, min_turns: int = PREFETCH_MIN_TURNS, debounce: float = PREFETCH_DEBOUNCE):
+        """
+        Args:
+            enabled: Generate openers speculatively (defaults to COFOUNDER_PREFETCH, on)
+            min_turns: Founder turns in the current phase before drafting starts
+            debounce: Idle seconds to wait before spending a model call on a draft
+        """
+        self.enabled = enabled
+        self.min_turns = min_turns
+        self.debounce = debounce
+        self._drafts: Dict[Tuple[str, str], _Draft] = {}
+
+        # Effectiveness counters
+        self.used = 0
+        self.invalidated = 0
+
+    async def _generate(self, draft: _Draft, speaker: str, agent: Agent, prompt: str, deps: Any) -> AgentTurn:
+        """Run the opener silently after the debounce window; the phase prints it when the draft is taken"""
+        # Only the draft for the context the founder settles on is paid for
+        await asyncio.sleep(self.debounce)
+        draft.generating = True
+        # Drafts yield to interactive turns when the rate limit is tight
+        set_priority(BACKGROUND)
+        start = time.perf_counter()
+        result = await agent.run(prompt, deps=deps, message_history=[])
+        turn = AgentTurn(
+            output=result.output,
+            all_messages=result.all_messages(),
+            new_messages=result.new_messages(),
+            total=time.perf_counter() - start,
+            usage=result.usage(),
+        )
+        record_agent_run(f"{speaker}:prefetch", turn.total, turn.new_messages, turn.usage)
+        return turn
+
+    def schedule(
+        self,
+        session_id: str,
+        speaker: str,
+        agent: Agent,
+        prompt: str,
+        deps: Any = None,
+        phase_turns: int = 0,
+    ) -> None:
+        """
+        Start (or refresh) the draft for `speaker` if the opener prompt has changed.
+        Nothing is drafted until the current phase has `min_turns` founder turns.
+        """
+        if not self.enabled or phase_turns < self.min_turns:
+            return
+        draft = self._drafts.get((session_id, speaker))
+        if draft and draft.prompt == prompt:
+            return
+        if draft:
+            self.invalidate(session_id, speaker)
+        draft = _Draft(prompt=prompt, started=time.perf_counter())
+        draft.task = spawn_background(self._generate(draft, speaker, agent, prompt, deps), name=f"prefetch-{speaker}")
+        self._drafts[(session_id, speaker)] = draft
+
+    def invalidate(self, session_id: str, speaker: str) -> None:
+        """Discard a stale draft whose context no longer matches the conversation"""
+        draft = self._drafts.pop((session_id, speaker), None)
+        if draft:
+            draft.task.cancel()
+            self.invalidated += 1
+
+    def discard_session(self, session_id: str) -> None:
+        """Drop every draft belonging to a finished or evicted session"""
+        for key in [key for key in self._drafts if key[0] == session_id]:
+            self._drafts.pop(key).task.cancel()
+
+    async def take(self, session_id: str, speaker: str, prompt: str) -> Optional[AgentTurn]:
+        """
+        Return the prefetched opener for `prompt`, awaiting it if still in flight.
+        Returns None when there is no usable draft, in which case the caller runs the agent itself.
+        """
+        draft = self._drafts.pop((session_id, speaker), None)
+        if draft is None:
+            return None
+        if draft.prompt != prompt:
+            draft.task.cancel()
+            self.invalidated += 1
+            return None
+        if not draft.generating:
+            # Still in the debounce window: running the opener live is faster than waiting
+            draft.task.cancel()
+            return None
+
+        await asyncio.wait([draft.task])
+        if draft.task.cancelled() or draft.task.exception():
+            return None
+
+        self.used += 1
+        return draft.task.result()
@@ -0,0 +1,257 @@
+"""
+Process-wide rate limiting for Gemini calls.
+Each model gets a request bucket and a token bucket; callers wait in priority
+order so interactive turns are served before background work such as prefetching.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+from history import estimate_tokens
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+# (requests per minute, tokens per minute); override with COFOUNDER_RATE_LIMITS as
+# JSON, e.g. '{"gemini-2.5-flash": [10, 250000]}' for the free tier
+DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gemini-2.0-flash-001": (2000, 4_000_000),
+    "gemini-2.0-flash-lite-001": (4000, 4_000_000),
+    "gemini-2.5-flash": (1000, 1_000_000),
+}
+FALLBACK_LIMITS: Tuple[int, int] = (500, 500_000)
+
+# Output allowance reserved up front; corrected once the real usage is known
+DEFAULT_OUTPUT_TOKENS = 1024
+
+_priority: ContextVar[int] = ContextVar('cofounder_call_priority', default=INTERACTIVE)
+
+def set_priority(priority: int) -> None:
+    """Set the priority of model calls made from the current task (and tasks it spawns)"""
+    _priority.set(priority)
+
+def current_priority() -> int:
+    return _priority.get()
+
+@contextmanager
+def call_priority(priority: int) -> Iterator[None]:
+    """Temporarily run model calls at `priority`"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """Continuously refilling bucket; the level may go negative when usage is corrected upwards"""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (oversized requests wait for a full bucket)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class ModelRateLimiter:
+    """Request and token buckets for one model with a priority wait queue"""
+
+    def __init__(self, model: str, requests_per_minute: int, tokens_per_minute: int):
+        self.model = model
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.granted = 0
+        self.throttled = 0
+        self.wait_seconds: Dict[int, float] = {}
+
+    def _wait_time(self, tokens: int) -> float:
+        now = time.monotonic()
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def _take(self, tokens: int) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.granted += 1
+
+    def _record_wait(self, priority: int, waited: float) -> None:
+        if waited > 0:
+            self.throttled += 1
+            self.wait_seconds[priority] = self.wait_seconds.get(priority, 0.0) + waited
+
+    async def acquire(self, tokens: int, priority: Optional[int] = None) -> None:
+        """Wait until a request of roughly `tokens` tokens may be sent"""
+        priority = _priority.get() if priority is None else priority
+        with self._lock:
+            if not self._waiters and self._wait_time(tokens) <= 0:
+                self._take(tokens)
+                return
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, _Waiter(priority, next(self._seq), tokens, future))
+        started = time.monotonic()
+        self._pump()
+        try:
+            await future
+        finally:
+            if future.cancelled():
+                # Let the next waiter move up
+                self._pump()
+        self._record_wait(priority, time.monotonic() - started)
+
+    def _pump(self) -> None:
+        """Grant waiters in priority order while both buckets allow it"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            while self._waiters:
+                head = self._waiters[0]
+                if head.future.done():
+                    heapq.heappop(self._waiters)
+                    continue
+                delay = self._wait_time(head.tokens)
+                if delay > 0:
+                    self._timer = head.future.get_loop().call_later(delay, self._pump)
+                    return
+                heapq.heappop(self._waiters)
+                self._take(head.tokens)
+                head.future.set_result(None)
+
+    def acquire_blocking(self, tokens: int) -> None:
+        """Blocking acquire for sync callers on worker threads; yields to queued async waiters"""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                delay = self._wait_time(tokens)
+                if not self._waiters and delay <= 0:
+                    self._take(tokens)
+                    break
+            time.sleep(max(delay, 0.05))
+        self._record_wait(_priority.get(), time.monotonic() - started)
+
+    def settle(self, reserved: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the real usage of a granted call is known"""
+        if actual is None:
+            return
+        with self._lock:
+            self.tokens.take(actual - reserved)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queued = sum(1 for waiter in self._waiters if not waiter.future.done())
+        return {
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "queued": queued,
+            "wait_seconds": {
+                ("interactive" if priority <= INTERACTIVE else "background"): round(seconds, 3)
+                for priority, seconds in self.wait_seconds.items()
+            },
+        }
+
+
+def _configured_limits() -> Dict[str, Tuple[int, int]]:
+    limits = dict(DEFAULT_LIMITS)
+    override = os.getenv('COFOUNDER_RATE_LIMITS')
+    if override:
+        try:
+            limits.update({model: tuple(value) for model, value in json.loads(override).items()})
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Warning: ignoring invalid COFOUNDER_RATE_LIMITS: {e}")
+    return limits
+
+_limiters: Dict[str, ModelRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(model: str) -> ModelRateLimiter:
+    """Return the process-wide limiter for a model name (provider prefix ignored)"""
+    model = model.split(':', 1)[-1]
+    limiter = _limiters.get(model)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(model)
+            if limiter is None:
+                rpm, tpm = _configured_limits().get(model, FALLBACK_LIMITS)
+                limiter = _limiters[model] = ModelRateLimiter(model, rpm, tpm)
+    return limiter
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    return {model: limiter.stats() for model, limiter in _limiters.items()}
+
+
+class RateLimitedModel(WrapperModel):
+    """pydantic_ai model wrapper that sends every request through the shared limiter"""
+
+    def __init__(self, wrapped: Model | KnownModelName):
+        super().__init__(wrapped)
+        self.limiter = get_rate_limiter(self.wrapped.model_name)
+
+    def _reserve(self, messages: List[ModelMessage], model_settings: Optional[ModelSettings]) -> int:
+        max_tokens = (model_settings or {}).get('max_tokens') or DEFAULT_OUTPUT_TOKENS
+        return estimate_tokens(messages) + max_tokens
+
+    async def request(
+        self,
+        messages: List[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        reserved = self._reserve(messages, model_settings)
+        await self.limiter.acquire(reserved)
+        response = await self.wrapped.request(messages, model_settings, model_request_parameters)
+        self.limiter.settle(reserved, response.usage.total_tokens)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: List[ModelMessage],
+        model_settings: Optional[ModelSettings],
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        reserved = self._reserve(messages, model_settings)
+        await self.limiter.acquire(reserved)
+        async with self.wrapped.request_stream(messages, model_settings, model_request_parameters) as response_stream:
+            yield response_stream
+        self.limiter.settle(reserved, response_stream.usage().total_tokens)
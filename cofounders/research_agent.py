@@ -1,11 +1,80 @@
+import asyncio
+import threading
+import time
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from pydantic import BaseModel, ConfigDict
+from research_cache import ResearchCache, normalize_query
+from single_flight import research_flights
+from rate_limit import DEFAULT_OUTPUT_TOKENS, get_rate_limiter
+from metrics import metrics
 
 load_dotenv()
 
+RESEARCH_MODEL = "gemini-2.5-flash"
+
+# Process-wide research resources shared by every WebResearchAgent instance.
+# genai.Client keeps its HTTP connection pool, so reusing it avoids a new
+# client build and TLS handshake on every phase switch or session resume.
+_shared_lock = threading.RLock()
+_shared_resources: Optional[Tuple[object, object, object]] = None
+_shared_agent: Optional["WebResearchAgent"] = None
+_shared_cache: Optional[ResearchCache] = None
+# Set once opening the cache has failed, so it is attempted and reported only once
+_shared_cache_failed = False
+
+def get_shared_research_resources() -> Tuple[object, object, object]:
+    """Lazily build and return the shared (client, grounding_tool, config) triple"""
+    global _shared_resources
+    if _shared_resources is None:
+        with _shared_lock:
+            if _shared_resources is None:
+                client = genai.Client()
+                grounding_tool = types.Tool(google_search=types.GoogleSearch())
+                config = types.GenerateContentConfig(tools=[grounding_tool])
+                _shared_resources = (client, grounding_tool, config)
+    return _shared_resources
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """Lazily open the process-wide research cache; None if it cannot be opened"""
+    global _shared_cache, _shared_cache_failed
+    if _shared_cache is None and not _shared_cache_failed:
+        with _shared_lock:
+            if _shared_cache is None and not _shared_cache_failed:
+                try:
+                    _shared_cache = ResearchCache()
+                except Exception as e:
+                    _shared_cache_failed = True
+                    print(f"Warning: research cache unavailable, continuing without caching: {e}")
+    return _shared_cache
+
+def get_research_agent() -> "WebResearchAgent":
+    """Return the process-wide research agent shared across graph nodes and resumed sessions"""
+    global _shared_agent
+    if _shared_agent is None:
+        with _shared_lock:
+            if _shared_agent is None:
+                _shared_agent = WebResearchAgent()
+    return _shared_agent
+
+def _total_tokens(response) -> Optional[int]:
+    """Total token count reported by a genai response, if any"""
+    usage = getattr(response, 'usage_metadata', None)
+    return getattr(usage, 'total_token_count', None)
+
+def _record_search(method: str, start: float, response=None, ok: bool = True) -> None:
+    """Log one grounded search in the local metrics"""
+    usage = getattr(response, 'usage_metadata', None)
+    metrics.record(
+        "research", method, time.perf_counter() - start,
+        model=RESEARCH_MODEL,
+        input_tokens=getattr(usage, 'prompt_token_count', None),
+        output_tokens=getattr(usage, 'candidates_token_count', None),
+        ok=ok,
+    )
+
 class WebResearchAgent(BaseModel):
     """Enhanced web research agent with selective research and citation support"""
     
@@ -15,6 +84,7 @@ class WebResearchAgent(BaseModel):
     client: Optional[object] = None
     grounding_tool: Optional[object] = None
     config: Optional[object] = None
+    cache: Optional[object] = None
     
     def model_dump(self, **kwargs):
         """Custom serialization that excludes non-serializable fields for pydantic graph compatibility"""
@@ -23,18 +93,15 @@ class WebResearchAgent(BaseModel):
     
     @classmethod
     def model_validate(cls, obj):
-        """Custom validation that creates a new instance for graph-based message history compatibility"""
-        if isinstance(obj, dict):
-            return cls()
-        return cls()
+        """Custom validation that returns the shared instance for graph-based message history compatibility"""
+        return get_research_agent()
     
     def model_post_init(self, __context):
-        """Initialize the research agent after model creation for graph integration"""
+        """Attach the shared research client after model creation for graph integration"""
         super().model_post_init(__context)
+        self.cache = get_research_cache()
         try:
-            self.client = genai.Client()
-            self.grounding_tool = types.Tool(google_search=types.GoogleSearch())
-            self.config = types.GenerateContentConfig(tools=[self.grounding_tool])
+            self.client, self.grounding_tool, self.config = get_shared_research_resources()
         except Exception as e:
             print(f"Warning: Research agent initialization failed: {e}")
             # Graceful fallback - agent will work without research capabilities
@@ -96,30 +163,111 @@ class WebResearchAgent(BaseModel):
 
         return text
     
-    def research_query(self, query: str, add_citations: bool = None) -> str:
+    def _cached(self, method: str, query: str, add_citations: bool) -> Tuple[str, Optional[str]]:
+        """Return (cache key query, cached answer or None) for a research call"""
+        cache_query = f"{query}\ncitations={add_citations}"
+        if self.cache:
+            return cache_query, self.cache.get(method, cache_query)
+        return cache_query, None
+    
+    def _store(self, method: str, cache_query: str, text: Optional[str]) -> str:
+        """Cache a successful answer; blocked or empty responses (text None) are not cached"""
+        if not text:
+            return "No response available"
+        if self.cache:
+            try:
+                self.cache.put(method, cache_query, text)
+            except Exception as e:
+                print(f"Warning: research cache write failed: {e}")
+        return text
+    
+    def _flight_key(self, method: str, cache_query: str) -> str:
+        """Single-flight key: same method and normalized question"""
+        return f"{method}\n{normalize_query(cache_query)}"
+    
+    def research_query(self, query: str, add_citations: bool = None, method: str = "research_query") -> str:
         """Research any query and selectively add citations based on context"""
+        # Auto-determine if citations should be included
+        if add_citations is None:
+            add_citations = self.should_include_citations(query)
+        
+        # Serve repeated questions from the persistent cache (TTL depends on `method`)
+        cache_query, cached = self._cached(method, query, add_citations)
+        if cached is not None:
+            return cached
+        
         if not self.client or not self.config:
             return f"Research capabilities unavailable for: {query}"
+        
+        # Identical questions already in flight share one grounded search
+        return research_flights.run_sync(
+            self._flight_key(method, cache_query),
+            lambda: self._search(query, add_citations, method, cache_query),
+        )
+    
+    def _search(self, query: str, add_citations: bool, method: str, cache_query: str) -> str:
+        """Run one grounded search and cache the answer"""
+        limiter = get_rate_limiter(RESEARCH_MODEL)
+        reserved = len(query) // 4 + DEFAULT_OUTPUT_TOKENS
+        start = time.perf_counter()
+        try:
+            limiter.acquire_blocking(reserved)
+            response = self.client.models.generate_content(
+                model=RESEARCH_MODEL,
+                contents=query,
+                config=self.config,
+            )
+            _record_search(method, start, response)
+            limiter.settle(reserved, _total_tokens(response))
             
-        # Auto-determine if citations should be included
+            text = self.add_citations(response, add_citations)
+        except Exception as e:
+            _record_search(method, start, ok=False)
+            return f"Research query failed: {str(e)}"
+        return self._store(method, cache_query, text)
+    
+    async def research_query_async(self, query: str, add_citations: bool = None, method: str = "research_query") -> str:
+        """Async research_query using the async genai client, so the event loop stays free during grounded search"""
         if add_citations is None:
             add_citations = self.should_include_citations(query)
-            
+        
+        cache_query, cached = self._cached(method, query, add_citations)
+        if cached is not None:
+            return cached
+        
+        if not self.client or not self.config:
+            return f"Research capabilities unavailable for: {query}"
+        
+        return await research_flights.run(
+            self._flight_key(method, cache_query),
+            lambda: self._search_async(query, add_citations, method, cache_query),
+        )
+    
+    async def _search_async(self, query: str, add_citations: bool, method: str, cache_query: str) -> str:
+        """Async _search using the async genai client"""
+        limiter = get_rate_limiter(RESEARCH_MODEL)
+        reserved = len(query) // 4 + DEFAULT_OUTPUT_TOKENS
+        start = time.perf_counter()
         try:
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
+            await limiter.acquire(reserved)
+            response = await self.client.aio.models.generate_content(
+                model=RESEARCH_MODEL,
                 contents=query,
                 config=self.config,
             )
+            _record_search(method, start, response)
+            limiter.settle(reserved, _total_tokens(response))
             
-            return self.add_citations(response, add_citations)
+            text = self.add_citations(response, add_citations)
         except Exception as e:
+            _record_search(method, start, ok=False)
             return f"Research query failed: {str(e)}"
+        return self._store(method, cache_query, text)
     
     # Selective research methods that are context-aware
     
-    def research_market_size(self, industry: str, geography: str = "global", context: str = "") -> str:
-        """Get market size and growth data with selective citations"""
+    def _research_market_size_prompt(self, industry: str, geography: str = "global", context: str = "") -> str:
+        """Prompt for research_market_size"""
         context_note = f"\n\nConversation context: {context}" if context else ""
         query = f"""
         What is the current market size of the {industry} industry in {geography}? 
@@ -129,10 +277,20 @@ class WebResearchAgent(BaseModel):
         - Key trends
         {context_note}
         """
-        return self.research_query(query, add_citations=True)  # Always cite market data
+        return query
     
-    def research_competitors(self, business_idea: str, num_competitors: int = 5, context: str = "") -> str:
-        """Find and analyze competitors with selective citations"""
+    def research_market_size(self, industry: str, geography: str = "global", context: str = "") -> str:
+        """Get market size and growth data with selective citations"""
+        query = self._research_market_size_prompt(industry, geography, context)
+        return self.research_query(query, add_citations=True, method="research_market_size")  # Always cite market data
+    
+    async def research_market_size_async(self, industry: str, geography: str = "global", context: str = "") -> str:
+        """Async variant of research_market_size"""
+        query = self._research_market_size_prompt(industry, geography, context)
+        return await self.research_query_async(query, add_citations=True, method="research_market_size")
+    
+    def _research_competitors_prompt(self, business_idea: str, num_competitors: int = 5, context: str = "") -> str:
+        """Prompt for research_competitors"""
         context_note = f"\n\nBased on our discussion: {context}" if context else ""
         query = f"""
         Who are the top {num_competitors} competitors for: {business_idea}?
@@ -142,10 +300,20 @@ class WebResearchAgent(BaseModel):
         - Market position
         {context_note}
         """
-        return self.research_query(query, add_citations=True)  # Always cite competitor data
+        return query
     
-    def research_target_customers(self, business_idea: str, target_segment: str = "", context: str = "") -> str:
-        """Research target customers with conversational approach"""
+    def research_competitors(self, business_idea: str, num_competitors: int = 5, context: str = "") -> str:
+        """Find and analyze competitors with selective citations"""
+        query = self._research_competitors_prompt(business_idea, num_competitors, context)
+        return self.research_query(query, add_citations=True, method="research_competitors")  # Always cite competitor data
+    
+    async def research_competitors_async(self, business_idea: str, num_competitors: int = 5, context: str = "") -> str:
+        """Async variant of research_competitors"""
+        query = self._research_competitors_prompt(business_idea, num_competitors, context)
+        return await self.research_query_async(query, add_citations=True, method="research_competitors")
+    
+    def _research_target_customers_prompt(self, business_idea: str, target_segment: str = "", context: str = "") -> str:
+        """Prompt for research_target_customers"""
         segment_context = f" targeting {target_segment}" if target_segment else ""
         conversation_context = f"\n\nContext: {context}" if context else ""
         query = f"""
@@ -156,11 +324,21 @@ class WebResearchAgent(BaseModel):
         - Current solutions
         {conversation_context}
         """
+        return query
+    
+    def research_target_customers(self, business_idea: str, target_segment: str = "", context: str = "") -> str:
+        """Research target customers with conversational approach"""
         # Only cite if asking for specific customer data
-        return self.research_query(query, add_citations=False)
+        query = self._research_target_customers_prompt(business_idea, target_segment, context)
+        return self.research_query(query, add_citations=False, method="research_target_customers")
     
-    def research_market_trends(self, industry: str, context: str = "") -> str:
-        """Research current trends with selective citations"""
+    async def research_target_customers_async(self, business_idea: str, target_segment: str = "", context: str = "") -> str:
+        """Async variant of research_target_customers"""
+        query = self._research_target_customers_prompt(business_idea, target_segment, context)
+        return await self.research_query_async(query, add_citations=False, method="research_target_customers")
+    
+    def _research_market_trends_prompt(self, industry: str, context: str = "") -> str:
+        """Prompt for research_market_trends"""
         context_note = f"\n\nBuilding on: {context}" if context else ""
         query = f"""
         What are the current trends in the {industry} industry?
@@ -170,10 +348,20 @@ class WebResearchAgent(BaseModel):
         - Consumer behavior changes
         {context_note}
         """
-        return self.research_query(query, add_citations=True)  # Always cite trend data
+        return query
     
-    def research_funding_landscape(self, business_type: str, stage: str = "seed", context: str = "") -> str:
-        """Research funding with selective citations"""
+    def research_market_trends(self, industry: str, context: str = "") -> str:
+        """Research current trends with selective citations"""
+        query = self._research_market_trends_prompt(industry, context)
+        return self.research_query(query, add_citations=True, method="research_market_trends")  # Always cite trend data
+    
+    async def research_market_trends_async(self, industry: str, context: str = "") -> str:
+        """Async variant of research_market_trends"""
+        query = self._research_market_trends_prompt(industry, context)
+        return await self.research_query_async(query, add_citations=True, method="research_market_trends")
+    
+    def _research_funding_landscape_prompt(self, business_type: str, stage: str = "seed", context: str = "") -> str:
+        """Prompt for research_funding_landscape"""
         context_note = f"\n\nGiven our business context: {context}" if context else ""
         query = f"""
         What is the current funding landscape for {business_type} companies at {stage} stage?
@@ -183,10 +371,20 @@ class WebResearchAgent(BaseModel):
         - Key criteria
         {context_note}
         """
-        return self.research_query(query, add_citations=True)  # Always cite funding data
+        return query
     
-    def research_pricing_strategies(self, business_idea: str, business_model: str = "", context: str = "") -> str:
-        """Research pricing with selective citations"""
+    def research_funding_landscape(self, business_type: str, stage: str = "seed", context: str = "") -> str:
+        """Research funding with selective citations"""
+        query = self._research_funding_landscape_prompt(business_type, stage, context)
+        return self.research_query(query, add_citations=True, method="research_funding_landscape")  # Always cite funding data
+    
+    async def research_funding_landscape_async(self, business_type: str, stage: str = "seed", context: str = "") -> str:
+        """Async variant of research_funding_landscape"""
+        query = self._research_funding_landscape_prompt(business_type, stage, context)
+        return await self.research_query_async(query, add_citations=True, method="research_funding_landscape")
+    
+    def _research_pricing_strategies_prompt(self, business_idea: str, business_model: str = "", context: str = "") -> str:
+        """Prompt for research_pricing_strategies"""
         model_context = f" using {business_model}" if business_model else ""
         conversation_context = f"\n\nConsidering: {context}" if context else ""
         query = f"""
@@ -197,10 +395,20 @@ class WebResearchAgent(BaseModel):
         - Market expectations
         {conversation_context}
         """
-        return self.research_query(query, add_citations=True)  # Always cite pricing data
+        return query
     
-    def validate_problem_solution_fit(self, problem: str, solution: str, context: str = "") -> str:
-        """Validate problem-solution fit with conversational approach"""
+    def research_pricing_strategies(self, business_idea: str, business_model: str = "", context: str = "") -> str:
+        """Research pricing with selective citations"""
+        query = self._research_pricing_strategies_prompt(business_idea, business_model, context)
+        return self.research_query(query, add_citations=True, method="research_pricing_strategies")  # Always cite pricing data
+    
+    async def research_pricing_strategies_async(self, business_idea: str, business_model: str = "", context: str = "") -> str:
+        """Async variant of research_pricing_strategies"""
+        query = self._research_pricing_strategies_prompt(business_idea, business_model, context)
+        return await self.research_query_async(query, add_citations=True, method="research_pricing_strategies")
+    
+    def _validate_problem_solution_fit_prompt(self, problem: str, solution: str, context: str = "") -> str:
+        """Prompt for validate_problem_solution_fit"""
         context_note = f"\n\nBased on our research: {context}" if context else ""
         query = f"""
         Is there market validation for the problem: "{problem}" and solution: "{solution}"?
@@ -210,8 +418,51 @@ class WebResearchAgent(BaseModel):
         - Market opportunity
         {context_note}
         """
+        return query
+    
+    def validate_problem_solution_fit(self, problem: str, solution: str, context: str = "") -> str:
+        """Validate problem-solution fit with conversational approach"""
         # Only cite if specific validation data is found
-        return self.research_query(query, add_citations=False)
+        query = self._validate_problem_solution_fit_prompt(problem, solution, context)
+        return self.research_query(query, add_citations=False, method="validate_problem_solution_fit")
+    
+    async def validate_problem_solution_fit_async(self, problem: str, solution: str, context: str = "") -> str:
+        """Async variant of validate_problem_solution_fit"""
+        query = self._validate_problem_solution_fit_prompt(problem, solution, context)
+        return await self.research_query_async(query, add_citations=False, method="validate_problem_solution_fit")
+    
+    async def research_bundle(
+        self,
+        idea: str,
+        geography: str = "global",
+        stage: str = "seed",
+        context: str = "",
+        max_concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Research market size, competitors, trends and funding for an idea concurrently.
+        Yields (topic, result) pairs as each one finishes, with at most `max_concurrency` in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        jobs = {
+            "market_size": lambda: self.research_market_size_async(idea, geography, context),
+            "competitors": lambda: self.research_competitors_async(idea, context=context),
+            "trends": lambda: self.research_market_trends_async(idea, context),
+            "funding": lambda: self.research_funding_landscape_async(idea, stage, context),
+        }
+        
+        async def run(topic, job):
+            async with semaphore:
+                return topic, await job()
+        
+        tasks = [asyncio.ensure_future(run(topic, job)) for topic, job in jobs.items()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Stop outstanding searches if the caller stops iterating early
+            for task in tasks:
+                task.cancel()
     
     def get_research_capabilities(self) -> List[str]:
         """Return list of available research capabilities"""
@@ -222,19 +473,23 @@ class WebResearchAgent(BaseModel):
             "trend_analysis",
             "funding_data",
             "pricing_intelligence",
-            "smart_citations"
+            "smart_citations",
+            "async_research_bundle"
         ]
     
-    def health_check(self) -> Dict[str, str]:
+    def health_check(self) -> Dict[str, Any]:
         """Check if research agent is functioning properly"""
         if self.client and self.config:
-            return {"status": "healthy", "capabilities": "full_research_enabled", "citation_mode": "selective"}
+            health = {"status": "healthy", "capabilities": "full_research_enabled", "citation_mode": "selective"}
         else:
-            return {"status": "degraded", "capabilities": "research_disabled", "citation_mode": "none"}
+            health = {"status": "degraded", "capabilities": "research_disabled", "citation_mode": "none"}
+        health["cache"] = self.cache.stats() if self.cache else "disabled"
+        health["coalescing"] = research_flights.stats()
+        return health
 
 # Example usage and testing for selective research integration
 if __name__ == "__main__":
-    research_agent = WebResearchAgent()
+    research_agent = get_research_agent()
     
     # Test selective functionality
     print("=== HEALTH CHECK ===")
@@ -0,0 +1,133 @@
+"""
+Persistent TTL cache for WebResearchAgent research queries.
+Entries are keyed on method name plus normalized query, expire after a
+per-method TTL, and are evicted least-recently-used once the size cap is hit.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+HOUR = 3600
+
+# Market sizes move slowly; trends and funding news go stale quickly
+DEFAULT_TTLS: Dict[str, float] = {
+    "research_market_size": 7 * 24 * HOUR,
+    "research_competitors": 3 * 24 * HOUR,
+    "research_target_customers": 7 * 24 * HOUR,
+    "research_market_trends": 12 * HOUR,
+    "research_funding_landscape": 24 * HOUR,
+    "research_pricing_strategies": 3 * 24 * HOUR,
+    "validate_problem_solution_fit": 7 * 24 * HOUR,
+    "research_query": 24 * HOUR,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_cache (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS research_cache_lru ON research_cache (last_used);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query used for cache keys"""
+    return " ".join(query.lower().split())
+
+
+class ResearchCache:
+    """SQLite-backed research cache with per-method TTLs and LRU eviction"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: int = 2000,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            db_path: SQLite file holding cached answers (defaults to RESEARCH_CACHE_PATH or research_cache.db)
+            max_entries: Size cap; least recently used entries are evicted beyond it
+            ttls: Per-method time-to-live in seconds, merged over DEFAULT_TTLS
+        """
+        self.db_path = Path(db_path or os.getenv('RESEARCH_CACHE_PATH', 'research_cache.db'))
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _key(self, method: str, query: str) -> str:
+        return hashlib.sha256(f"{method}\n{normalize_query(query)}".encode()).hexdigest()
+
+    def get(self, method: str, query: str) -> Optional[str]:
+        """Return a fresh cached answer, or None on a miss"""
+        key = self._key(method, query)
+        now = time.time()
+        ttl = self.ttls.get(method, self.ttls["research_query"])
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM research_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created = row
+            if now - created > ttl:
+                self._conn.execute("DELETE FROM research_cache WHERE key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE research_cache SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def put(self, method: str, query: str, value: str) -> None:
+        """Store an answer and evict least recently used entries beyond the size cap"""
+        key = self._key(method, query)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO research_cache (key, method, value, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, method, value, now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM research_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM research_cache WHERE key IN (SELECT key FROM research_cache ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM research_cache")
+
+    def stats(self) -> Dict[str, object]:
+        """Counters surfaced through WebResearchAgent.health_check()"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM research_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
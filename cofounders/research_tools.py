@@ -0,0 +1,177 @@
+"""
+WebResearchAgent methods exposed as pydantic_ai tools for the expert agents.
+Tools are async, so when the model requests several in one step pydantic_ai runs
+them concurrently; every call's latency is recorded per turn and per tool.
+"""
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic_ai import Agent, RunContext
+
+from research_agent import WebResearchAgent
+
+
+@dataclass
+class ResearchCall:
+    """Timing and result of one research tool call"""
+    tool: str
+    started: float
+    finished: float
+    ok: bool
+    subject: str = ""
+    result: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+class ToolLatencyStats:
+    """Process-wide per-tool latency aggregates"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.total: Dict[str, float] = {}
+        self.slowest: Dict[str, float] = {}
+
+    def record(self, call: ResearchCall) -> None:
+        self.calls[call.tool] = self.calls.get(call.tool, 0) + 1
+        self.total[call.tool] = self.total.get(call.tool, 0.0) + call.seconds
+        self.slowest[call.tool] = max(self.slowest.get(call.tool, 0.0), call.seconds)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            tool: {
+                "calls": count,
+                "avg_seconds": round(self.total[tool] / count, 3),
+                "max_seconds": round(self.slowest[tool], 3),
+            }
+            for tool, count in self.calls.items()
+        }
+
+
+tool_latency_stats = ToolLatencyStats()
+
+# Research calls made during the expert turn running in the current context
+_turn_calls: ContextVar[Optional[List[ResearchCall]]] = ContextVar('research_turn_calls', default=None)
+
+def begin_research_turn() -> Token:
+    """Start collecting research calls for one expert turn"""
+    return _turn_calls.set([])
+
+def end_research_turn(token: Token) -> List[ResearchCall]:
+    """Stop collecting and return the calls made during the turn"""
+    calls = _turn_calls.get() or []
+    _turn_calls.reset(token)
+    return calls
+
+def summarize_research_calls(calls: List[ResearchCall]) -> Optional[str]:
+    """Latency line comparing the turn's research wall time with running the calls one by one"""
+    if not calls:
+        return None
+    wall = max(call.finished for call in calls) - min(call.started for call in calls)
+    serial = sum(call.seconds for call in calls)
+    names = ", ".join(call.tool for call in calls)
+    return f"🔍 {len(calls)} research call(s) [{names}]: {wall:.2f}s wall ({serial:.2f}s if run one by one)"
+
+async def _timed(tool: str, subject: str, research: Callable[[], Awaitable[str]]) -> str:
+    """Run a research coroutine and record its latency and result"""
+    started = time.perf_counter()
+    ok = False
+    result = None
+    try:
+        result = await research()
+        ok = not result.startswith(("Research query failed", "Research capabilities unavailable"))
+        return result
+    finally:
+        call = ResearchCall(tool, started, time.perf_counter(), ok, subject, result if ok else None)
+        tool_latency_stats.record(call)
+        calls = _turn_calls.get()
+        if calls is not None:
+            calls.append(call)
+
+
+# ================= TOOLS =================
+
+async def research_market_size(ctx: RunContext[WebResearchAgent], industry: str, geography: str = "global") -> str:
+    """Look up current market size, growth rate (CAGR) and key trends for an industry.
+
+    Args:
+        industry: Industry or market to size, e.g. "AI chatbots for small businesses".
+        geography: Region to size the market for.
+    """
+    return await _timed("market_size", industry, lambda: ctx.deps.research_market_size_async(industry, geography))
+
+async def research_competitors(ctx: RunContext[WebResearchAgent], business_idea: str, num_competitors: int = 5) -> str:
+    """Find the top competitors for a business idea with their differentiators and market position.
+
+    Args:
+        business_idea: The product or business to find competitors for.
+        num_competitors: How many competitors to list.
+    """
+    return await _timed("competitors", business_idea, lambda: ctx.deps.research_competitors_async(business_idea, num_competitors))
+
+async def research_target_customers(ctx: RunContext[WebResearchAgent], business_idea: str, target_segment: str = "") -> str:
+    """Research ideal customers for a business idea: demographics, pain points and current solutions.
+
+    Args:
+        business_idea: The product or business in question.
+        target_segment: Optional customer segment to focus on.
+    """
+    return await _timed("target_customers", business_idea, lambda: ctx.deps.research_target_customers_async(business_idea, target_segment))
+
+async def research_market_trends(ctx: RunContext[WebResearchAgent], industry: str) -> str:
+    """Research current technology, market and consumer-behaviour trends in an industry.
+
+    Args:
+        industry: Industry to research trends for.
+    """
+    return await _timed("market_trends", industry, lambda: ctx.deps.research_market_trends_async(industry))
+
+async def research_funding_landscape(ctx: RunContext[WebResearchAgent], business_type: str, stage: str = "seed") -> str:
+    """Research typical funding amounts, active investors and criteria for a type of startup.
+
+    Args:
+        business_type: Kind of company, e.g. "B2B SaaS".
+        stage: Funding stage such as "pre-seed", "seed" or "series A".
+    """
+    return await _timed("funding_landscape", business_type, lambda: ctx.deps.research_funding_landscape_async(business_type, stage))
+
+async def research_pricing_strategies(ctx: RunContext[WebResearchAgent], business_idea: str, business_model: str = "") -> str:
+    """Research common pricing models, typical price ranges and market expectations.
+
+    Args:
+        business_idea: The product or business to price.
+        business_model: Optional business model, e.g. "subscription".
+    """
+    return await _timed("pricing_strategies", business_idea, lambda: ctx.deps.research_pricing_strategies_async(business_idea, business_model))
+
+async def validate_problem_solution_fit(ctx: RunContext[WebResearchAgent], problem: str, solution: str) -> str:
+    """Check for market evidence that a problem exists and that the proposed solution fits it.
+
+    Args:
+        problem: The customer problem.
+        solution: The proposed solution.
+    """
+    return await _timed("problem_solution_fit", problem, lambda: ctx.deps.validate_problem_solution_fit_async(problem, solution))
+
+
+# Tools offered to each expert, matching the focus areas in their system prompts
+MARKET_RESEARCH_TOOLS = [
+    research_market_size, research_competitors, research_target_customers,
+    research_market_trends, validate_problem_solution_fit,
+]
+PRODUCT_RESEARCH_TOOLS = [
+    research_competitors, research_target_customers, validate_problem_solution_fit,
+]
+FINANCE_RESEARCH_TOOLS = [
+    research_funding_landscape, research_pricing_strategies, research_market_size,
+]
+
+def register_research_tools(agent: Agent, tools: List[Callable]) -> None:
+    """Register research tools on an agent whose deps are a WebResearchAgent"""
+    for tool in tools:
+        agent.tool(tool)
@@ -0,0 +1,278 @@
+"""
+Local fast-path router for the open discussion phase.
+Answers confident agent selections with keyword rules and an optional small
+embedding model, so only ambiguous messages pay for an LLM coordinator call.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Keyword rules mirror the coordinator's selection criteria
+ROUTING_KEYWORDS: Dict[str, List[str]] = {
+    "market_analyst": [
+        "market", "market size", "tam", "competitor", "competitors", "competition",
+        "customer", "customers", "audience", "segment", "industry", "trend", "trends",
+        "demand", "niche", "persona", "go-to-market", "gtm",
+    ],
+    "product_strategist": [
+        "feature", "features", "ux", "ui", "user experience", "mvp", "prototype",
+        "roadmap", "differentiation", "differentiate", "user journey", "onboarding",
+        "interface", "usability", "functionality", "integration",
+    ],
+    "financial_planner": [
+        "cost", "costs", "price", "pricing", "revenue", "funding", "investor",
+        "investors", "profit", "profitability", "margin", "margins", "budget", "burn", "runway",
+        "valuation", "break-even", "break even", "cash flow", "unit economics", "projection",
+        "projections", "financial", "money", "ltv", "cac",
+    ],
+}
+
+# Everyday words ("Sam and I want to build an app") that only add to an agent's score
+# when one of its ROUTING_KEYWORDS also matched; on their own they defer to the LLM
+SUPPORTING_KEYWORDS: Dict[str, List[str]] = {
+    "market_analyst": ["sam", "som", "research"],
+    "product_strategist": ["build", "app", "design"],
+    "financial_planner": ["raise", "charge"],
+}
+
+# Example questions used to build one embedding centroid per agent
+ROUTING_EXEMPLARS: Dict[str, List[str]] = {
+    "market_analyst": [
+        "How big is the market for this?",
+        "Who are my main competitors?",
+        "Who is my target customer?",
+        "What industry trends should I watch?",
+    ],
+    "product_strategist": [
+        "What features should the first version have?",
+        "How do I make the product stand out?",
+        "What should the user experience look like?",
+        "What should go into the MVP?",
+    ],
+    "financial_planner": [
+        "How much should I charge?",
+        "How much money do I need to raise?",
+        "When will we break even?",
+        "What will it cost to build and run this?",
+    ],
+}
+
+EMBEDDING_MODEL = 'gaunernst/bert-mini-uncased'
+
+
+@dataclass
+class RouteDecision:
+    """A local routing decision, shaped like the coordinator's AgentSelection"""
+    selected_agent: str
+    reasoning: str
+    confidence: float
+    source: str  # "keywords" or "embeddings"
+
+
+class LocalRouter:
+    """Keyword + embedding classifier placed in front of the LLM coordinator"""
+
+    def __init__(
+        self,
+        keyword_margin: int = 2,
+        embedding_margin: Optional[float] = None,
+        use_embeddings: Optional[bool] = None,
+    ):
+        """
+        Args:
+            keyword_margin: Lead the top agent needs over the runner-up when both matched keywords
+            embedding_margin: Cosine similarity lead needed for an embedding decision (defaults to
+                COFOUNDER_ROUTER_EMBEDDING_MARGIN or 0.04). 0.04 is a hand-picked starting value,
+                not a calibrated one; `python router.py` prints the leave-one-out leads of the
+                exemplar questions to tune it against
+            use_embeddings: Enable the embedding fallback (defaults to COFOUNDER_ROUTER_EMBEDDINGS, on)
+        """
+        if use_embeddings is None:
+            use_embeddings = os.getenv('COFOUNDER_ROUTER_EMBEDDINGS', '1').lower() not in ('0', 'false', 'no', 'off')
+        if embedding_margin is None:
+            embedding_margin = float(os.getenv('COFOUNDER_ROUTER_EMBEDDING_MARGIN', 0.04))
+
+        self.keyword_margin = keyword_margin
+        self.embedding_margin = embedding_margin
+        self.use_embeddings = use_embeddings
+
+        self._patterns = {
+            agent: [re.compile(rf"\b{re.escape(keyword)}\b") for keyword in keywords]
+            for agent, keywords in ROUTING_KEYWORDS.items()
+        }
+        self._supporting = {
+            agent: [re.compile(rf"\b{re.escape(keyword)}\b") for keyword in keywords]
+            for agent, keywords in SUPPORTING_KEYWORDS.items()
+        }
+        self._tokenizer = None
+        self._model = None
+        self._centroids = None
+        # Concurrent first routes (worker threads) load the model once
+        self._load_lock = threading.Lock()
+
+        # Hit-rate and latency accounting
+        self.local_hits = 0
+        self.llm_fallbacks = 0
+        self.local_time = 0.0
+        self.llm_time = 0.0
+
+    def _keyword_route(self, text: str) -> Optional[RouteDecision]:
+        """Score agents by keyword matches and accept clear winners"""
+        scores = {}
+        for agent, patterns in self._patterns.items():
+            score = sum(1 for p in patterns if p.search(text))
+            if score:
+                score += sum(1 for p in self._supporting.get(agent, []) if p.search(text))
+            scores[agent] = score
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best, best_score), (_, second_score) = ranked[0], ranked[1]
+
+        if best_score == 0:
+            return None
+        if second_score == 0 or best_score - second_score >= self.keyword_margin:
+            confidence = best_score / (best_score + second_score)
+            return RouteDecision(best, f"matched {best_score} {best.replace('_', ' ')} keyword(s)", confidence, "keywords")
+        return None
+
+    def _load_embeddings(self) -> bool:
+        """Lazily load the embedding model; disable the fallback if unavailable"""
+        if self._centroids is not None:
+            return True
+        with self._load_lock:
+            if self._centroids is not None:
+                return True
+            if not self.use_embeddings:
+                return False
+            return self._load_embeddings_locked()
+
+    def _load_embeddings_locked(self) -> bool:
+        try:
+            import numpy as np
+            from transformers import BertModel, BertTokenizer
+        except ImportError:
+            logger.warning("transformers not available, local router will use keyword rules only")
+            self.use_embeddings = False
+            return False
+
+        try:
+            self._tokenizer = BertTokenizer.from_pretrained(EMBEDDING_MODEL)
+            self._model = BertModel.from_pretrained(EMBEDDING_MODEL)
+        except Exception as e:
+            logger.warning(f"router embedding model failed to load: {e}")
+            self.use_embeddings = False
+            return False
+
+        self._np = np
+        self._centroids = {
+            agent: self._embed(examples).mean(axis=0)
+            for agent, examples in ROUTING_EXEMPLARS.items()
+        }
+        return True
+
+    def _embed(self, texts):
+        """Mean-pooled BERT embeddings for a list of texts"""
+        inputs = self._tokenizer(texts, return_tensors='pt', padding=True, max_length=128, truncation=True)
+        outputs = self._model(**inputs)
+        return outputs.last_hidden_state.mean(dim=1).detach().numpy()
+
+    def _embedding_route(self, text: str) -> Optional[RouteDecision]:
+        """Compare the message with each agent's exemplar centroid (blocking; run in a worker thread)"""
+        if not self.use_embeddings or not self._load_embeddings():
+            return None
+
+        np = self._np
+        vector = self._embed([text])[0]
+        similarities = {
+            agent: float(np.dot(vector, centroid) / (np.linalg.norm(vector) * np.linalg.norm(centroid)))
+            for agent, centroid in self._centroids.items()
+        }
+        ranked = sorted(similarities.items(), key=lambda item: item[1], reverse=True)
+        (best, best_sim), (_, second_sim) = ranked[0], ranked[1]
+
+        if best_sim - second_sim >= self.embedding_margin:
+            return RouteDecision(best, f"closest to {best.replace('_', ' ')} questions", best_sim, "embeddings")
+        return None
+
+    def exemplar_leads(self) -> List[float]:
+        """
+        Leave-one-out check of the embedding margin: each exemplar is routed against centroids
+        built without it; returns its similarity lead over the best wrong agent (negative = misrouted)
+        """
+        if not self._load_embeddings():
+            return []
+        np = self._np
+        cosine = lambda a, b: float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+        vectors = {agent: self._embed(examples) for agent, examples in ROUTING_EXEMPLARS.items()}
+        leads = []
+        for agent, agent_vectors in vectors.items():
+            others = [vectors[other].mean(axis=0) for other in vectors if other != agent]
+            for i, vector in enumerate(agent_vectors):
+                centroid = np.delete(agent_vectors, i, axis=0).mean(axis=0)
+                leads.append(cosine(vector, centroid) - max(cosine(vector, other) for other in others))
+        return leads
+
+    def preload(self) -> None:
+        """Load the embedding model ahead of the first route (blocking)"""
+        if self.use_embeddings:
+            self._load_embeddings()
+
+    async def route(self, message: str) -> Optional[RouteDecision]:
+        """Return a confident local decision, or None to fall back to the LLM coordinator"""
+        start = time.perf_counter()
+        text = message.lower()
+        decision = self._keyword_route(text)
+        if decision is None and self.use_embeddings:
+            # Model loading (possibly a download) and BERT inference stay off the event loop
+            decision = await asyncio.to_thread(self._embedding_route, text)
+        elapsed = time.perf_counter() - start
+
+        if decision:
+            self.local_hits += 1
+            self.local_time += elapsed
+        return decision
+
+    def record_llm_fallback(self, elapsed: float) -> None:
+        """Record the latency of a coordinator LLM call made after a local miss"""
+        self.llm_fallbacks += 1
+        self.llm_time += elapsed
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.local_hits + self.llm_fallbacks
+        return self.local_hits / total if total else 0.0
+
+    @property
+    def latency_saved(self) -> float:
+        """Estimated seconds saved: local hits priced at the average observed LLM routing latency"""
+        if not self.llm_fallbacks:
+            return 0.0
+        average_llm = self.llm_time / self.llm_fallbacks
+        return max(0.0, self.local_hits * average_llm - self.local_time)
+
+    def report(self) -> str:
+        """One-line summary of router effectiveness"""
+        total = self.local_hits + self.llm_fallbacks
+        if not total:
+            return "⚡ Local router: no routing decisions yet"
+        saved = f"~{self.latency_saved:.1f}s saved" if self.llm_fallbacks else "no LLM baseline yet"
+        return f"⚡ Local router: {self.local_hits}/{total} routed locally ({self.hit_rate:.0%}), {saved}"
+
+
+if __name__ == '__main__':
+    router = LocalRouter(use_embeddings=True)
+    leads = sorted(router.exemplar_leads())
+    if not leads:
+        print("Embedding model unavailable, nothing to calibrate")
+    else:
+        routed = sum(1 for lead in leads if lead >= router.embedding_margin)
+        print(f"Exemplar leads (leave-one-out): {', '.join(f'{lead:.3f}' for lead in leads)}")
+        print(f"Margin {router.embedding_margin}: {routed}/{len(leads)} exemplars routed locally, "
+              f"{sum(1 for lead in leads if lead < 0)} would be misrouted without a margin")
@@ -0,0 +1,271 @@
+"""
+Semantic response cache in front of the expert agents.
+Questions are embedded together with the startup idea; a stored answer from the same
+expert and phase is reused when cosine similarity clears a threshold, so common
+questions skip the LLM entirely. Entries keep only non-identifying provenance (no
+session, idea or question of the founder who first asked) and are evicted
+least-recently-used beyond a size cap or once they outlive their TTL.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sentence-embedding model (BERT architecture, loaded through transformers like the router's)
+SEMANTIC_CACHE_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# Follow-ups that lean on earlier turns cannot be answered from another conversation
+CONTEXT_DEPENDENT = re.compile(
+    r"\b(it|its|that|this|those|these|they|them|above|earlier|previous|you said|you mentioned)\b"
+)
+
+# Provenance keys that may be shown to another session; anything else stored is dropped on read
+PROVENANCE_FIELDS = ("model_tier", "speaker", "phase", "created")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    provenance TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS semantic_cache_namespace ON semantic_cache (namespace);
+CREATE INDEX IF NOT EXISTS semantic_cache_lru ON semantic_cache (last_used);
+"""
+
+
+@dataclass
+class CachedAnswer:
+    """A reused answer with where it came from"""
+    answer: str
+    similarity: float
+    provenance: Dict[str, Any]
+
+
+@dataclass
+class SemanticLookup:
+    """Lookup result; the vector is kept so a miss can be stored without re-embedding"""
+    hit: Optional[CachedAnswer]
+    vector: Any = None
+
+
+class SemanticCache:
+    """SQLite-backed vector store with an in-memory index per expert and phase"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        threshold: Optional[float] = None,
+        max_entries: int = 5000,
+        ttl: float = 3 * 24 * 3600,
+        enabled: Optional[bool] = None,
+    ):
+        """
+        Args:
+            db_path: SQLite file for cached answers (defaults to SEMANTIC_CACHE_PATH or semantic_cache.db)
+            threshold: Minimum cosine similarity for a hit (defaults to COFOUNDER_SEMANTIC_THRESHOLD or 0.92)
+            max_entries: Size cap; least recently used answers are evicted beyond it
+            ttl: Seconds before a stored answer is considered stale
+            enabled: Turn the cache on or off (defaults to COFOUNDER_SEMANTIC_CACHE, on)
+        """
+        if enabled is None:
+            enabled = os.getenv('COFOUNDER_SEMANTIC_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+        self.enabled = enabled
+        self.db_path = Path(db_path or os.getenv('SEMANTIC_CACHE_PATH', 'semantic_cache.db'))
+        self.threshold = threshold if threshold is not None else float(os.getenv('COFOUNDER_SEMANTIC_THRESHOLD', 0.92))
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._tokenizer = None
+        self._model = None
+        self._np = None
+        # namespace -> (row ids, normalized vectors matrix)
+        self._index: Dict[str, Tuple[List[int], Any]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    # ---------- setup ----------
+
+    def _load(self) -> bool:
+        """Lazily open the store and the embedding model; disable the cache if either is unavailable"""
+        if self._model is not None:
+            return True
+        # Lookups run in worker threads, so only one of them may load the model
+        with self._load_lock:
+            if self._model is not None:
+                return True
+            if not self.enabled:
+                return False
+            return self._load_locked()
+
+    def _load_locked(self) -> bool:
+        try:
+            import numpy as np
+            from transformers import AutoModel, AutoTokenizer
+        except ImportError:
+            logger.warning("transformers not available, semantic response cache disabled")
+            self.enabled = False
+            return False
+
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(SEMANTIC_CACHE_MODEL)
+            model = AutoModel.from_pretrained(SEMANTIC_CACHE_MODEL)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        except Exception as e:
+            logger.warning(f"semantic response cache failed to load: {e}")
+            self.enabled = False
+            return False
+
+        self._np, self._tokenizer, self._conn, self._model = np, tokenizer, conn, model
+        return True
+
+    def _embed(self, text: str):
+        """Normalized mean-pooled sentence embedding"""
+        inputs = self._tokenizer([text], return_tensors='pt', padding=True, max_length=256, truncation=True)
+        outputs = self._model(**inputs)
+        mask = inputs['attention_mask'].unsqueeze(-1)
+        pooled = (outputs.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1)
+        vector = pooled[0].detach().numpy().astype(self._np.float32)
+        return vector / (self._np.linalg.norm(vector) or 1.0)
+
+    @staticmethod
+    def _namespace(speaker: str, phase: str) -> str:
+        return f"{speaker}:{phase}"
+
+    @staticmethod
+    def _text(idea: str, question: str) -> str:
+        return f"Startup idea: {idea}\nQuestion: {question}"
+
+    @staticmethod
+    def is_cacheable(question: Optional[str]) -> bool:
+        """Only standalone questions are looked up or stored"""
+        return bool(question) and len(question.split()) >= 3 and not CONTEXT_DEPENDENT.search(question.lower())
+
+    def _namespace_index(self, namespace: str) -> Tuple[List[int], Any]:
+        """Row ids and vectors for a namespace, loaded from SQLite on first use"""
+        index = self._index.get(namespace)
+        if index is None:
+            rows = self._conn.execute(
+                "SELECT id, vector FROM semantic_cache WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            ids = [row[0] for row in rows]
+            vectors = [self._np.frombuffer(row[1], dtype=self._np.float32) for row in rows]
+            matrix = self._np.stack(vectors) if vectors else None
+            index = self._index[namespace] = (ids, matrix)
+        return index
+
+    # ---------- lookup / store ----------
+
+    def _lookup(self, speaker: str, phase: str, idea: str, question: str) -> SemanticLookup:
+        if not self._load():
+            return SemanticLookup(None)
+        vector = self._embed(self._text(idea, question))
+        namespace = self._namespace(speaker, phase)
+        now = time.time()
+        with self._lock:
+            ids, matrix = self._namespace_index(namespace)
+            if matrix is None:
+                self.misses += 1
+                return SemanticLookup(None, vector)
+            similarities = matrix @ vector
+            best = int(similarities.argmax())
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return SemanticLookup(None, vector)
+
+            row_id = ids[best]
+            answer, provenance, created = self._conn.execute(
+                "SELECT answer, provenance, created FROM semantic_cache WHERE id = ?", (row_id,)
+            ).fetchone()
+            if now - created > self.ttl:
+                self._delete([row_id])
+                self.misses += 1
+                return SemanticLookup(None, vector)
+
+            self._conn.execute(
+                "UPDATE semantic_cache SET last_used = ?, hits = hits + 1 WHERE id = ?", (now, row_id)
+            )
+            self.hits += 1
+        provenance = {key: value for key, value in json.loads(provenance).items() if key in PROVENANCE_FIELDS}
+        provenance["cache_id"] = row_id
+        return SemanticLookup(CachedAnswer(answer, similarity, provenance), vector)
+
+    async def lookup(self, speaker: str, phase: str, idea: str, question: str) -> SemanticLookup:
+        """Find a stored answer to a semantically equivalent question (embedding runs off the event loop)"""
+        if not self.enabled or not self.is_cacheable(question):
+            return SemanticLookup(None)
+        return await asyncio.to_thread(self._lookup, speaker, phase, idea, question)
+
+    def store(self, speaker: str, phase: str, idea: str, question: str, answer: str, vector: Any, provenance: Dict[str, Any]) -> None:
+        """Save a live answer under the vector computed during lookup"""
+        if not self.enabled or vector is None or self._conn is None:
+            return
+        namespace = self._namespace(speaker, phase)
+        now = time.time()
+        provenance = {**provenance, "speaker": speaker, "phase": phase, "created": now}
+        provenance = {key: value for key, value in provenance.items() if key in PROVENANCE_FIELDS}
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO semantic_cache (namespace, question, answer, provenance, vector, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (namespace, question, answer, json.dumps(provenance), vector.tobytes(), now, now),
+            )
+            ids, matrix = self._namespace_index(namespace)
+            row = vector[None, :]
+            self._index[namespace] = (ids + [cursor.lastrowid], row if matrix is None else self._np.vstack([matrix, row]))
+            self.stores += 1
+
+            count = self._conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                stale = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM semantic_cache ORDER BY last_used LIMIT ?", (overflow,)
+                )]
+                self._delete(stale)
+
+    def _delete(self, row_ids: List[int]) -> None:
+        """Remove rows from SQLite and drop the in-memory index entries that held them (lock held)"""
+        if not row_ids:
+            return
+        placeholders = ",".join("?" * len(row_ids))
+        self._conn.execute(f"DELETE FROM semantic_cache WHERE id IN ({placeholders})", row_ids)
+        self.evictions += len(row_ids)
+        removed = set(row_ids)
+        for namespace, (ids, _) in list(self._index.items()):
+            if removed.intersection(ids):
+                del self._index[namespace]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stored": self.stores,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Multi-session AI Co-founder server
+Hosts many enhanced_cofounder_graph runs in one event loop over HTTP and WebSocket,
+with per-session state isolation, idle-session eviction and a per-process memory cap.
+Session snapshots are stored in one SQLite database (see sqlite_persistence.py).
+
+Usage:
+    python server.py [port]
+
+API:
+    POST   /sessions                  {"startup_idea": "..."} or {"session_id": ..., "resume_token": ...} to resume
+    GET    /sessions                  list hosted sessions (X-Admin-Token: $COFOUNDER_ADMIN_TOKEN)
+    GET    /sessions/{id}             session status
+    POST   /sessions/{id}/input       {"message": "..."}
+    GET    /sessions/{id}/events      ?since=<seq> output/prompt/end events for polling clients
+    GET    /sessions/{id}/ws          WebSocket: send lines as text, receive events as JSON
+    DELETE /sessions/{id}             end and evict a session
+    GET    /health                    process load and memory
+
+Every /sessions/{id} route requires the session's resume token, sent as an
+X-Resume-Token header, "Authorization: Bearer <token>" or a ?token= query (for browser WebSockets).
+"""
+
+import asyncio
+import gc
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+try:
+    from aiohttp import WSMsgType, web
+except ImportError:
+    web = None
+
+from pydantic_graph import BaseNode, End
+
+import app as cofounder_app
+from app import (
+    ConversationPhase,
+    EnhancedCofounderState,
+    InitialInput,
+    MarketAnalysisPhase,
+    coordinator_router,
+    enhanced_cofounder_graph,
+    insight_extractor,
+    node_for_state,
+    opener_prefetcher,
+)
+from console import use_session_io
+from sqlite_persistence import SqliteStatePersistence
+from single_flight import research_flights
+
+
+class SessionLimitError(Exception):
+    """Raised when the server cannot accept another session"""
+
+
+class SessionAccessError(Exception):
+    """Raised when a resume request names a session the caller does not own"""
+
+
+class SessionOwners:
+    """Resume tokens for server-issued session ids, stored (hashed) next to the snapshots"""
+
+    def __init__(self, db_path: Path):
+        self._conn = sqlite3.connect(str(db_path), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_owners (session_id TEXT PRIMARY KEY, token_hash TEXT NOT NULL)"
+        )
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def issue(self, session_id: str) -> str:
+        token = secrets.token_urlsafe(24)
+        self._conn.execute(
+            "INSERT INTO session_owners (session_id, token_hash) VALUES (?, ?)", (session_id, self._hash(token))
+        )
+        return token
+
+    def verify(self, session_id: str, token: Optional[str]) -> bool:
+        row = self._conn.execute(
+            "SELECT token_hash FROM session_owners WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return bool(row and token) and hmac.compare_digest(row[0], self._hash(token))
+
+
+def current_memory_mb() -> float:
+    """Resident memory of this process in MB"""
+    try:
+        with open('/proc/self/statm') as statm:
+            rss_pages = int(statm.read().split()[1])
+        return rss_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and KB elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class QueueSessionIO:
+    """SessionIO backed by an input queue and a bounded event log with live subscribers"""
+
+    def __init__(self, max_events: int = 2000):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.seq = 0
+        self.waiting_for_input = False
+
+    def emit(self, event_type: str, text: str = "") -> None:
+        """Record an event and push it to every connected client"""
+        self.seq += 1
+        event = {"seq": self.seq, "type": event_type, "text": text}
+        self.events.append(event)
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(event)
+
+    def write(self, text: str) -> None:
+        self.emit("output", text)
+
+    async def input(self, prompt: str = "") -> str:
+        self.emit("prompt", prompt)
+        self.waiting_for_input = True
+        try:
+            line = await self.inbox.get()
+        finally:
+            self.waiting_for_input = False
+        if line is None:
+            raise EOFError("session closed")
+        return line
+
+    def send(self, message: str) -> None:
+        """Queue a user line for the session's next input()"""
+        self.inbox.put_nowait(message)
+
+    def close(self) -> None:
+        """Unblock a pending input() so the graph run can finish"""
+        self.inbox.put_nowait(None)
+
+    def events_since(self, seq: int) -> List[Dict[str, Any]]:
+        return [event for event in self.events if event["seq"] > seq]
+
+
+@dataclass
+class HostedSession:
+    """One founder's graph run and its I/O channel"""
+    session_id: str
+    state: EnhancedCofounderState
+    io: QueueSessionIO
+    persistence: SqliteStatePersistence
+    task: Optional[asyncio.Task] = None
+    created: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+    summary: Optional[str] = None
+    error: Optional[str] = None
+
+    def touch(self) -> None:
+        self.last_active = time.monotonic()
+
+    @property
+    def status(self) -> str:
+        if self.error:
+            return "failed"
+        if self.summary is not None or (self.task and self.task.done()):
+            return "finished"
+        return "waiting_for_input" if self.io.waiting_for_input else "running"
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "status": self.status,
+            "startup_idea": self.state.startup_idea,
+            "current_phase": self.state.current_phase.value,
+            "messages": len(self.state.conversation_history),
+            "idle_seconds": round(time.monotonic() - self.last_active, 1),
+            "summary": self.summary,
+            "error": self.error,
+        }
+
+
+class SessionManager:
+    """Owns every hosted session and enforces the idle timeout and memory cap"""
+
+    def __init__(
+        self,
+        db_path: Path = Path('cofounder_sessions.db'),
+        idle_timeout: float = 1800.0,
+        max_sessions: int = 500,
+        memory_cap_mb: float = 1024.0,
+        reap_interval: float = 30.0,
+    ):
+        """
+        Args:
+            db_path: SQLite database holding every session's snapshots
+            idle_timeout: Seconds without client activity before a session is evicted
+            max_sessions: Maximum concurrently hosted sessions
+            memory_cap_mb: Process RSS above which new sessions are refused and idle ones evicted
+            reap_interval: Seconds between eviction passes
+        """
+        self.db_path = db_path
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.memory_cap_mb = memory_cap_mb
+        self.reap_interval = reap_interval
+
+        self.sessions: Dict[str, HostedSession] = {}
+        self.owners = SessionOwners(db_path)
+        self.evicted = 0
+        self._reaper: Optional[asyncio.Task] = None
+
+    def over_memory_cap(self) -> bool:
+        return current_memory_mb() > self.memory_cap_mb
+
+    async def create(
+        self,
+        startup_idea: Optional[str] = None,
+        session_id: Optional[str] = None,
+        resume_token: Optional[str] = None,
+    ) -> Tuple[HostedSession, Optional[str]]:
+        """
+        Start a new graph run with a server-issued id, or resume a persisted one when
+        `session_id` and the `resume_token` returned at creation are given.
+        Returns the session and, for new sessions, its resume token.
+        """
+        if session_id and not self.owners.verify(session_id, resume_token):
+            raise SessionAccessError("unknown session or invalid resume token")
+        if session_id and session_id in self.sessions:
+            return self.sessions[session_id], None
+
+        if self.over_memory_cap():
+            await self._evict_for_memory()
+        if self.over_memory_cap():
+            raise SessionLimitError(f"memory cap of {self.memory_cap_mb:.0f} MB reached")
+        if len(self.sessions) >= self.max_sessions:
+            raise SessionLimitError(f"session limit of {self.max_sessions} reached")
+
+        state = EnhancedCofounderState()
+        if session_id:
+            state.session_id = session_id
+
+        persistence = SqliteStatePersistence(self.db_path, state.session_id)
+        persistence.set_graph_types(enhanced_cofounder_graph)
+
+        node: BaseNode
+        if session_id and (snapshot := await persistence.load_next()):
+            state = snapshot.state
+            node = node_for_state(state)
+        elif startup_idea:
+            state.startup_idea = startup_idea
+            state.current_phase = ConversationPhase.MARKET_ANALYSIS
+            node = MarketAnalysisPhase()
+        else:
+            node = InitialInput()
+
+        token = None if session_id else self.owners.issue(state.session_id)
+        session = HostedSession(state.session_id, state, QueueSessionIO(), persistence)
+        session.task = asyncio.create_task(self._run(session, node), name=f"session-{state.session_id}")
+        self.sessions[state.session_id] = session
+        return session, token
+
+    async def _run(self, session: HostedSession, node: BaseNode) -> None:
+        """Drive one graph run with its I/O bound to the session channel"""
+        use_session_io(session.io)
+        try:
+            async with enhanced_cofounder_graph.iter(node, state=session.state, persistence=session.persistence) as run:
+                while True:
+                    node = await run.next()
+                    if isinstance(node, End):
+                        session.summary = node.data
+                        session.io.emit("end", node.data)
+                        break
+        except EOFError:
+            pass
+        except Exception as e:
+            session.error = str(e)
+            session.io.emit("error", str(e))
+        finally:
+            opener_prefetcher.discard_session(session.session_id)
+            insight_extractor.discard_session(session.session_id)
+
+    def get(self, session_id: str) -> Optional[HostedSession]:
+        session = self.sessions.get(session_id)
+        if session:
+            session.touch()
+        return session
+
+    async def evict(self, session_id: str) -> bool:
+        """Checkpoint a session's state so it can be resumed, then stop and forget it"""
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+
+        if session.status in ("running", "waiting_for_input"):
+            # Nodes loop internally, so persist the in-progress state before stopping the run
+            await session.persistence.snapshot_node(session.state, node_for_state(session.state))
+            session.io.close()
+            session.task.cancel()
+            await asyncio.gather(session.task, return_exceptions=True)
+
+        opener_prefetcher.discard_session(session_id)
+        insight_extractor.discard_session(session_id)
+        self.evicted += 1
+        return True
+
+    async def _evict_for_memory(self) -> None:
+        """Evict least recently active sessions (up to 10% per pass) while above the memory cap"""
+        budget = max(1, len(self.sessions) // 10)
+        by_idle = sorted(self.sessions.values(), key=lambda s: s.last_active)
+        for session in by_idle[:budget]:
+            if not self.over_memory_cap():
+                break
+            await self.evict(session.session_id)
+        gc.collect()
+
+    async def _reap(self) -> None:
+        """Periodic eviction of idle sessions and memory-cap enforcement"""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            now = time.monotonic()
+            for session in list(self.sessions.values()):
+                if now - session.last_active > self.idle_timeout:
+                    await self.evict(session.session_id)
+            if self.over_memory_cap():
+                await self._evict_for_memory()
+
+    def start(self) -> None:
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap(), name="session-reaper")
+
+    async def shutdown(self) -> None:
+        if self._reaper:
+            self._reaper.cancel()
+        for session_id in list(self.sessions):
+            await self.evict(session_id)
+
+    def health(self) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for session in self.sessions.values():
+            statuses[session.status] = statuses.get(session.status, 0) + 1
+        return {
+            "sessions": len(self.sessions),
+            "by_status": statuses,
+            "evicted": self.evicted,
+            "memory_mb": round(current_memory_mb(), 1),
+            "memory_cap_mb": self.memory_cap_mb,
+            "max_sessions": self.max_sessions,
+            "research_coalescing": research_flights.stats(),
+        }
+
+
+# ================= HTTP / WEBSOCKET API =================
+
+def _request_token(request) -> Optional[str]:
+    """Resume token from the X-Resume-Token header, a bearer Authorization header or ?token="""
+    if token := request.headers.get('X-Resume-Token'):
+        return token
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() == 'bearer' and credentials:
+        return credentials.strip()
+    return request.query.get('token')
+
+def _check_owner(request) -> str:
+    """Session id from the path once the caller has proven they own it, otherwise 403"""
+    session_id = request.match_info['session_id']
+    # Unknown ids get the same 403 so other founders' ids cannot be probed
+    if not request.app['manager'].owners.verify(session_id, _request_token(request)):
+        raise web.HTTPForbidden(text="unknown session or invalid resume token")
+    return session_id
+
+def _session_or_404(request) -> HostedSession:
+    session = request.app['manager'].get(_check_owner(request))
+    if session is None:
+        raise web.HTTPNotFound(text="session is not running; resume it with POST /sessions")
+    return session
+
+async def _json_object(request) -> Dict[str, Any]:
+    """Request body as a JSON object, or 400"""
+    if not request.can_read_body:
+        return {}
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="request body must be valid JSON")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text="request body must be a JSON object")
+    return body
+
+def _since(request) -> int:
+    try:
+        return int(request.query.get('since', 0))
+    except ValueError:
+        raise web.HTTPBadRequest(text="'since' must be an integer")
+
+def _optional_str(body: Dict[str, Any], key: str) -> Optional[str]:
+    value = body.get(key)
+    if value is not None and not isinstance(value, str):
+        raise web.HTTPBadRequest(text=f"'{key}' must be a string")
+    return value
+
+async def create_session(request):
+    body = await _json_object(request)
+    try:
+        session, token = await request.app['manager'].create(
+            _optional_str(body, 'startup_idea'), _optional_str(body, 'session_id'), _optional_str(body, 'resume_token')
+        )
+    except SessionAccessError as e:
+        raise web.HTTPForbidden(text=str(e))
+    except SessionLimitError as e:
+        raise web.HTTPServiceUnavailable(text=str(e))
+    response = session.describe()
+    if token:
+        # Only returned once; required to resume this session after eviction or a restart
+        response["resume_token"] = token
+    return web.json_response(response, status=201)
+
+async def list_sessions(request):
+    """Every hosted session's idea and summary; only for the operator holding COFOUNDER_ADMIN_TOKEN"""
+    admin_token = os.getenv('COFOUNDER_ADMIN_TOKEN')
+    if not admin_token:
+        raise web.HTTPForbidden(text="session listing is disabled (set COFOUNDER_ADMIN_TOKEN)")
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), admin_token.encode()):
+        raise web.HTTPForbidden(text="invalid admin token")
+    manager = request.app['manager']
+    return web.json_response([session.describe() for session in manager.sessions.values()])
+
+async def get_session(request):
+    return web.json_response(_session_or_404(request).describe())
+
+async def send_input(request):
+    session = _session_or_404(request)
+    body = await _json_object(request)
+    session.io.send(str(body.get('message', '')))
+    return web.json_response({"queued": True}, status=202)
+
+async def get_events(request):
+    session = _session_or_404(request)
+    return web.json_response(session.io.events_since(_since(request)))
+
+async def delete_session(request):
+    evicted = await request.app['manager'].evict(_check_owner(request))
+    if not evicted:
+        raise web.HTTPNotFound(text="unknown session")
+    return web.json_response({"evicted": True})
+
+async def session_ws(request):
+    session = _session_or_404(request)
+    since = _since(request)
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    events: asyncio.Queue = asyncio.Queue()
+    for event in session.io.events_since(since):
+        events.put_nowait(event)
+    session.io.subscribers.add(events)
+
+    async def forward_events():
+        while True:
+            await ws.send_json(await events.get())
+
+    forwarder = asyncio.create_task(forward_events())
+    try:
+        async for msg in ws:
+            if msg.type == WSMsgType.TEXT:
+                session.touch()
+                session.io.send(msg.data)
+            elif msg.type == WSMsgType.ERROR:
+                break
+    finally:
+        forwarder.cancel()
+        session.io.subscribers.discard(events)
+    return ws
+
+async def health(request):
+    return web.json_response(request.app['manager'].health())
+
+def create_app(manager: Optional[SessionManager] = None) -> "web.Application":
+    """Build the aiohttp application around a SessionManager"""
+    if web is None:
+        raise RuntimeError("aiohttp is required for server mode: pip install aiohttp")
+
+    # Hosted founders only see their own session's numbers in the closing summary
+    cofounder_app.PROCESS_STATS_IN_SUMMARY = False
+
+    app = web.Application()
+    app['manager'] = manager or SessionManager(
+        idle_timeout=float(os.getenv('COFOUNDER_IDLE_TIMEOUT', 1800)),
+        max_sessions=int(os.getenv('COFOUNDER_MAX_SESSIONS', 500)),
+        memory_cap_mb=float(os.getenv('COFOUNDER_MEMORY_CAP_MB', 1024)),
+    )
+
+    async def on_startup(app):
+        app['manager'].start()
+        # Load the router's embedding model before the first hosted session needs it
+        await asyncio.to_thread(coordinator_router.preload)
+
+    async def on_cleanup(app):
+        await app['manager'].shutdown()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/sessions', create_session)
+    app.router.add_get('/sessions', list_sessions)
+    app.router.add_get('/sessions/{session_id}', get_session)
+    app.router.add_post('/sessions/{session_id}/input', send_input)
+    app.router.add_get('/sessions/{session_id}/events', get_events)
+    app.router.add_get('/sessions/{session_id}/ws', session_ws)
+    app.router.add_delete('/sessions/{session_id}', delete_session)
+    app.router.add_get('/health', health)
+    return app
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    print(f"🚀 AI Co-founder server listening on http://0.0.0.0:{port}")
+    web.run_app(create_app(), port=port, print=None)
@@ -0,0 +1,79 @@
+"""
+Single-flight coalescing for research requests.
+Concurrent callers asking the same question share one in-flight call instead of
+each paying for its own grounded search, across every session in the process.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key; both async and threaded callers are supported"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._futures: Dict[str, Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await call() unless the same key is already in flight on this loop, then share its result"""
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            if task is None:
+                task = asyncio.ensure_future(call())
+                self._tasks[loop_key] = task
+                task.add_done_callback(lambda _: self._forget_task(loop_key, task))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        # Shield so one caller giving up does not cancel the answer the others are waiting on
+        return await asyncio.shield(task)
+
+    def _forget_task(self, loop_key: Tuple[int, str], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(loop_key) is task:
+                del self._tasks[loop_key]
+
+    def run_sync(self, key: str, call: Callable[[], Any]) -> Any:
+        """Blocking counterpart of run() for callers on worker threads"""
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._futures[key] = future
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._futures[key]
+        return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._tasks) + len(self._futures)
+        requests = self.leaders + self.coalesced
+        return {
+            "in_flight": in_flight,
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / requests, 3) if requests else 0.0,
+        }
+
+
+# Process-wide instance shared by every WebResearchAgent
+research_flights = SingleFlight()
@@ -0,0 +1,367 @@
+"""
+Append-only SQLite persistence for co-founder graph runs.
+Implements the pydantic_graph persistence interface, storing each snapshot as one
+row and each state change as a delta, with periodic full-state checkpoints.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import pydantic
+from pydantic_graph import BaseNode, End
+from pydantic_graph.exceptions import GraphNodeStatusError
+from pydantic_graph.persistence import (
+    BaseStatePersistence,
+    EndSnapshot,
+    NodeSnapshot,
+    RunEndT,
+    Snapshot,
+    StateT,
+    build_snapshot_list_type_adapter,
+)
+
+from metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    snapshot_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT,
+    start_ts TEXT,
+    duration REAL,
+    state_version INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS snapshots_by_id ON snapshots (session_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS snapshots_by_status ON snapshots (session_id, status, seq);
+CREATE TABLE IF NOT EXISTS state_versions (
+    session_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    checkpoint INTEGER NOT NULL,
+    scalars TEXT NOT NULL,
+    lists TEXT NOT NULL,
+    PRIMARY KEY (session_id, version)
+);
+"""
+
+# Connections are shared per database file so many sessions can use one store
+_connections: Dict[str, Tuple[sqlite3.Connection, threading.Lock]] = {}
+_connections_lock = threading.Lock()
+
+def _connect(db_path: Path) -> Tuple[sqlite3.Connection, threading.Lock]:
+    key = str(db_path.resolve())
+    with _connections_lock:
+        if key not in _connections:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            _connections[key] = (conn, threading.Lock())
+        return _connections[key]
+
+
+class SqliteStatePersistence(BaseStatePersistence[StateT, RunEndT]):
+    """
+    SQLite state persistence for one graph run, identified by `session_id`.
+
+    Unlike FileStatePersistence, a node transition writes one snapshot row plus
+    only the parts of the state that changed: list fields such as message
+    histories are stored as (kept prefix, appended items). Every
+    `checkpoint_every` versions a full state is written so rebuilding a state
+    never folds more than that many deltas, which keeps `load_next` constant-time
+    in the session length. Snapshots are located through indexes on
+    (session_id, status) and (session_id, snapshot_id).
+    """
+
+    def __init__(self, db_path: Path, session_id: str, checkpoint_every: int = 20):
+        self.db_path = Path(db_path)
+        self.session_id = session_id
+        self.checkpoint_every = checkpoint_every
+        self._conn, self._db_lock = _connect(self.db_path)
+        self._lock = asyncio.Lock()
+        self._snapshots_type_adapter: Optional[pydantic.TypeAdapter] = None
+
+        # Last written state, used to compute the next delta (loaded lazily)
+        self._last_version: Optional[int] = None
+        self._last_checkpoint = 0
+        self._last_state: Dict[str, Any] = {}
+
+    # ---------- database helpers (run in a worker thread) ----------
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _transaction(self, statements: List[Tuple[str, tuple]]) -> None:
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def _run(self, func, *args):
+        return await asyncio.to_thread(func, *args)
+
+    # ---------- state deltas ----------
+
+    def _load_state_sync(self, version: int) -> Dict[str, Any]:
+        """Rebuild a state dump from its latest checkpoint and the deltas after it"""
+        rows = self._execute(
+            """SELECT checkpoint, scalars, lists FROM state_versions
+               WHERE session_id = ? AND version <= ? AND version >= (
+                   SELECT MAX(version) FROM state_versions
+                   WHERE session_id = ? AND checkpoint = 1 AND version <= ?)
+               ORDER BY version""",
+            (self.session_id, version, self.session_id, version),
+        )
+        state: Dict[str, Any] = {}
+        for checkpoint, scalars, lists in rows:
+            state.update(json.loads(scalars))
+            for name, value in json.loads(lists).items():
+                if checkpoint:
+                    state[name] = value
+                else:
+                    keep, items = value
+                    state[name] = state.get(name, [])[:keep] + items
+        return state
+
+    def _ensure_last_state_sync(self) -> None:
+        if self._last_version is not None:
+            return
+        row = self._execute(
+            "SELECT MAX(version), MAX(CASE WHEN checkpoint = 1 THEN version END) FROM state_versions WHERE session_id = ?",
+            (self.session_id,),
+        )[0]
+        if row[0] is None:
+            self._last_version = 0
+            return
+        self._last_version, self._last_checkpoint = row[0], row[1] or 0
+        self._last_state = self._load_state_sync(self._last_version)
+
+    def _state_version_rows(self, state_dump: Dict[str, Any]) -> Tuple[int, List[Tuple[str, tuple]]]:
+        """Return the version for `state_dump` and the rows needed to store it"""
+        self._ensure_last_state_sync()
+        if self._last_version and state_dump == self._last_state:
+            return self._last_version, []
+
+        version = self._last_version + 1
+        checkpoint = version == 1 or version - self._last_checkpoint >= self.checkpoint_every
+        scalars = {k: v for k, v in state_dump.items() if not isinstance(v, list)}
+        lists: Dict[str, Any] = {}
+        for name, items in state_dump.items():
+            if not isinstance(items, list):
+                continue
+            if checkpoint:
+                lists[name] = items
+                continue
+            previous = self._last_state.get(name, [])
+            keep = 0
+            for old, new in zip(previous, items):
+                if old != new:
+                    break
+                keep += 1
+            if keep != len(previous) or keep != len(items):
+                lists[name] = [keep, items[keep:]]
+
+        if not checkpoint:
+            scalars = {k: v for k, v in scalars.items() if self._last_state.get(k) != v}
+
+        self._last_version = version
+        self._last_state = state_dump
+        if checkpoint:
+            self._last_checkpoint = version
+        return version, [(
+            "INSERT INTO state_versions (session_id, version, checkpoint, scalars, lists) VALUES (?, ?, ?, ?, ?)",
+            (self.session_id, version, int(checkpoint), json.dumps(scalars), json.dumps(lists)),
+        )]
+
+    # ---------- snapshot (de)serialization ----------
+
+    def _dump_snapshot(self, snapshot: Snapshot[StateT, RunEndT]) -> Dict[str, Any]:
+        assert self._snapshots_type_adapter is not None, 'snapshots type adapter must be set'
+        return self._snapshots_type_adapter.dump_python([snapshot], mode='json')[0]
+
+    def _build_snapshot(self, row: tuple, state_dump: Dict[str, Any]) -> Snapshot[StateT, RunEndT]:
+        assert self._snapshots_type_adapter is not None, 'snapshots type adapter must be set'
+        _, _, status, start_ts, duration, _, body = row
+        data = json.loads(body)
+        data['state'] = state_dump
+        if data['kind'] == 'node':
+            data.update(status=status, start_ts=start_ts, duration=duration)
+        return self._snapshots_type_adapter.validate_python([data])[0]
+
+    def _append_sync(self, snapshot: Snapshot[StateT, RunEndT], if_new: bool = False) -> None:
+        if if_new and self._execute(
+            "SELECT 1 FROM snapshots WHERE session_id = ? AND snapshot_id = ?", (self.session_id, snapshot.id)
+        ):
+            return
+
+        data = self._dump_snapshot(snapshot)
+        state_dump = data.pop('state')
+        for column in ('status', 'start_ts', 'duration'):
+            data.pop(column, None)
+        version, rows = self._state_version_rows(state_dump)
+        seq = self._execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM snapshots WHERE session_id = ?", (self.session_id,))[0][0]
+        status = snapshot.status if isinstance(snapshot, NodeSnapshot) else None
+        rows.append((
+            "INSERT INTO snapshots (session_id, seq, snapshot_id, kind, status, state_version, body) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.session_id, seq, snapshot.id, snapshot.kind, status, version, json.dumps(data)),
+        ))
+        try:
+            self._transaction(rows)
+        except Exception:
+            # Forget the cached state so the next write re-reads what was actually stored
+            self._last_version = None
+            raise
+
+    # ---------- BaseStatePersistence interface ----------
+
+    async def snapshot_node(self, state: StateT, next_node: BaseNode[StateT, Any, RunEndT]) -> None:
+        async with self._lock:
+            await self._run(self._append_sync, NodeSnapshot(state=state, node=next_node))
+
+    async def snapshot_node_if_new(
+        self, snapshot_id: str, state: StateT, next_node: BaseNode[StateT, Any, RunEndT]
+    ) -> None:
+        async with self._lock:
+            snapshot = NodeSnapshot(state=state, node=next_node, id=snapshot_id)
+            await self._run(self._append_sync, snapshot, True)
+
+    async def snapshot_end(self, state: StateT, end: End[RunEndT]) -> None:
+        async with self._lock:
+            await self._run(self._append_sync, EndSnapshot(state=state, result=end))
+
+    @asynccontextmanager
+    async def record_run(self, snapshot_id: str) -> AsyncIterator[None]:
+        async with self._lock:
+            rows = await self._run(
+                self._execute,
+                "SELECT kind, status FROM snapshots WHERE session_id = ? AND snapshot_id = ?",
+                (self.session_id, snapshot_id),
+            )
+            if not rows:
+                raise LookupError(f'No snapshot found with id={snapshot_id!r}')
+            kind, status = rows[0]
+            assert kind == 'node', 'Only NodeSnapshot can be recorded'
+            GraphNodeStatusError.check(status)
+            await self._run(
+                self._execute,
+                "UPDATE snapshots SET status = 'running', start_ts = ? WHERE session_id = ? AND snapshot_id = ?",
+                (datetime.now(tz=timezone.utc).isoformat(), self.session_id, snapshot_id),
+            )
+
+        start = perf_counter()
+        status = 'error'
+        try:
+            yield
+            status = 'success'
+        finally:
+            duration = perf_counter() - start
+            async with self._lock:
+                await self._run(
+                    self._execute,
+                    "UPDATE snapshots SET status = ?, duration = ? WHERE session_id = ? AND snapshot_id = ?",
+                    (status, duration, self.session_id, snapshot_id),
+                )
+            # Snapshot ids are "<node id>:<uuid>"
+            metrics.record("node", snapshot_id.split(':', 1)[0], duration, ok=status == 'success')
+
+    def _load_next_sync(self) -> Optional[NodeSnapshot[StateT, RunEndT]]:
+        rows = self._execute(
+            """SELECT snapshot_id, kind, status, start_ts, duration, state_version, body FROM snapshots
+               WHERE session_id = ? AND status = 'created' ORDER BY seq LIMIT 1""",
+            (self.session_id,),
+        )
+        if not rows:
+            return None
+        self._execute(
+            "UPDATE snapshots SET status = 'pending' WHERE session_id = ? AND snapshot_id = ?",
+            (self.session_id, rows[0][0]),
+        )
+        row = rows[0][:2] + ('pending',) + rows[0][3:]
+        return self._build_snapshot(row, self._load_state_sync(row[5]))
+
+    async def load_next(self) -> NodeSnapshot[StateT, RunEndT] | None:
+        async with self._lock:
+            return await self._run(self._load_next_sync)
+
+    def _load_all_sync(self) -> List[Snapshot[StateT, RunEndT]]:
+        rows = self._execute(
+            """SELECT snapshot_id, kind, status, start_ts, duration, state_version, body FROM snapshots
+               WHERE session_id = ? ORDER BY seq""",
+            (self.session_id,),
+        )
+        states: Dict[int, Dict[str, Any]] = {}
+        snapshots = []
+        for row in rows:
+            version = row[5]
+            if version not in states:
+                states[version] = self._load_state_sync(version)
+            snapshots.append(self._build_snapshot(row, states[version]))
+        return snapshots
+
+    async def load_all(self) -> list[Snapshot[StateT, RunEndT]]:
+        async with self._lock:
+            return await self._run(self._load_all_sync)
+
+    def should_set_types(self) -> bool:
+        return self._snapshots_type_adapter is None
+
+    def set_types(self, state_type: type[StateT], run_end_type: type[RunEndT]) -> None:
+        self._snapshots_type_adapter = build_snapshot_list_type_adapter(state_type, run_end_type)
+
+    # ---------- export ----------
+
+    async def requeue_interrupted(self) -> None:
+        """Mark node snapshots left pending, running or failed as created again, so load_next resumes them"""
+        async with self._lock:
+            await self._run(
+                self._execute,
+                """UPDATE snapshots SET status = 'created', start_ts = NULL, duration = NULL
+                   WHERE session_id = ? AND kind = 'node' AND status IN ('pending', 'running', 'error')""",
+                (self.session_id,),
+            )
+
+    async def clear(self) -> None:
+        """Delete every snapshot and state version of this session so the run can start over"""
+        async with self._lock:
+            await self._run(self._transaction, [
+                ("DELETE FROM snapshots WHERE session_id = ?", (self.session_id,)),
+                ("DELETE FROM state_versions WHERE session_id = ?", (self.session_id,)),
+            ])
+            self._last_version = None
+            self._last_checkpoint = 0
+            self._last_state = {}
+
+    async def export_json(self, json_file: Path) -> None:
+        """Write the run in FileStatePersistence's format for tools that read session JSON (agent_main.py)"""
+        snapshots = await self.load_all()
+        assert self._snapshots_type_adapter is not None, 'snapshots type adapter must be set'
+        await self._run(Path(json_file).write_bytes, self._snapshots_type_adapter.dump_json(snapshots, indent=2))
+
+
+def list_sessions(db_path: Path) -> List[str]:
+    """Session ids stored in a database, most recently written first"""
+    conn, db_lock = _connect(Path(db_path))
+    with db_lock:
+        rows = conn.execute(
+            "SELECT session_id FROM snapshots GROUP BY session_id ORDER BY MAX(rowid) DESC"
+        ).fetchall()
+    return [row[0] for row in rows]
@@ -0,0 +1,122 @@
+"""
+Streaming turn runner for the co-founder agents.
+Prints partial model output as it arrives and measures time-to-first-token per turn.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage
+from pydantic_ai.models import Model
+from pydantic_ai.usage import Usage
+
+from console import say
+from metrics import record_agent_run
+
+# Streaming is on by default; set COFOUNDER_STREAM=0 to wait for full replies instead
+STREAMING_ENABLED = os.getenv('COFOUNDER_STREAM', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+@dataclass
+class AgentTurn:
+    """Result of a single agent turn with its latency measurements"""
+    output: Any
+    all_messages: List[ModelMessage] = field(default_factory=list)
+    new_messages: List[ModelMessage] = field(default_factory=list)
+    ttft: Optional[float] = None   # Seconds until the first token was printed
+    total: float = 0.0             # Seconds until the full reply was available
+    streamed: bool = False
+    usage: Optional[Usage] = None
+
+
+def format_latency(turn: AgentTurn) -> str:
+    """Render the latency line shown after every agent reply"""
+    if turn.ttft is not None:
+        return f"⏱️ first token {turn.ttft:.2f}s | total {turn.total:.2f}s"
+    return f"⏱️ total {turn.total:.2f}s"
+
+
+async def run_agent_turn(
+    agent: Agent,
+    prompt: str,
+    *,
+    label: str,
+    name: Optional[str] = None,
+    deps: Any = None,
+    message_history: Optional[List[ModelMessage]] = None,
+    stream: Optional[bool] = None,
+    model: Optional[Model] = None,
+) -> AgentTurn:
+    """
+    Run one agent turn and print the reply under `label`.
+
+    In streaming mode the reply is printed delta by delta using `run_stream`,
+    otherwise it is printed once the full reply has arrived. Both modes report
+    total latency; streaming mode also reports time-to-first-token.
+    `model` overrides the agent's default model for this turn. Every run is
+    recorded in the local metrics under `name` (defaults to the label).
+    """
+    if stream is None:
+        stream = STREAMING_ENABLED
+
+    name = name or label
+    model_name = getattr(model or agent.model, 'model_name', None)
+    start = time.perf_counter()
+    try:
+        turn = await _run_turn(agent, prompt, label, deps, message_history, stream, model, start)
+    except Exception:
+        record_agent_run(name, time.perf_counter() - start, model=model_name, ok=False)
+        raise
+    record_agent_run(name, turn.total, turn.new_messages, turn.usage, turn.ttft, model_name)
+    return turn
+
+
+async def _run_turn(
+    agent: Agent,
+    prompt: str,
+    label: str,
+    deps: Any,
+    message_history: Optional[List[ModelMessage]],
+    stream: bool,
+    model: Optional[Model],
+    start: float,
+) -> AgentTurn:
+    """Body of run_agent_turn without the metrics bookkeeping"""
+
+    if not stream:
+        result = await agent.run(prompt, deps=deps, message_history=message_history, model=model)
+        turn = AgentTurn(
+            output=result.output,
+            all_messages=result.all_messages(),
+            new_messages=result.new_messages(),
+            total=time.perf_counter() - start,
+            usage=result.usage(),
+        )
+        say(f"{label}: {turn.output}")
+        say(f"{format_latency(turn)}\n")
+        return turn
+
+    ttft = None
+    say(f"{label}: ", end='', flush=True)
+    async with agent.run_stream(prompt, deps=deps, message_history=message_history, model=model) as result:
+        async for delta in result.stream_text(delta=True):
+            if ttft is None and delta:
+                ttft = time.perf_counter() - start
+            say(delta, end='', flush=True)
+        output = await result.get_output()
+        turn = AgentTurn(
+            output=output,
+            all_messages=result.all_messages(),
+            new_messages=result.new_messages(),
+            ttft=ttft,
+            total=time.perf_counter() - start,
+            streamed=True,
+            usage=result.usage(),
+        )
+
+    say()
+    say(f"{format_latency(turn)}\n")
+    return turn
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Shared resilience layer for Gemini calls made by the content generators.
+One instance is shared by every in-flight generation: errors are classified from
+their type and status code, retries back off with full random jitter, a circuit
+breaker pauses all callers during sustained 429/503 responses, and an AIMD limiter
+adapts how many calls may run at once.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx ships with pydantic_ai's model clients
+    httpx = None
+
+from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior
+
+logger = logging.getLogger("production_content_agent")
+
+# Error kinds
+RATE_LIMITED = "rate_limited"
+UNAVAILABLE = "unavailable"
+TIMEOUT = "timeout"
+NETWORK = "network"
+INVALID_RESPONSE = "invalid_response"
+AUTH = "auth"
+CLIENT_ERROR = "client_error"
+UNKNOWN = "unknown"
+
+RETRYABLE_KINDS = {RATE_LIMITED, UNAVAILABLE, TIMEOUT, NETWORK, INVALID_RESPONSE}
+# Kinds that mean the service itself is struggling; these feed the breaker and the AIMD limiter
+OVERLOAD_KINDS = {RATE_LIMITED, UNAVAILABLE}
+
+RETRY_AFTER_IN_MESSAGE = re.compile(r"retry[ _-]?(?:after|delay)\D{0,10}(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+
+@dataclass
+class ErrorClassification:
+    """What went wrong with a call and how to react to it"""
+    kind: str
+    status_code: Optional[int] = None
+    retry_after: Optional[float] = None
+
+    @property
+    def retryable(self) -> bool:
+        return self.kind in RETRYABLE_KINDS
+
+    @property
+    def overload(self) -> bool:
+        return self.kind in OVERLOAD_KINDS
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status from pydantic_ai, httpx or google-genai errors"""
+    if isinstance(error, ModelHTTPError):
+        return error.status_code
+    if httpx is not None and isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    return None
+
+def _kind_for_status(status_code: int) -> str:
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code in (401, 403):
+        return AUTH
+    if status_code in (408, 504):
+        return TIMEOUT
+    if status_code >= 500:
+        return UNAVAILABLE
+    return CLIENT_ERROR
+
+def classify_error(error: BaseException) -> ErrorClassification:
+    """Classify an exception from its type and status code, following wrapped causes"""
+    if isinstance(error, BaseExceptionGroup) and error.exceptions:
+        return classify_error(error.exceptions[-1])
+
+    retry_after = None
+    if match := RETRY_AFTER_IN_MESSAGE.search(str(error)):
+        retry_after = float(match.group(1))
+
+    status_code = _status_code(error)
+    if status_code is not None:
+        return ErrorClassification(_kind_for_status(status_code), status_code, retry_after)
+
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) or (
+        httpx is not None and isinstance(error, httpx.TimeoutException)
+    ):
+        return ErrorClassification(TIMEOUT)
+    if isinstance(error, ConnectionError) or (httpx is not None and isinstance(error, httpx.TransportError)):
+        return ErrorClassification(NETWORK)
+    if isinstance(error, UnexpectedModelBehavior):
+        return ErrorClassification(INVALID_RESPONSE)
+
+    # Status codes are never read from message text: "Session has 500 messages" is not a 500
+    cause = error.__cause__ or error.__context__
+    if cause is not None and cause is not error:
+        return classify_error(cause)
+    return ErrorClassification(UNKNOWN)
+
+
+@dataclass
+class RetryPolicy:
+    """Per-call retry budget; delays use full jitter: uniform(0, min(max_delay, base_delay * 2**attempt))"""
+    max_retries: int = 5
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, classification: ErrorClassification) -> float:
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if classification.retry_after is not None:
+            delay = max(delay, min(classification.retry_after, self.max_delay))
+        return delay
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the breaker stays open longer than a caller is willing to wait"""
+
+
+class CircuitBreaker:
+    """
+    Trips after `failure_threshold` overload errors within `window` seconds. While open,
+    callers wait for the cooldown; then one probe call is let through (half-open). A
+    successful probe closes the breaker, a failed one reopens it with a doubled cooldown.
+    Calls that started before the breaker opened do not count as the probe.
+    """
+
+    def __init__(self, failure_threshold: int = 5, window: float = 30.0, cooldown: float = 20.0, max_cooldown: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.state = "closed"
+        self.cooldown = cooldown
+        self.opened_until = 0.0
+        self._failures: Deque[float] = deque()
+        self._probe_in_flight = False
+
+        self.trips = 0
+
+    def seconds_until_allowed(self) -> float:
+        """0 when a call may go ahead now (claiming the probe slot when half-open)"""
+        now = time.monotonic()
+        if self.state == "closed":
+            return 0.0
+        if self.state == "open":
+            if now < self.opened_until:
+                return self.opened_until - now
+            self.state = "half_open"
+            logger.info("Circuit breaker half-open, sending a probe request")
+        if self._probe_in_flight:
+            return min(1.0, self.cooldown)
+        self._probe_in_flight = True
+        return 0.0
+
+    def record_success(self, probe: bool = False) -> None:
+        """`probe` is True when the call held the half-open probe slot"""
+        if self.state == "closed":
+            self._failures.clear()
+            return
+        if not (probe and self.state == "half_open"):
+            # A call from before the trip succeeding late says nothing about recovery
+            return
+        logger.info("Circuit breaker closed, Gemini is responding again")
+        print("✅ Gemini is responding again, resuming generation")
+        self.state = "closed"
+        self.cooldown = self.base_cooldown
+        self._probe_in_flight = False
+        self._failures.clear()
+
+    def record_failure(self, overload: bool, probe: bool = False) -> None:
+        now = time.monotonic()
+        if probe and self.state == "half_open":
+            self._probe_in_flight = False
+            if overload:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open(now)
+            return
+        if not overload:
+            return
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self.window:
+            self._failures.popleft()
+        if self.state == "closed" and len(self._failures) >= self.failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = "open"
+        self.opened_until = now + self.cooldown
+        self.trips += 1
+        self._failures.clear()
+        logger.warning(f"Circuit breaker open for {self.cooldown:.0f}s after sustained rate limiting/unavailability")
+        print(f"🛑 Gemini is overloaded, pausing all generations for {self.cooldown:.0f}s")
+
+
+class AIMDLimiter:
+    """Concurrency limit that grows by one per window of successes and halves on overload"""
+
+    def __init__(self, initial: float = 4.0, minimum: float = 1.0, maximum: float = 16.0, decrease_interval: float = 2.0):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        # One overload burst (many calls failing together) only halves the limit once
+        self.decrease_interval = decrease_interval
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Condition for the running loop (asyncio.run creates a new loop per run)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def reserve(self, concurrency: int) -> None:
+        """Allow at least `concurrency` calls at once, e.g. to match a batch's worker count"""
+        self.maximum = max(self.maximum, float(concurrency))
+        self.limit = max(self.limit, float(concurrency))
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.minimum, self.limit / 2)
+        logger.warning(f"Overload detected, concurrency limit {previous:.1f} -> {self.limit:.1f}")
+
+
+class ResilienceLayer:
+    """Retries, circuit breaking and adaptive concurrency shared by every generation"""
+
+    def __init__(
+        self,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[AIMDLimiter] = None,
+        max_circuit_wait: float = 600.0,
+    ):
+        """
+        Initialize the shared resilience layer
+
+        Args:
+            breaker: Circuit breaker for sustained 429/503 responses
+            limiter: AIMD concurrency limiter (defaults to CONTENT_AIMD_INITIAL / CONTENT_AIMD_MAX)
+            max_circuit_wait: Longest a call waits for an open breaker before giving up
+        """
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or AIMDLimiter(
+            initial=float(os.getenv('CONTENT_AIMD_INITIAL', '4')),
+            maximum=float(os.getenv('CONTENT_AIMD_MAX', '16')),
+        )
+        self.max_circuit_wait = max_circuit_wait
+
+        self.calls = 0
+        self.retries = 0
+        self.errors_by_kind: Dict[str, int] = {}
+
+    async def _wait_for_breaker(self, name: str) -> bool:
+        """Wait until the breaker lets this call through; True when it holds the probe slot"""
+        waited = 0.0
+        while (delay := self.breaker.seconds_until_allowed()) > 0:
+            if waited + delay > self.max_circuit_wait:
+                raise CircuitOpenError(f"Circuit open for over {self.max_circuit_wait:.0f}s, giving up on {name}")
+            await asyncio.sleep(delay)
+            waited += delay
+        return self.breaker.state == "half_open"
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        policy: Optional[RetryPolicy] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Await func(*args, **kwargs) through the breaker and limiter, retrying retryable errors"""
+        policy = policy or RetryPolicy()
+        name = getattr(func, "__qualname__", getattr(func, "__name__", "call"))
+
+        for attempt in range(policy.max_retries + 1):
+            probe = await self._wait_for_breaker(name)
+            try:
+                await self.limiter.acquire()
+            except asyncio.CancelledError:
+                self.breaker.record_failure(overload=False, probe=probe)
+                raise
+            self.calls += 1
+            try:
+                logger.debug(f"Attempt {attempt + 1}/{policy.max_retries + 1} for {name}")
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                # Free the half-open probe slot without counting this as a failure
+                self.breaker.record_failure(overload=False, probe=probe)
+                raise
+            except Exception as e:
+                classification = classify_error(e)
+                self.errors_by_kind[classification.kind] = self.errors_by_kind.get(classification.kind, 0) + 1
+                self.breaker.record_failure(classification.overload, probe=probe)
+                if classification.overload:
+                    self.limiter.on_overload()
+                logger.warning(f"Attempt {attempt + 1} failed for {name} ({classification.kind}): {e}")
+
+                if attempt >= policy.max_retries or not classification.retryable:
+                    logger.error(f"Not retrying {name}. Attempt: {attempt + 1}, kind: {classification.kind}")
+                    raise
+                delay = policy.delay(attempt, classification)
+            else:
+                self.breaker.record_success(probe=probe)
+                self.limiter.on_success()
+                if attempt > 0:
+                    logger.info(f"Success on attempt {attempt + 1} for {name}")
+                return result
+            finally:
+                await self.limiter.release()
+
+            # Back off outside the concurrency slot so other calls can use it
+            self.retries += 1
+            logger.info(f"Retrying {name} in {delay:.2f} seconds...")
+            print(f"⏳ Retrying in {delay:.1f} seconds (attempt {attempt + 2}/{policy.max_retries + 1})...")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "errors_by_kind": dict(self.errors_by_kind),
+            "circuit": self.breaker.state,
+            "circuit_trips": self.breaker.trips,
+            "concurrency_limit": round(self.limiter.limit, 2),
+        }
+
+
+# Process-wide layer shared by every orchestrator and generation
+shared_resilience = ResilienceLayer()